@@ -6,8 +6,9 @@ import asyncio
 import os
 import sys
 import socket
-from src.config import TOKEN, PREFIX
-from src.database.db_manager import DatabaseManager
+from src.config import TOKEN, PREFIX, SHARED_LEASES
+from src.core.services import build_services
+from src.database import read_memo
 
 LOCK_FILE = 'bot.lock'
 HOSTNAME = socket.gethostname()
@@ -50,6 +51,7 @@ async def main():
     with open(LOCK_FILE, 'w') as f:
         f.write(str(os.getpid()))
     
+    services = None
     try:
         intents = discord.Intents.default()
         intents.message_content = True
@@ -57,12 +59,17 @@ async def main():
         intents.members = True
 
         bot = commands.Bot(command_prefix=PREFIX, intents=intents, help_command=None)
-        db = DatabaseManager()
+        # Shared by every cog, see src/core/services.py
+        services = build_services(shared_leases=SHARED_LEASES)
+        bot.services = services
+        db = services.db
 
         @bot.event
         async def on_ready():
             if hasattr(bot, '_ready_called'):
                 print('🔄 Bot reconnected')
+                # Only the diff since the last sync gets written
+                services.member_sync.start(bot.guilds)
                 return
             
             bot._ready_called = True
@@ -73,19 +80,10 @@ async def main():
             print(f'🖥️  Running on: {HOSTNAME}')
             print('------')
 
-            print('🔄 Syncing servers and members to database...')
-            for guild in bot.guilds:
-                icon_url = str(guild.icon.url) if guild.icon else None
-                db.update_guild(str(guild.id), guild.name, guild.member_count, icon_url)
-                
-                member_count = 0
-                for member in guild.members:
-                    if not member.bot:
-                        db.add_guild_member(str(guild.id), str(member.id))
-                        member_count += 1
-                print(f'   Synced {guild.name}: {member_count} members')
-                
-            print('✅ Servers and members synced!')
+            # Runs in the background, progress is printed per server
+            services.member_sync.start(bot.guilds)
+            # Frees stakes left behind by games that never settled
+            services.hold_sweeper.start()
             
             command_names = [cmd.name for cmd in bot.commands]
             duplicates = [name for name in command_names if command_names.count(name) > 1]
@@ -105,27 +103,31 @@ async def main():
         @bot.event
         async def on_guild_join(guild):
             print(f'➕ Joined server: {guild.name} (ID: {guild.id})')
-            icon_url = str(guild.icon.url) if guild.icon else None
-            db.update_guild(str(guild.id), guild.name, guild.member_count, icon_url)
-            
-            for member in guild.members:
-                if not member.bot:
-                    db.add_guild_member(str(guild.id), str(member.id))
+            await services.member_sync.sync_guild(guild)
 
         @bot.event
         async def on_guild_remove(guild):
             print(f'➖ Left server: {guild.name} (ID: {guild.id})')
-            db.remove_guild(str(guild.id))
+            await db.remove_guild(guild.id)
 
         @bot.event
         async def on_member_join(member):
             if not member.bot:
-                db.add_guild_member(str(member.guild.id), str(member.id))
+                await db.add_guild_member(member.guild.id, member.id)
 
         @bot.event
         async def on_member_remove(member):
             if not member.bot:
-                db.remove_guild_member(str(member.guild.id), str(member.id))
+                await db.remove_guild_member(member.guild.id, member.id)
+
+        @bot.before_invoke
+        async def open_read_memo(ctx):
+            # Repeated reads within one command are served from memory until it writes
+            ctx.read_memo = read_memo.begin()
+
+        @bot.after_invoke
+        async def close_read_memo(ctx):
+            read_memo.end(ctx.read_memo)
 
         @bot.event
         async def on_command_error(ctx, error):
@@ -149,6 +151,8 @@ async def main():
         await bot.start(TOKEN)
     
     finally:
+        if services:
+            services.close()
         if os.path.exists(LOCK_FILE):
             os.remove(LOCK_FILE)
 
@@ -2,25 +2,93 @@
 
 import discord
 from discord.ext import commands
-from datetime import datetime
-from src.database.db_manager import DatabaseManager
-from src.economy.economy_manager import EconomyManager
-from src.core.achievements import AchievementManager
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, List, Optional, Tuple
 from src.config import PREFIX
+from src.database.ledger import TRANSACTION_TYPES, describe
+
+
+# Ranking name -> (column, label, emoji, unit)
+LEADERBOARD_METRICS = {
+    'coins': ('coins', 'coins', '💰', '🪙'),
+    'won': ('total_won', 'coins won', '📈', '🪙'),
+    'wins': ('games_won', 'wins', '🏆', 'wins'),
+    'streak': ('streak', 'daily streak', '🔥', 'days'),
+}
+METRIC_NAMES = list(LEADERBOARD_METRICS)
+
+HISTORY_PAGE_SIZE = 10
+
+
+def _format_time(timestamp: int, fmt: str) -> str:
+    """Format a stored unix timestamp (UTC)"""
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime(fmt)
+
+
+class HistoryView(discord.ui.View):
+    """
+    Newer/Older pager over a keyset-paginated history
+
+    fetch(before, limit) returns rows newest first, strictly older than the
+    (timestamp, id) cursor. Each page fetches one row past the page size to
+    know whether an older page exists, and the cursors of the pages already
+    shown are kept so Newer steps back without an OFFSET.
+    """
+    
+    def __init__(self, author_id: int, fetch: Callable[[Optional[Tuple[int, int]], int], Awaitable[List]],
+                 render: Callable[[List, int], discord.Embed], timeout: float = 180):
+        super().__init__(timeout=timeout)
+        self.author_id = author_id
+        self.fetch = fetch
+        self.render = render
+        self.cursors: List[Optional[Tuple[int, int]]] = [None]
+        self.rows: List = []
+    
+    async def load(self) -> discord.Embed:
+        """Fetch the page starting at the current cursor and render it"""
+        rows = await self.fetch(self.cursors[-1], HISTORY_PAGE_SIZE + 1)
+        self.rows = rows[:HISTORY_PAGE_SIZE]
+        self.newer_button.disabled = len(self.cursors) == 1
+        self.older_button.disabled = len(rows) <= HISTORY_PAGE_SIZE
+        return self.render(self.rows, len(self.cursors))
+    
+    @property
+    def single_page(self) -> bool:
+        return self.newer_button.disabled and self.older_button.disabled
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message('Not your pagination!', ephemeral=True)
+            return False
+        return True
+    
+    @discord.ui.button(label='◀️ Newer', style=discord.ButtonStyle.gray)
+    async def newer_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if len(self.cursors) > 1:
+            self.cursors.pop()
+        await interaction.response.edit_message(embed=await self.load(), view=self)
+    
+    @discord.ui.button(label='Older ▶️', style=discord.ButtonStyle.gray)
+    async def older_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if self.rows:
+            last = self.rows[-1]
+            self.cursors.append((last['timestamp'], last['id']))
+        await interaction.response.edit_message(embed=await self.load(), view=self)
 
 
 class Economy(commands.Cog):
-    def __init__(self, bot):
+    def __init__(self, bot, services):
         self.bot = bot
-        self.db = DatabaseManager()
-        self.economy = EconomyManager(self.db)
-        self.achievements = AchievementManager(self.db)
+        self.db = services.db
+        self.economy = services.economy
+        self.achievements = services.achievements
+        self.leaderboards = services.leaderboards
     
     @commands.command(name='balance', aliases=['bal', 'coins'])
     async def balance(self, ctx, member: discord.Member = None):
         """Show coin balance"""
         member = member or ctx.author
-        user = self.db.get_user(str(member.id), member.name)
+        user = await self.db.get_user(member.id, member.name)
         
         is_broke = user["coins"] < 1000
         is_negative = user["coins"] < 0
@@ -55,7 +123,7 @@ class Economy(commands.Cog):
         embed.add_field(name='Net Profit', value=f'{net_symbol} {net:,}', inline=True)
         
         embed.set_thumbnail(url=member.display_avatar.url)
-        embed.set_footer(text=f'Member since {user["created_at"][:10]}')
+        embed.set_footer(text=f'Member since {_format_time(user["created_at"], "%Y-%m-%d")}')
         
         await ctx.send(embed=embed)
     
@@ -74,8 +142,8 @@ class Economy(commands.Cog):
             await ctx.send('❌ Amount must be greater than 0!')
             return
         
-        self.db.get_user(str(member.id), member.name)
-        success, message = self.economy.transfer_coins(str(ctx.author.id), str(member.id), amount)
+        await self.db.get_user(member.id, member.name)
+        success, message = await self.economy.transfer_coins(ctx.author.id, member.id, amount)
         
         if success:
             embed = discord.Embed(
@@ -90,7 +158,7 @@ class Economy(commands.Cog):
     @commands.command(name='daily')
     async def daily(self, ctx):
         """Claim daily reward"""
-        success, coins_earned, streak = self.db.claim_daily_reward(str(ctx.author.id))
+        success, coins_earned, streak = await self.db.claim_daily_reward(ctx.author.id)
         
         if not success:
             await ctx.send('❌ Already claimed today! Come back tomorrow.')
@@ -109,7 +177,7 @@ class Economy(commands.Cog):
         
         embed.set_footer(text='Come back tomorrow for more!')
         
-        new_achievements = self.achievements.check_achievements(str(ctx.author.id), ctx.author.name)
+        new_achievements = await self.achievements.check_achievements(ctx.author.id, ctx.author.name)
         if new_achievements:
             achievement_text = '\n'.join([f'{a.emoji} **{a.title}** (+{a.reward} 🪙)' for a in new_achievements])
             embed.add_field(name='🏆 Achievements Unlocked!', value=achievement_text, inline=False)
@@ -117,33 +185,99 @@ class Economy(commands.Cog):
         await ctx.send(embed=embed)
     
     @commands.command(name='history', aliases=['hist', 'transactions'])
-    async def history(self, ctx):
-        """Show transaction history"""
-        transactions = self.db.get_transaction_history(str(ctx.author.id), limit=10)
+    async def history(self, ctx, kind: str = None):
+        """Show transaction history, optionally of one type or one game"""
+        kind = kind.lower() if kind else None
+        transaction_type = kind if kind in TRANSACTION_TYPES else None
+        game_type = kind if kind and not transaction_type else None
+        user_id = ctx.author.id
+        
+        async def fetch(before, limit):
+            return await self.db.get_transaction_history(user_id, limit=limit, before=before,
+                                                         transaction_type=transaction_type, game_type=game_type)
+        
+        def render(transactions, page):
+            embed = discord.Embed(
+                title=f'📋 {ctx.author.name}\'s History',
+                description=f'Transactions ({kind}):' if kind else 'Recent transactions:',
+                color=discord.Color.blue()
+            )
+            
+            for trans in transactions:
+                timestamp = _format_time(trans['timestamp'], '%d/%m %H:%M')
+                amount_str = f"+{trans['amount']}" if trans['amount'] > 0 else str(trans['amount'])
+                emoji = '💰' if trans['amount'] > 0 else '💸'
+                description = describe(trans['transaction_type'], trans['game_type'], trans['detail'])
+                embed.add_field(name=f'{emoji} {amount_str} 🪙', value=f'{description}\n*{timestamp}*', inline=False)
+            
+            embed.set_footer(text=f'Page {page}')
+            return embed
         
-        if not transactions:
-            await ctx.send('📋 No transactions yet!')
-            return
+        empty = '📋 No transactions yet!'
+        if kind:
+            empty = f'📋 No {kind} transactions yet! Filter by a game or one of: {", ".join(TRANSACTION_TYPES)}'
+        await self._send_history(ctx, fetch, render, empty)
+    
+    @commands.command(name='gamehistory', aliases=['ghistory'])
+    async def gamehistory(self, ctx, game_type: str = None):
+        """Show game history, optionally of one game"""
+        game_type = game_type.lower() if game_type else None
+        user_id = ctx.author.id
         
-        embed = discord.Embed(
-            title=f'📋 {ctx.author.name}\'s History',
-            description='Recent transactions:',
-            color=discord.Color.blue()
-        )
+        async def fetch(before, limit):
+            return await self.db.get_game_history(user_id, limit=limit, before=before, game_type=game_type)
         
-        for trans in transactions:
-            timestamp = datetime.fromisoformat(trans['timestamp']).strftime('%d/%m %H:%M')
-            amount_str = f"+{trans['amount']}" if trans['amount'] > 0 else str(trans['amount'])
-            emoji = '💰' if trans['amount'] > 0 else '💸'
-            description = trans['description'] or trans['transaction_type']
-            embed.add_field(name=f'{emoji} {amount_str} 🪙', value=f'{description}\n*{timestamp}*', inline=False)
+        def render(games, page):
+            embed = discord.Embed(
+                title=f'🎮 {ctx.author.name}\'s Games',
+                description=f'Recent {game_type} games:' if game_type else 'Recent games:',
+                color=discord.Color.blue()
+            )
+            
+            for game in games:
+                timestamp = _format_time(game['timestamp'], '%d/%m %H:%M')
+                winnings_str = f"+{game['winnings']}" if game['winnings'] > 0 else str(game['winnings'])
+                emoji = '✅' if game['result'] == 'win' else '❌'
+                embed.add_field(
+                    name=f"{emoji} {game['game_type']} - {winnings_str} 🪙",
+                    value=f"Bet: {game['bet_amount']} 🪙\n*{timestamp}*",
+                    inline=False
+                )
+            
+            embed.set_footer(text=f'Page {page}')
+            return embed
         
-        await ctx.send(embed=embed)
+        empty = f'🎮 No {game_type} games yet!' if game_type else '🎮 No games yet!'
+        await self._send_history(ctx, fetch, render, empty)
     
-    @commands.command(name='ranking', aliases=['leaderboard', 'top', 'rank'])
-    async def leaderboard(self, ctx):
-        """Show player ranking"""
-        leaders = self.db.get_leaderboard(limit=10)
+    async def _send_history(self, ctx, fetch, render, empty: str):
+        """Send the first history page, with pager buttons if there are more"""
+        view = HistoryView(ctx.author.id, fetch, render)
+        embed = await view.load()
+        
+        if not view.rows:
+            await ctx.send(empty)
+            return
+        
+        if view.single_page:
+            await ctx.send(embed=embed)
+        else:
+            await ctx.send(embed=embed, view=view)
+    
+    def _resolve_metric(self, metric: str):
+        """Map a user-typed metric name to (column, label, emoji, unit)"""
+        return LEADERBOARD_METRICS.get((metric or 'coins').lower())
+    
+    @commands.command(name='ranking', aliases=['leaderboard', 'top'])
+    async def leaderboard(self, ctx, metric: str = 'coins'):
+        """Show player ranking (coins, won, wins or streak)"""
+        resolved = self._resolve_metric(metric)
+        if not resolved:
+            await ctx.send(f'❌ Unknown ranking! Use: {", ".join(METRIC_NAMES)}')
+            return
+        column, label, emoji, unit = resolved
+        
+        leaders = self.leaderboards.top(10, column)
         
         if not leaders:
             await ctx.send('📊 No players on the leaderboard yet!')
@@ -151,28 +285,61 @@ class Economy(commands.Cog):
         
         embed = discord.Embed(
             title='🏆 Leaderboard - Top 10',
-            description='The richest players!',
+            description='The richest players!' if column == 'coins' else f'Ranked by {label}',
             color=discord.Color.gold()
         )
         
         medals = ['🥇', '🥈', '🥉']
         
-        for i, leader in enumerate(leaders):
-            medal = medals[i] if i < 3 else f'{i+1}.'
+        for rank, leader in leaders:
+            medal = medals[rank - 1] if rank <= 3 else f'{rank}.'
             embed.add_field(
                 name=f'{medal} {leader["username"]}',
-                value=f'💰 {leader["coins"]:,} 🪙 | 🎮 {leader["games_played"]} games',
+                value=f'{emoji} {leader[column] or 0:,} {unit} | 🎮 {leader["games_played"]} games',
                 inline=False
             )
         
+        embed.set_footer(text=f'Use {PREFIX}rank to see your position')
+        await ctx.send(embed=embed)
+    
+    @commands.command(name='rank', aliases=['posicao'])
+    async def rank(self, ctx, member: Optional[discord.Member] = None, metric: str = 'coins'):
+        """Show your position in the ranking and who is around you"""
+        member = member or ctx.author
+        resolved = self._resolve_metric(metric)
+        if not resolved:
+            await ctx.send(f'❌ Unknown ranking! Use: {", ".join(METRIC_NAMES)}')
+            return
+        column, label, emoji, unit = resolved
+        
+        # Make sure the user exists (and is ranked) before looking them up
+        await self.db.get_user(member.id, member.name)
+        position, total = self.leaderboards.rank(member.id, column)
+        
+        if position is None:
+            await ctx.send(f'📊 {member.mention} is not on the leaderboard yet!')
+            return
+        
+        embed = discord.Embed(
+            title=f'📊 {member.display_name} - #{position:,} of {total:,}',
+            description=f'Ranked by {label}',
+            color=discord.Color.gold()
+        )
+        
+        lines = []
+        for rank, row in self.leaderboards.around(member.id, 2, column):
+            marker = '👉 ' if row['user_id'] == member.id else ''
+            lines.append(f'{marker}**#{rank:,}** {row["username"]} - {emoji} {row[column] or 0:,} {unit}')
+        embed.add_field(name='Around you', value='\n'.join(lines), inline=False)
+        
         await ctx.send(embed=embed)
     
     @commands.command(name='achievements', aliases=['ach'])
     async def achievements_cmd(self, ctx, member: discord.Member = None):
         """Show player achievements"""
         member = member or ctx.author
-        user_achievements = self.db.get_user_achievements(str(member.id))
-        all_achievements = self.achievements.get_all_achievements()
+        user_achievements = await self.db.get_user_achievements(member.id)
+        all_achievements = await self.achievements.get_all_achievements()
         
         unlocked_names = {a['achievement_name'] for a in user_achievements}
         
@@ -181,7 +348,7 @@ class Economy(commands.Cog):
             if achievement.name in unlocked_names:
                 status = '✅'
                 unlock_info = next((a for a in user_achievements if a['achievement_name'] == achievement.name), None)
-                date = datetime.fromisoformat(unlock_info['unlocked_at']).strftime('%d/%m/%Y') if unlock_info else ''
+                date = _format_time(unlock_info['unlocked_at'], '%d/%m/%Y') if unlock_info else ''
                 value = f'{achievement.description}\n*Unlocked on {date}*'
             else:
                 status = '🔒'
@@ -239,4 +406,4 @@ class Economy(commands.Cog):
 
 
 async def setup(bot):
-    await bot.add_cog(Economy(bot))
+    await bot.add_cog(Economy(bot, bot.services))
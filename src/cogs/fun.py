@@ -6,19 +6,17 @@ import asyncio
 from src.fun.jokes import JokeManager
 from src.fun.trivia import TriviaManager
 from src.fun.poll import PollManager
-from src.database.db_manager import DatabaseManager
-from src.economy.economy_manager import EconomyManager
 from src.config import PREFIX
 
 
 class Fun(commands.Cog):
-    def __init__(self, bot):
+    def __init__(self, bot, services):
         self.bot = bot
         self.jokes = JokeManager()
         self.trivia = TriviaManager()
         self.polls = PollManager()
-        self.db = DatabaseManager()
-        self.economy = EconomyManager(self.db)
+        self.db = services.db
+        self.economy = services.economy
         self.used_questions = {}
     
     @commands.command(name='joke', aliases=['jokes'])
@@ -79,7 +77,7 @@ class Fun(commands.Cog):
             answer_index = number_emojis.index(str(reaction.emoji))
             
             if answer_index == question.correct:
-                self.economy.add_coins(str(ctx.author.id), 50, 'Trivia correct')
+                await self.economy.add_coins(ctx.author.id, 50, 'Trivia correct')
                 embed = discord.Embed(
                     title='✅ Correct!',
                     description=f'**{ctx.author.display_name}** won **50 🪙**!',
@@ -94,7 +92,7 @@ class Fun(commands.Cog):
                 )
                 embed.add_field(name='Correct Answer', value=question.options[question.correct], inline=False)
             
-            user_data = self.db.get_user(str(ctx.author.id), ctx.author.name)
+            user_data = await self.db.get_user(ctx.author.id, ctx.author.name)
             embed.set_footer(text=f'Balance: {user_data["coins"]:,} 🪙')
             await msg.edit(embed=embed)
         
@@ -225,4 +223,4 @@ class Fun(commands.Cog):
 
 
 async def setup(bot):
-    await bot.add_cog(Fun(bot))
+    await bot.add_cog(Fun(bot, bot.services))
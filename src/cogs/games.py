@@ -4,59 +4,75 @@ import discord
 from discord.ext import commands
 import asyncio
 import random
-from src.database.db_manager import DatabaseManager
-from src.economy.economy_manager import EconomyManager
-from src.core.achievements import AchievementManager
-from src.core.checks import ensure_not_playing, start_game, end_game
+from contextlib import asynccontextmanager
+from src.core.checks import ensure_not_playing, playing
 from src.core.mensagens import MensagensCasuais as MSG
-from src.games.roulette import RouletteGame
-from src.games.slots import SlotsGame
-from src.games.dice import DiceGame
 from src.games.blackjack import BlackjackGame
-from src.games.tigrinho import TigrinhoGame
 from src.games.mines import MinesGame
-from src.games.crash import CrashGame
-from src.games.double import DoubleGame
-from src.games.coinflip import CoinFlipGame
-from src.games.wheel import WheelGame
-from src.games.keno import KenoGame
-from src.games.plinko import PlinkoGame
-from src.games.baccarat import BaccaratGame
-from src.games.hilo import HiLoGame
-from src.games.limbo import LimboGame
 from src.games.tower import TowerGame
-from src.games.scratch import ScratchCardGame
 from src.games.videopoker import VideoPokerGame
 from src.games.heist import HeistGame
+from src.games.plugin import PLUGINS
 from src.config import PREFIX
 import time
 
 
+def format_chance(probability: float) -> str:
+    """A probability as a percentage, or as 1 in N once it gets tiny"""
+    if 0 < probability < 0.001:
+        return f'1 em {round(1 / probability):,}'
+    return f'{probability:.2%}'
+
+
 class Games(commands.Cog):
     """Casino game commands"""
     
-    def __init__(self, bot):
+    def __init__(self, bot, services):
         self.bot = bot
-        self.db = DatabaseManager()
-        self.economy = EconomyManager(self.db)
-        self.achievements = AchievementManager(self.db)
+        self.db = services.db
+        self.economy = services.economy
+        self.achievements = services.achievements
+        # One-shot games (roleta, slots, ...) run through the engine's pipeline
+        self.engine = services.game_engine
+        # Exact odds tables, computed (or loaded from cache) once at startup
+        self.odds = services.odds
+        # Provably fair rounds (crash, limbo, double, plinko) and their verification
+        self.fairness = services.fairness
         self.heist_cooldowns = {}  # user_id: timestamp
         self.active_heists = {}  # message_id: heist_data
     
-    async def check_balance(self, ctx, amount: int) -> bool:
-        """Check if user can afford the bet"""
-        user = self.db.get_user(str(ctx.author.id), ctx.author.name)
+    async def check_debt(self, ctx) -> bool:
+        """Check the user isn't in debt"""
+        user = await self.db.get_user(ctx.author.id, ctx.author.name)
         
         # Check if balance is negative
         if user['coins'] < 0:
             await ctx.send(f'🚨 **YOU ARE IN DEBT!**\nBalance: **{user["coins"]:,} 🪙**\n\nPay your debts before playing!')
             return False
-        
-        if not self.economy.can_afford(str(ctx.author.id), ctx.author.name, amount):
-            await ctx.send(MSG.saldo_insuficiente())
-            return False
         return True
     
+    @asynccontextmanager
+    async def staked(self, ctx, game_type: str, amount: int):
+        """
+        Hold the author's game slot and escrow their stake for the block
+        
+        Used by interactive games that wait on the player: the stake is
+        reserved up front (settle it with economy.settle_hold) instead of
+        re-checking the balance. Yields the hold id, or None after telling
+        the user why they can't play. An unsettled hold is released on exit.
+        """
+        async with playing(ctx, game_type) as lease:
+            hold = None
+            if lease and await self.check_debt(ctx):
+                hold = await self.economy.hold(ctx.author.id, ctx.author.name, amount, game_type)
+                if hold is None:
+                    await ctx.send(MSG.saldo_insuficiente())
+            try:
+                yield hold
+            finally:
+                if hold is not None:
+                    await self.economy.release_hold(hold)
+    
     @commands.command(name='roleta', aliases=['roulette', 'rlt'])
     async def roulette(self, ctx, bet_amount: int, bet_type: str, bet_value: str):
         """
@@ -64,157 +80,12 @@ class Games(commands.Cog):
         Usage: /roulette <amount> <type> <bet>
         Tipos: numero (0-36), cor (vermelho/preto), paridade (par/impar), altura (baixo/alto)
         """
-        if not await ensure_not_playing(ctx):
-            return
-        
-        if bet_amount < 10:
-            await ctx.send(MSG.aposta_minima())
-            return
-        
-        if not await self.check_balance(ctx, bet_amount):
-            return
-        
-        start_game(ctx.author.id, 'roulette')
-        
-        try:
-            # Spin the wheel
-            number = RouletteGame.spin()
-            color = RouletteGame.get_color(number)
-            
-            # Check if bet won
-            won, multiplier = RouletteGame.check_bet(number, bet_type, bet_value)
-            
-            # Process bet
-            success, net_change = self.economy.process_bet(
-                str(ctx.author.id),
-                ctx.author.name,
-                bet_amount,
-                'roleta',
-                won,
-                multiplier
-            )
-            
-            if not success:
-                await ctx.send(MSG.erro_processar())
-                return
-            
-            # Create result embed
-            embed = discord.Embed(
-                title=f'🎰 European Roulette - {ctx.author.display_name}',
-                color=discord.Color.green() if won else discord.Color.red()
-            )
-            
-            color_emoji = {'vermelho': '🔴', 'preto': '⚫', 'verde': '🟢'}
-            embed.add_field(
-                name='Result',
-                value=f'{color_emoji.get(color, "⚪")} **{number}** ({color})',
-                inline=False
-            )
-            
-            embed.add_field(name='Your Bet', value=f'{bet_type}: {bet_value}', inline=True)
-            embed.add_field(name='Amount', value=f'{bet_amount:,} 🪙', inline=True)
-            
-            if won:
-                embed.add_field(
-                    name='🎉 WON!',
-                    value=f'+{net_change:,} 🪙 (multiplicador: {multiplier}x)',
-                    inline=False
-                )
-            else:
-                embed.add_field(
-                    name='❌ Lost',
-                    value=f'{net_change:,} 🪙',
-                    inline=False
-                )
-            
-            user = self.db.get_user(str(ctx.author.id), ctx.author.name)
-            embed.set_footer(text=f'Current balance: {user["coins"]:,} 🪙')
-            
-            await ctx.send(embed=embed)
-            
-            # Check achievements
-            new_achievements = self.achievements.check_achievements(str(ctx.author.id), ctx.author.name)
-            if new_achievements:
-                achievement_text = '\n'.join([f'{a.emoji} **{a.title}** (+{a.reward} 🪙)' for a in new_achievements])
-                await ctx.send(f'🏆 **Conquistas Desbloqueadas!**\n{achievement_text}')
-        
-        finally:
-            end_game(ctx.author.id)
+        await self.engine.run(ctx, 'roleta', bet_amount, bet_type, bet_value)
     
     @commands.command(name='slots', aliases=['slot', 'caça', 'cacaniquel'])
     async def slots(self, ctx, bet_amount: int):
         """Joga no caça-níqueis"""
-        if not await ensure_not_playing(ctx):
-            return
-        
-        if bet_amount < 10:
-            await ctx.send(MSG.aposta_minima())
-            return
-        
-        if not await self.check_balance(ctx, bet_amount):
-            return
-        
-        start_game(ctx.author.id, 'slots')
-        
-        try:
-            # Spin the slots
-            reels = SlotsGame.spin()
-            won, multiplier, description = SlotsGame.calculate_win(reels)
-            
-            # Process bet
-            success, net_change = self.economy.process_bet(
-                str(ctx.author.id),
-                ctx.author.name,
-                bet_amount,
-                'slots',
-                won,
-                multiplier
-            )
-            
-            if not success:
-                await ctx.send(MSG.erro_processar())
-                return
-            
-            # Create result embed
-            embed = discord.Embed(
-                title=f'🎰 Slot Machine - {ctx.author.display_name}',
-                color=discord.Color.green() if won else discord.Color.red()
-            )
-            
-            embed.add_field(
-                name='Result',
-                value=f'**{SlotsGame.format_reels(reels)}**',
-                inline=False
-            )
-            
-            embed.add_field(name='Bet', value=f'{bet_amount:,} 🪙', inline=True)
-            
-            if won:
-                embed.add_field(
-                    name='✨ ' + description,
-                    value=f'+{net_change:,} 🪙 ({multiplier}x)',
-                    inline=False
-                )
-            else:
-                embed.add_field(
-                    name='❌ ' + description,
-                    value=f'{net_change:,} 🪙',
-                    inline=False
-                )
-            
-            user = self.db.get_user(str(ctx.author.id), ctx.author.name)
-            embed.set_footer(text=f'Current balance: {user["coins"]:,} 🪙')
-            
-            await ctx.send(embed=embed)
-            
-            # Check achievements
-            new_achievements = self.achievements.check_achievements(str(ctx.author.id), ctx.author.name)
-            if new_achievements:
-                achievement_text = '\n'.join([f'{a.emoji} **{a.title}** (+{a.reward} 🪙)' for a in new_achievements])
-                await ctx.send(f'🏆 **Conquistas Desbloqueadas!**\n{achievement_text}')
-        
-        finally:
-            end_game(ctx.author.id)
+        await self.engine.run(ctx, 'slots', bet_amount)
     
     @commands.command(name='dados', aliases=['dice', 'dado'])
     async def dice(self, ctx, bet_amount: int, bet_type: str):
@@ -223,94 +94,7 @@ class Games(commands.Cog):
         Uso: /dados <valor> <tipo>
         Tipos: acima, abaixo, sete, alto, baixo, 1-6
         """
-        if not await ensure_not_playing(ctx):
-            return
-        
-        if bet_amount < 10:
-            await ctx.send(MSG.aposta_minima())
-            return
-        
-        if not await self.check_balance(ctx, bet_amount):
-            return
-        
-        start_game(ctx.author.id, 'dice')
-        
-        try:
-            bet_type_lower = bet_type.lower()
-            
-            # Determine game type and play
-            if bet_type_lower in ['acima', 'abaixo', 'sete', 'seven']:
-                won, dice, total, multiplier = DiceGame.play_over_under(bet_type_lower)
-                result_text = f'{DiceGame.format_dice(dice)}\nTotal: **{total}**'
-            elif bet_type_lower in ['alto', 'baixo', 'high', 'low']:
-                won, roll, multiplier = DiceGame.play_high_low(bet_type_lower)
-                dice_emoji = ['⚀', '⚁', '⚂', '⚃', '⚄', '⚅']
-                result_text = f'{dice_emoji[roll-1]} **{roll}**'
-            else:
-                # Try specific number
-                try:
-                    bet_number = int(bet_type)
-                    if 1 <= bet_number <= 6:
-                        won, roll, multiplier = DiceGame.play_specific_number(bet_number)
-                        dice_emoji = ['⚀', '⚁', '⚂', '⚃', '⚄', '⚅']
-                        result_text = f'{dice_emoji[roll-1]} **{roll}**'
-                    else:
-                        await ctx.send('❌ Invalid bet type!')
-                        return
-                except ValueError:
-                    await ctx.send('❌ Invalid bet type!')
-                    return
-            
-            # Process bet
-            success, net_change = self.economy.process_bet(
-                str(ctx.author.id),
-                ctx.author.name,
-                bet_amount,
-                'dados',
-                won,
-                multiplier
-            )
-            
-            if not success:
-                await ctx.send(MSG.erro_processar())
-                return
-            
-            # Create result embed
-            embed = discord.Embed(
-                title=f'🎲 Dados - {ctx.author.display_name}',
-                color=discord.Color.green() if won else discord.Color.red()
-            )
-            
-            embed.add_field(name='Result', value=result_text, inline=False)
-            embed.add_field(name='Your Bet', value=bet_type, inline=True)
-            embed.add_field(name='Amount', value=f'{bet_amount:,} 🪙', inline=True)
-            
-            if won:
-                embed.add_field(
-                    name='🎉 WON!',
-                    value=f'+{net_change:,} 🪙 ({multiplier}x)',
-                    inline=False
-                )
-            else:
-                embed.add_field(
-                    name='❌ Lost',
-                    value=f'{net_change:,} 🪙',
-                    inline=False
-                )
-            
-            user = self.db.get_user(str(ctx.author.id), ctx.author.name)
-            embed.set_footer(text=f'Current balance: {user["coins"]:,} 🪙')
-            
-            await ctx.send(embed=embed)
-            
-            # Check achievements
-            new_achievements = self.achievements.check_achievements(str(ctx.author.id), ctx.author.name)
-            if new_achievements:
-                achievement_text = '\n'.join([f'{a.emoji} **{a.title}** (+{a.reward} 🪙)' for a in new_achievements])
-                await ctx.send(f'🏆 **Conquistas Desbloqueadas!**\n{achievement_text}')
-        
-        finally:
-            end_game(ctx.author.id)
+        await self.engine.run(ctx, 'dados', bet_amount, bet_type)
     
     @commands.command(name='blackjack', aliases=['bj', '21'])
     async def blackjack(self, ctx, bet_amount: int):
@@ -322,12 +106,10 @@ class Games(commands.Cog):
             await ctx.send(MSG.aposta_minima())
             return
         
-        if not await self.check_balance(ctx, bet_amount):
-            return
-        
-        start_game(ctx.author.id, 'blackjack')
-        
-        try:
+        async with self.staked(ctx, 'blackjack', bet_amount) as hold:
+            if hold is None:
+                return
+            
             # Start game
             game = BlackjackGame()
             game.start_game()
@@ -415,401 +197,72 @@ class Games(commands.Cog):
             if result == 'push':
                 # Return bet
                 net_change = 0
-                self.db.record_game(str(ctx.author.id), 'blackjack', bet_amount, 'push', 0)
-            else:
-                success, net_change = self.economy.process_bet(
-                    str(ctx.author.id),
-                    ctx.author.name,
-                    bet_amount,
-                    'blackjack',
-                    won,
-                    multiplier
-                )
-            
-            # Show final result
-            embed = discord.Embed(
-                title=f'🃏 Blackjack - {ctx.author.display_name}',
-                color=discord.Color.green() if won else discord.Color.red() if result != 'push' else discord.Color.blue()
-            )
-            
-            embed.add_field(name='🎴 Sua Mão', value=game.get_player_hand_str(), inline=False)
-            embed.add_field(name='🂠 Mão do Dealer', value=game.get_dealer_hand_str(), inline=False)
-            
-            if result == 'player_blackjack':
-                embed.add_field(name='🎉 BLACKJACK!', value=f'+{net_change:,} 🪙', inline=False)
-            elif result == 'player_win':
-                embed.add_field(name='🎉 YOU WON!', value=f'+{net_change:,} 🪙', inline=False)
-            elif result == 'dealer_win':
-                embed.add_field(name='❌ Dealer Ganhou', value=f'{net_change:,} 🪙', inline=False)
-            elif result == 'push':
-                embed.add_field(name='🤝 Tie', value='Bet returned', inline=False)
-            
-            user = self.db.get_user(str(ctx.author.id), ctx.author.name)
-            embed.set_footer(text=f'Current balance: {user["coins"]:,} 🪙')
-            
-            await msg.edit(embed=embed)
-            
-            # Check achievements
-            new_achievements = self.achievements.check_achievements(str(ctx.author.id), ctx.author.name)
-            if new_achievements:
-                achievement_text = '\n'.join([f'{a.emoji} **{a.title}** (+{a.reward} 🪙)' for a in new_achievements])
-                await ctx.send(f'🏆 **Conquistas Desbloqueadas!**\n{achievement_text}')
-        
-        finally:
-            end_game(ctx.author.id)
-    
-    @commands.command(name='tigrinho', aliases=['tiger', 'tigre'])
-    async def tigrinho(self, ctx, bet_amount: int):
-        """
-        Joga Tigrinho (Fortune Tiger) - slot 3x3
-        Uso: /tigrinho <valor>
-        """
-        if not await ensure_not_playing(ctx):
-            return
-        
-        if bet_amount < 10:
-            await ctx.send(MSG.aposta_minima())
-            return
-        
-        if not await self.check_balance(ctx, bet_amount):
-            return
-        
-        start_game(ctx.author.id, 'tigrinho')
-        
-        try:
-            # Create spinning animation
-            embed = discord.Embed(
-                title='🐅 Tigrinho - Fortune Tiger',
-                description=MSG.girando(),
-                color=discord.Color.gold()
-            )
-            
-            # Show initial spinning animation
-            grid_display = TigrinhoGame.format_spinning_frame(0)
-            embed.add_field(name='Grade', value=f'```\n{grid_display}\n```', inline=False)
-            
-            msg = await ctx.send(embed=embed)
-            
-            # Animate spinning
-            for i in range(3):
-                await asyncio.sleep(0.8)
-                embed = discord.Embed(
-                    title='🐅 Tigrinho - Fortune Tiger',
-                    description=MSG.girando(),
-                    color=discord.Color.gold()
-                )
-                grid_display = TigrinhoGame.format_spinning_frame(i)
-                embed.add_field(name='Grade', value=f'```\n{grid_display}\n```', inline=False)
-                await msg.edit(embed=embed)
-            
-            # Final spin
-            grid = TigrinhoGame.spin()
-            won, total_multiplier, win_descriptions = TigrinhoGame.calculate_win(grid)
-            
-            # Process bet
-            success, net_change = self.economy.process_bet(
-                str(ctx.author.id),
-                ctx.author.name,
-                bet_amount,
-                'tigrinho',
-                won,
-                total_multiplier
-            )
-            
-            if not success:
-                await ctx.send(MSG.erro_processar())
-                return
-            
-            # Create final result embed
-            embed = discord.Embed(
-                title=f'🐅 Tigrinho - {ctx.author.display_name}',
-                color=discord.Color.green() if won else discord.Color.red()
-            )
-            
-            grid_display = TigrinhoGame.format_grid(grid)
-            embed.add_field(name='Result', value=f'```\n{grid_display}\n```', inline=False)
-            embed.add_field(name='Bet', value=f'{bet_amount:,} 🪙', inline=True)
-            
-            if won:
-                win_text = '\n'.join(win_descriptions)
-                embed.add_field(
-                    name='🎉 WON!',
-                    value=f'{win_text}\n\n**Total: +{net_change:,} 🪙 ({total_multiplier:.0f}x)**',
-                    inline=False
-                )
-            else:
-                embed.add_field(
-                    name='❌ Sem combinações',
-                    value=f'{net_change:,} 🪙',
-                    inline=False
-                )
-            
-            user = self.db.get_user(str(ctx.author.id), ctx.author.name)
-            embed.set_footer(text=f'Current balance: {user["coins"]:,} 🪙')
-            
-            await msg.edit(embed=embed)
-            
-            # Check achievements
-            new_achievements = self.achievements.check_achievements(str(ctx.author.id), ctx.author.name)
-            if new_achievements:
-                achievement_text = '\n'.join([f'{a.emoji} **{a.title}** (+{a.reward} 🪙)' for a in new_achievements])
-                await ctx.send(f'🏆 **Conquistas Desbloqueadas!**\n{achievement_text}')
-        
-        finally:
-            end_game(ctx.author.id)
-    
-    @commands.command(name='crash', aliases=['aviator'])
-    async def crash(self, ctx, bet_amount: int, target_multiplier: float = 2.0):
-        """
-        Joga Crash - multiplier cresce até crashar
-        Uso: /crash <valor> [multiplicador_alvo]
-        Exemplo: /crash 100 2.5
-        """
-        if not await ensure_not_playing(ctx):
-            return
-        
-        if bet_amount < 10:
-            await ctx.send(MSG.aposta_minima())
-            return
-        
-        if target_multiplier < 1.1 or target_multiplier > 100:
-            await ctx.send('❌ O multiplicador deve estar entre 1.1x e 100x!')
-            return
-        
-        if not await self.check_balance(ctx, bet_amount):
-            return
-        
-        start_game(ctx.author.id, 'crash')
-        
-        try:
-            # Generate crash point
-            crash_point = CrashGame.generate_crash_point()
-            
-            # Create initial embed
-            embed = discord.Embed(
-                title='🚀 Crash',
-                description=f'Alvo: **{target_multiplier:.2f}x**\n{CrashGame.get_risk_level(target_multiplier)}',
-                color=discord.Color.blue()
-            )
-            
-            embed.add_field(name='Bet', value=f'{bet_amount:,} 🪙', inline=True)
-            embed.add_field(name='🎯 Meta', value=f'{target_multiplier:.2f}x', inline=True)
-            
-            msg = await ctx.send(embed=embed)
-            
-            # Animate multiplier growth
-            steps = CrashGame.get_multiplier_steps(crash_point, num_steps=8)
-            
-            for current in steps:
-                await asyncio.sleep(0.6)
-                
-                # Check if we passed target
-                if current >= target_multiplier:
-                    break
-                
-                embed = discord.Embed(
-                    title='🚀 Crash',
-                    description=CrashGame.format_multiplier_animation(current),
-                    color=discord.Color.blue()
-                )
-                
-                embed.add_field(name='Bet', value=f'{bet_amount:,} 🪙', inline=True)
-                embed.add_field(name='🎯 Meta', value=f'{target_multiplier:.2f}x', inline=True)
-                
-                await msg.edit(embed=embed)
-            
-            # Determine result
-            won, final_multiplier = CrashGame.simulate_crash(crash_point, target_multiplier)
-            
-            # Process bet
-            success, net_change = self.economy.process_bet(
-                str(ctx.author.id),
-                ctx.author.name,
-                bet_amount,
-                'crash',
-                won,
-                target_multiplier if won else 0
-            )
-            
-            if not success:
-                await ctx.send(MSG.erro_processar())
-                return
-            
-            # Show final result
-            if won:
-                embed = discord.Embed(
-                    title=f'🚀 Crash - {ctx.author.display_name}',
-                    description=f'✅ You cashed out at **{target_multiplier:.2f}x**!',
-                    color=discord.Color.green()
-                )
-                embed.add_field(
-                    name='🎉 WON!',
-                    value=f'+{net_change:,} 🪙 ({target_multiplier:.2f}x)',
-                    inline=False
-                )
-                embed.add_field(
-                    name='Crash Point',
-                    value=f'The game crashed at {crash_point:.2f}x',
-                    inline=False
-                )
-            else:
-                embed = discord.Embed(
-                    title=f'🚀 Crash - {ctx.author.display_name}',
-                    description=CrashGame.format_crash(crash_point),
-                    color=discord.Color.red()
-                )
-                embed.add_field(
-                    name='❌ Lost',
-                    value=f'{net_change:,} 🪙\nCrash antes do alvo {target_multiplier:.2f}x',
-                    inline=False
-                )
-            
-            embed.add_field(name='Bet', value=f'{bet_amount:,} 🪙', inline=True)
-            
-            user = self.db.get_user(str(ctx.author.id), ctx.author.name)
-            embed.set_footer(text=f'Current balance: {user["coins"]:,} 🪙')
-            
-            await msg.edit(embed=embed)
-            
-            # Check achievements
-            new_achievements = self.achievements.check_achievements(str(ctx.author.id), ctx.author.name)
-            if new_achievements:
-                achievement_text = '\n'.join([f'{a.emoji} **{a.title}** (+{a.reward} 🪙)' for a in new_achievements])
-                await ctx.send(f'🏆 **Conquistas Desbloqueadas!**\n{achievement_text}')
-        
-        finally:
-            end_game(ctx.author.id)
-    
-    @commands.command(name='double', aliases=['cor', 'color'])
-    async def double(self, ctx, bet_amount: int, bet_color: str):
-        """
-        Play Double - bet on colors
-        Uso: /double <valor> <cor>
-        Cores: vermelho/red, preto/black, branco/white
-        """
-        if not await ensure_not_playing(ctx):
-            return
-        
-        if bet_amount < 10:
-            await ctx.send(MSG.aposta_minima())
-            return
-        
-        if not DoubleGame.validate_color(bet_color):
-            await ctx.send(
-                f'❌ Cor inválida! Use: vermelho, preto ou branco\n\n'
-                f'{DoubleGame.get_color_info()}'
-            )
-            return
-        
-        if not await self.check_balance(ctx, bet_amount):
-            return
-        
-        start_game(ctx.author.id, 'double')
-        
-        try:
-            # Show spinning animation
-            embed = discord.Embed(
-                title='🎡 Double - Roleta de Cores',
-                description='🎲 Girando a roleta...',
-                color=discord.Color.purple()
-            )
-            
-            embed.add_field(name='Your Bet', value=bet_color.title(), inline=True)
-            embed.add_field(name='Amount', value=f'{bet_amount:,} 🪙', inline=True)
-            
-            wheel_display = DoubleGame.format_wheel_animation()
-            embed.add_field(name='Roleta', value=wheel_display, inline=False)
-            
-            # Show history
-            if DoubleGame.history:
-                embed.add_field(
-                    name='Histórico Recente',
-                    value=DoubleGame.format_history(),
-                    inline=False
-                )
-            
-            msg = await ctx.send(embed=embed)
-            
-            # Animate
-            for _ in range(3):
-                await asyncio.sleep(0.7)
-                wheel_display = DoubleGame.format_wheel_animation()
-                embed = discord.Embed(
-                    title='🎡 Double - Roleta de Cores',
-                    description='🎲 Girando a roleta...',
-                    color=discord.Color.purple()
-                )
-                embed.add_field(name='Your Bet', value=bet_color.title(), inline=True)
-                embed.add_field(name='Amount', value=f'{bet_amount:,} 🪙', inline=True)
-                embed.add_field(name='Roleta', value=wheel_display, inline=False)
-                await msg.edit(embed=embed)
-            
-            # Spin for result
-            result = DoubleGame.spin()
-            won, multiplier = DoubleGame.check_win(result, bet_color)
-            
-            # Process bet
-            success, net_change = self.economy.process_bet(
-                str(ctx.author.id),
-                ctx.author.name,
-                bet_amount,
-                'double',
-                won,
-                multiplier
-            )
-            
-            if not success:
-                await ctx.send(MSG.erro_processar())
-                return
+                user = await self.db.record_game(ctx.author.id, 'blackjack', bet_amount, 'push', 0)
+            else:
+                success, net_change, user = await self.economy.settle_hold(
+                    hold,
+                    ctx.author.name,
+                    won,
+                    multiplier
+                )
+                
+                if not success:
+                    await ctx.send(MSG.erro_processar())
+                    return
             
             # Show final result
             embed = discord.Embed(
-                title=f'🎡 Double - {ctx.author.display_name}',
-                color=discord.Color.green() if won else discord.Color.red()
-            )
-            
-            embed.add_field(
-                name='Result',
-                value=DoubleGame.format_result(result),
-                inline=False
+                title=f'🃏 Blackjack - {ctx.author.display_name}',
+                color=discord.Color.green() if won else discord.Color.red() if result != 'push' else discord.Color.blue()
             )
             
-            embed.add_field(name='Your Bet', value=bet_color.title(), inline=True)
-            embed.add_field(name='Amount', value=f'{bet_amount:,} 🪙', inline=True)
-            
-            if won:
-                embed.add_field(
-                    name='🎉 WON!',
-                    value=f'+{net_change:,} 🪙 ({multiplier:.0f}x)',
-                    inline=False
-                )
-            else:
-                embed.add_field(
-                    name='❌ Lost',
-                    value=f'{net_change:,} 🪙',
-                    inline=False
-                )
+            embed.add_field(name='🎴 Sua Mão', value=game.get_player_hand_str(), inline=False)
+            embed.add_field(name='🂠 Mão do Dealer', value=game.get_dealer_hand_str(), inline=False)
             
-            # Show updated history
-            embed.add_field(
-                name='Histórico Recente',
-                value=DoubleGame.format_history(),
-                inline=False
-            )
+            if result == 'player_blackjack':
+                embed.add_field(name='🎉 BLACKJACK!', value=f'+{net_change:,} 🪙', inline=False)
+            elif result == 'player_win':
+                embed.add_field(name='🎉 YOU WON!', value=f'+{net_change:,} 🪙', inline=False)
+            elif result == 'dealer_win':
+                embed.add_field(name='❌ Dealer Ganhou', value=f'{net_change:,} 🪙', inline=False)
+            elif result == 'push':
+                embed.add_field(name='🤝 Tie', value='Bet returned', inline=False)
             
-            user = self.db.get_user(str(ctx.author.id), ctx.author.name)
             embed.set_footer(text=f'Current balance: {user["coins"]:,} 🪙')
             
             await msg.edit(embed=embed)
             
             # Check achievements
-            new_achievements = self.achievements.check_achievements(str(ctx.author.id), ctx.author.name)
+            new_achievements = await self.achievements.check_achievements(ctx.author.id, ctx.author.name, user)
             if new_achievements:
                 achievement_text = '\n'.join([f'{a.emoji} **{a.title}** (+{a.reward} 🪙)' for a in new_achievements])
                 await ctx.send(f'🏆 **Conquistas Desbloqueadas!**\n{achievement_text}')
-        
-        finally:
-            end_game(ctx.author.id)
+    
+    @commands.command(name='tigrinho', aliases=['tiger', 'tigre'])
+    async def tigrinho(self, ctx, bet_amount: int):
+        """
+        Joga Tigrinho (Fortune Tiger) - slot 3x3
+        Uso: /tigrinho <valor>
+        """
+        await self.engine.run(ctx, 'tigrinho', bet_amount)
+    
+    @commands.command(name='crash', aliases=['aviator'])
+    async def crash(self, ctx, bet_amount: int, target_multiplier: float = 2.0):
+        """
+        Joga Crash - multiplier cresce até crashar
+        Uso: /crash <valor> [multiplicador_alvo]
+        Exemplo: /crash 100 2.5
+        """
+        await self.engine.run(ctx, 'crash', bet_amount, target_multiplier)
+    
+    @commands.command(name='double', aliases=['cor', 'color'])
+    async def double(self, ctx, bet_amount: int, bet_color: str):
+        """
+        Play Double - bet on colors
+        Uso: /double <valor> <cor>
+        Cores: vermelho/red, preto/black, branco/white
+        """
+        await self.engine.run(ctx, 'double', bet_amount, bet_color)
     
     @commands.command(name='mines', aliases=['campo', 'minas'])
     async def mines(self, ctx, bet_amount: int, difficulty: str = 'medio'):
@@ -830,12 +283,10 @@ class Games(commands.Cog):
             await ctx.send('❌ Dificuldade inválida! Use: facil, medio, dificil ou extremo')
             return
         
-        if not await self.check_balance(ctx, bet_amount):
-            return
-        
-        start_game(ctx.author.id, 'mines')
-        
-        try:
+        async with self.staked(ctx, 'mines', bet_amount) as hold:
+            if hold is None:
+                return
+            
             # Create game
             grid_size, num_mines = MinesGame.get_difficulty_settings(difficulty_lower)
             game = MinesGame(grid_size, num_mines)
@@ -858,6 +309,7 @@ class Games(commands.Cog):
             await ctx.send(embed=embed)
             
             # Game loop
+            user = None
             while not game.game_over:
                 def check(m):
                     return m.author == ctx.author and m.channel == ctx.channel
@@ -871,15 +323,17 @@ class Games(commands.Cog):
                         multiplier = game.cash_out()
                         
                         # Process win
-                        success, net_change = self.economy.process_bet(
-                            str(ctx.author.id),
+                        success, net_change, user = await self.economy.settle_hold(
+                            hold,
                             ctx.author.name,
-                            bet_amount,
-                            'mines',
                             True,
                             multiplier
                         )
                         
+                        if not success:
+                            await ctx.send(MSG.erro_processar())
+                            break
+                        
                         embed = discord.Embed(
                             title=f'💣 Mines - {ctx.author.display_name}',
                             description=f'✅ You cashed out safely!',
@@ -895,7 +349,6 @@ class Games(commands.Cog):
                         )
                         embed.add_field(name='Tiles Revelados', value=f'{len(game.revealed)}/{game.safe_tiles}', inline=True)
                         
-                        user = self.db.get_user(str(ctx.author.id), ctx.author.name)
                         embed.set_footer(text=f'Current balance: {user["coins"]:,} 🪙')
                         
                         await ctx.send(embed=embed)
@@ -920,15 +373,17 @@ class Games(commands.Cog):
                             
                             if not is_safe:
                                 # Hit a mine!
-                                success, net_change = self.economy.process_bet(
-                                    str(ctx.author.id),
+                                success, net_change, user = await self.economy.settle_hold(
+                                    hold,
                                     ctx.author.name,
-                                    bet_amount,
-                                    'mines',
                                     False,
                                     0
                                 )
                                 
+                                if not success:
+                                    await ctx.send(MSG.erro_processar())
+                                    break
+                                
                                 embed = discord.Embed(
                                     title=f'💣 Mines - {ctx.author.display_name}',
                                     description='💥 You hit a mine!',
@@ -943,7 +398,6 @@ class Games(commands.Cog):
                                     inline=False
                                 )
                                 
-                                user = self.db.get_user(str(ctx.author.id), ctx.author.name)
                                 embed.set_footer(text=f'Current balance: {user["coins"]:,} 🪙')
                                 
                                 await ctx.send(embed=embed)
@@ -975,15 +429,17 @@ class Games(commands.Cog):
                                     # Perfect clear!
                                     multiplier = game.cash_out()
                                     
-                                    success, net_change = self.economy.process_bet(
-                                        str(ctx.author.id),
+                                    success, net_change, user = await self.economy.settle_hold(
+                                        hold,
                                         ctx.author.name,
-                                        bet_amount,
-                                        'mines',
                                         True,
                                         multiplier
                                     )
                                     
+                                    if not success:
+                                        await ctx.send(MSG.erro_processar())
+                                        break
+                                    
                                     embed = discord.Embed(
                                         title=f'💣 Mines - {ctx.author.display_name}',
                                         description='🏆 You revealed all safe tiles!',
@@ -998,7 +454,6 @@ class Games(commands.Cog):
                                         inline=False
                                     )
                                     
-                                    user = self.db.get_user(str(ctx.author.id), ctx.author.name)
                                     embed.set_footer(text=f'Current balance: {user["coins"]:,} 🪙')
                                     
                                     await ctx.send(embed=embed)
@@ -1016,11 +471,9 @@ class Games(commands.Cog):
                     if len(game.revealed) > 0 and not game.hit_mine:
                         multiplier = game.cash_out()
                         
-                        success, net_change = self.economy.process_bet(
-                            str(ctx.author.id),
+                        success, net_change, user = await self.economy.settle_hold(
+                            hold,
                             ctx.author.name,
-                            bet_amount,
-                            'mines',
                             True,
                             multiplier
                         )
@@ -1035,13 +488,10 @@ class Games(commands.Cog):
                     break
             
             # Check achievements
-            new_achievements = self.achievements.check_achievements(str(ctx.author.id), ctx.author.name)
+            new_achievements = await self.achievements.check_achievements(ctx.author.id, ctx.author.name, user)
             if new_achievements:
                 achievement_text = '\n'.join([f'{a.emoji} **{a.title}** (+{a.reward} 🪙)' for a in new_achievements])
                 await ctx.send(f'🏆 **Conquistas Desbloqueadas!**\n{achievement_text}')
-        
-        finally:
-            end_game(ctx.author.id)
     
     @commands.command(name='coinflip', aliases=['moeda', 'cara', 'coroa', 'flip'])
     async def coinflip(self, ctx, bet_amount: int, choice: str):
@@ -1050,90 +500,7 @@ class Games(commands.Cog):
         Uso: /coinflip <valor> <escolha>
         Escolhas: cara, coroa, heads, tails
         """
-        if not await ensure_not_playing(ctx):
-            return
-        
-        if bet_amount < 10:
-            await ctx.send(MSG.aposta_minima())
-            return
-        
-        if not CoinFlipGame.validate_choice(choice):
-            await ctx.send(MSG.escolha_invalida() + ' Use: cara, coroa, heads ou tails')
-            return
-        
-        if not await self.check_balance(ctx, bet_amount):
-            return
-        
-        start_game(ctx.author.id, 'coinflip')
-        
-        try:
-            # Show flipping animation
-            embed = discord.Embed(
-                title='🪙 Cara ou Coroa',
-                description='Flipping the coin...',
-                color=discord.Color.blue()
-            )
-            msg = await ctx.send(embed=embed)
-            
-            for frame in CoinFlipGame.get_animation_frames():
-                await asyncio.sleep(0.4)
-                embed.description = f'{frame} Girando...'
-                await msg.edit(embed=embed)
-            
-            # Flip coin
-            result = CoinFlipGame.flip()
-            won, multiplier = CoinFlipGame.check_win(result, choice)
-            
-            # Process bet
-            success, net_change = self.economy.process_bet(
-                str(ctx.author.id),
-                ctx.author.name,
-                bet_amount,
-                'coinflip',
-                won,
-                multiplier
-            )
-            
-            if not success:
-                await ctx.send(MSG.erro_processar())
-                return
-            
-            # Show result
-            embed = discord.Embed(
-                title=f'🪙 Cara ou Coroa - {ctx.author.display_name}',
-                color=discord.Color.green() if won else discord.Color.red()
-            )
-            
-            embed.add_field(name='Result', value=CoinFlipGame.format_result(result), inline=False)
-            embed.add_field(name='Sua Escolha', value=choice.title(), inline=True)
-            embed.add_field(name='Bet', value=f'{bet_amount:,} 🪙', inline=True)
-            
-            if won:
-                embed.add_field(
-                    name='🎉 WON!',
-                    value=f'+{net_change:,} 🪙 ({multiplier}x)',
-                    inline=False
-                )
-            else:
-                embed.add_field(
-                    name='❌ Lost',
-                    value=f'{net_change:,} 🪙',
-                    inline=False
-                )
-            
-            user = self.db.get_user(str(ctx.author.id), ctx.author.name)
-            embed.set_footer(text=f'Current balance: {user["coins"]:,} 🪙')
-            
-            await msg.edit(embed=embed)
-            
-            # Check achievements
-            new_achievements = self.achievements.check_achievements(str(ctx.author.id), ctx.author.name)
-            if new_achievements:
-                achievement_text = '\n'.join([f'{a.emoji} **{a.title}** (+{a.reward} 🪙)' for a in new_achievements])
-                await ctx.send(f'🏆 **Conquistas Desbloqueadas!**\n{achievement_text}')
-        
-        finally:
-            end_game(ctx.author.id)
+        await self.engine.run(ctx, 'coinflip', bet_amount, choice)
     
     @commands.command(name='wheel', aliases=['roda', 'fortune'])
     async def wheel(self, ctx, bet_amount: int):
@@ -1141,289 +508,58 @@ class Games(commands.Cog):
         Joga Roda da Fortuna
         Uso: /wheel <valor>
         """
-        if not await ensure_not_playing(ctx):
-            return
-        
-        if bet_amount < 10:
-            await ctx.send(MSG.aposta_minima())
-            return
-        
-        if not await self.check_balance(ctx, bet_amount):
-            return
-        
-        start_game(ctx.author.id, 'wheel')
-        
-        try:
-            # Show spinning animation
-            embed = discord.Embed(
-                title='🎡 Roda da Fortuna',
-                description=MSG.girando(),
-                color=discord.Color.purple()
-            )
-            msg = await ctx.send(embed=embed)
-            
-            for _ in range(3):
-                await asyncio.sleep(0.6)
-            
-            # Spin wheel
-            segment = WheelGame.spin()
-            won, multiplier, description = WheelGame.calculate_win(segment)
-            
-            # Process bet
-            success, net_change = self.economy.process_bet(
-                str(ctx.author.id),
-                ctx.author.name,
-                bet_amount,
-                'wheel',
-                won,
-                multiplier
-            )
-            
-            if not success:
-                await ctx.send(MSG.erro_processar())
-                return
-            
-            # Show result
-            embed = discord.Embed(
-                title=f'🎡 Roda da Fortuna - {ctx.author.display_name}',
-                color=discord.Color.green() if won else discord.Color.red()
-            )
-            
-            embed.add_field(name='Result', value=WheelGame.format_result(segment), inline=False)
-            embed.add_field(name='Bet', value=f'{bet_amount:,} 🪙', inline=True)
-            
-            if won:
-                embed.add_field(
-                    name='🎉 Prêmio!',
-                    value=f'+{net_change:,} 🪙 ({multiplier}x)',
-                    inline=False
-                )
-            else:
-                embed.add_field(
-                    name='❌ Sem prêmio',
-                    value=f'{net_change:,} 🪙',
-                    inline=False
-                )
-            
-            user = self.db.get_user(str(ctx.author.id), ctx.author.name)
-            embed.set_footer(text=f'Current balance: {user["coins"]:,} 🪙')
-            
-            await msg.edit(embed=embed)
-            
-            # Check achievements
-            new_achievements = self.achievements.check_achievements(str(ctx.author.id), ctx.author.name)
-            if new_achievements:
-                achievement_text = '\n'.join([f'{a.emoji} **{a.title}** (+{a.reward} 🪙)' for a in new_achievements])
-                await ctx.send(f'🏆 **Conquistas Desbloqueadas!**\n{achievement_text}')
-        
-        finally:
-            end_game(ctx.author.id)
+        await self.engine.run(ctx, 'wheel', bet_amount)
     
 
     @commands.command(name='plinko', aliases=['pl'])
     async def plinko(self, ctx, bet_amount: int, risk: str = 'medio'):
         """Plinko - bola cai por pinos. Uso: /plinko <valor> [risco]"""
-        if not await ensure_not_playing(ctx) or bet_amount < 10 or not PlinkoGame.validate_risk(risk) or not await self.check_balance(ctx, bet_amount):
-            if bet_amount < 10: await ctx.send(MSG.aposta_minima())
-            elif not PlinkoGame.validate_risk(risk): await ctx.send(MSG.escolha_invalida() + ' Use: baixo, medio ou alto')
-            return
-        start_game(ctx.author.id, 'plinko')
-        try:
-            embed = discord.Embed(title='🎯 Plinko', description=f'{PlinkoGame.get_risk_description(risk)}\n\nSoltando a bola...', color=discord.Color.blue())
-            msg = await ctx.send(embed=embed)
-            await asyncio.sleep(1.5)
-            slot = PlinkoGame.drop_ball()
-            won, multiplier = PlinkoGame.calculate_win(slot, risk)
-            success, net_change = self.economy.process_bet(str(ctx.author.id), ctx.author.name, bet_amount, 'plinko', won, multiplier)
-            if not success: await ctx.send(MSG.erro_processar()); return
-            embed = discord.Embed(title=f'🎯 Plinko - {ctx.author.display_name}', description=PlinkoGame.format_board(slot, risk), color=discord.Color.green() if won else discord.Color.red())
-            embed.add_field(name='Bet', value=f'{bet_amount:,} 🪙', inline=True)
-            embed.add_field(name='Slot', value=f'**{slot}** ({multiplier}x)', inline=True)
-            embed.add_field(name='🎉 WON!' if won else '❌ Lost', value=f'{net_change:+,} 🪙', inline=False)
-            user = self.db.get_user(str(ctx.author.id), ctx.author.name)
-            embed.set_footer(text=f'Current balance: {user["coins"]:,} 🪙')
-            await msg.edit(embed=embed)
-            new_achievements = self.achievements.check_achievements(str(ctx.author.id), ctx.author.name)
-            if new_achievements:
-                await ctx.send(f'🏆 **Conquistas Desbloqueadas!**\n' + '\n'.join([f'{a.emoji} **{a.title}** (+{a.reward} 🪙)' for a in new_achievements]))
-        finally:
-            end_game(ctx.author.id)
+        await self.engine.run(ctx, 'plinko', bet_amount, risk)
 
     @commands.command(name='limbo', aliases=['lb'])
     async def limbo(self, ctx, bet_amount: int, target: float):
         """Limbo - resultado precisa passar o alvo. Uso: /limbo <valor> <multiplicador>"""
-        if not await ensure_not_playing(ctx) or bet_amount < 10 or not LimboGame.validate_target(target) or not await self.check_balance(ctx, bet_amount):
-            if bet_amount < 10: await ctx.send(MSG.aposta_minima())
-            elif not LimboGame.validate_target(target): await ctx.send(f'❌ Multiplicador entre {LimboGame.MIN_TARGET}x e {LimboGame.MAX_TARGET}x!')
-            return
-        start_game(ctx.author.id, 'limbo')
-        try:
-            win_chance = LimboGame.calculate_win_chance(target)
-            embed = discord.Embed(title='🎲 Limbo', description=f'{LimboGame.get_risk_level(target)}\nAlvo: **{target}x**\nChance: ~{win_chance:.1f}%\n\nGerando...', color=discord.Color.blue())
-            msg = await ctx.send(embed=embed)
-            await asyncio.sleep(1.2)
-            result = LimboGame.generate_result()
-            won, multiplier = LimboGame.check_win(result, target)
-            success, net_change = self.economy.process_bet(str(ctx.author.id), ctx.author.name, bet_amount, 'limbo', won, multiplier)
-            if not success: await ctx.send(MSG.erro_processar()); return
-            embed = discord.Embed(title=f'🎲 Limbo - {ctx.author.display_name}', description=LimboGame.format_result(result, target, won), color=discord.Color.green() if won else discord.Color.red())
-            embed.add_field(name='Bet', value=f'{bet_amount:,} 🪙', inline=True)
-            embed.add_field(name='Alvo', value=f'{target}x', inline=True)
-            embed.add_field(name='🎉 WON!' if won else '❌ Lost', value=f'{net_change:+,} 🪙' + (f' ({multiplier}x)' if won else ''), inline=False)
-            user = self.db.get_user(str(ctx.author.id), ctx.author.name)
-            embed.set_footer(text=f'Current balance: {user["coins"]:,} 🪙')
-            await msg.edit(embed=embed)
-            new_achievements = self.achievements.check_achievements(str(ctx.author.id), ctx.author.name)
-            if new_achievements:
-                await ctx.send(f'🏆 **Conquistas Desbloqueadas!**\n' + '\n'.join([f'{a.emoji} **{a.title}** (+{a.reward} 🪙)' for a in new_achievements]))
-        finally:
-            end_game(ctx.author.id)
+        await self.engine.run(ctx, 'limbo', bet_amount, target)
 
     @commands.command(name='scratch', aliases=['raspadinha', 'sc'])
     async def scratch(self, ctx, bet_amount: int):
         """Raspadinha - cartão instantâneo. Uso: /scratch <valor>"""
-        if not await ensure_not_playing(ctx) or bet_amount < 10 or not await self.check_balance(ctx, bet_amount):
-            if bet_amount < 10: await ctx.send(MSG.aposta_minima())
-            return
-        start_game(ctx.author.id, 'scratch')
-        try:
-            embed = discord.Embed(title='🎫 Raspadinha', description='Raspando...', color=discord.Color.gold())
-            embed.add_field(name='Cartão', value=ScratchCardGame.format_card_hidden(), inline=False)
-            msg = await ctx.send(embed=embed)
-            await asyncio.sleep(1.5)
-            card = ScratchCardGame.generate_card()
-            won, multiplier, best_prize = ScratchCardGame.calculate_best_prize(card)
-            success, net_change = self.economy.process_bet(str(ctx.author.id), ctx.author.name, bet_amount, 'scratch', won, multiplier)
-            if not success: await ctx.send(MSG.erro_processar()); return
-            best_index = card.index(best_prize)
-            embed = discord.Embed(title=f'🎫 Raspadinha - {ctx.author.display_name}', color=discord.Color.green() if won else discord.Color.red())
-            embed.add_field(name='Cartão', value=ScratchCardGame.format_card_revealed(card, best_index), inline=False)
-            embed.add_field(name='Prêmio', value=f'{best_prize["emoji"]} {best_prize["label"]}', inline=True)
-            embed.add_field(name='Bet', value=f'{bet_amount:,} 🪙', inline=True)
-            embed.add_field(name='🎉 WON!' if won else '❌ Lost', value=f'{net_change:+,} 🪙' + (f' ({multiplier}x)' if won else ''), inline=False)
-            user = self.db.get_user(str(ctx.author.id), ctx.author.name)
-            embed.set_footer(text=f'Current balance: {user["coins"]:,} 🪙')
-            await msg.edit(embed=embed)
-            new_achievements = self.achievements.check_achievements(str(ctx.author.id), ctx.author.name)
-            if new_achievements:
-                await ctx.send(f'🏆 **Conquistas Desbloqueadas!**\n' + '\n'.join([f'{a.emoji} **{a.title}** (+{a.reward} 🪙)' for a in new_achievements]))
-        finally:
-            end_game(ctx.author.id)
+        await self.engine.run(ctx, 'scratch', bet_amount)
 
     @commands.command(name='keno', aliases=['kn'])
     async def keno(self, ctx, bet_amount: int, *numbers: int):
         """Keno - loteria. Uso: /keno <valor> <num1> <num2> ... (1-10 números entre 1-40)"""
-        if not await ensure_not_playing(ctx) or bet_amount < 10:
-            if bet_amount < 10: await ctx.send(MSG.aposta_minima())
-            return
-        numbers_list = list(numbers)
-        if not KenoGame.validate_numbers(numbers_list, len(numbers_list)):
-            await ctx.send(f'❌ Escolha de {KenoGame.MIN_NUMBERS} a {KenoGame.MAX_NUMBERS} números únicos entre 1 e {KenoGame.NUMBER_RANGE}!'); return
-        if not await self.check_balance(ctx, bet_amount): return
-        start_game(ctx.author.id, 'keno')
-        try:
-            embed = discord.Embed(title='🎱 Keno', description=f'Seus números: {KenoGame.format_numbers(numbers_list)}\n\nSorteando...', color=discord.Color.blue())
-            msg = await ctx.send(embed=embed)
-            await asyncio.sleep(1.5)
-            drawn = KenoGame.draw_numbers()
-            matches = KenoGame.check_matches(numbers_list, drawn)
-            won, multiplier = KenoGame.calculate_win(len(numbers_list), matches)
-            success, net_change = self.economy.process_bet(str(ctx.author.id), ctx.author.name, bet_amount, 'keno', won, multiplier)
-            if not success: await ctx.send(MSG.erro_processar()); return
-            embed = discord.Embed(title=f'🎱 Keno - {ctx.author.display_name}', color=discord.Color.green() if won else discord.Color.red())
-            embed.add_field(name='Seus Números', value=KenoGame.format_numbers(numbers_list, drawn), inline=False)
-            embed.add_field(name='Sorteados', value=KenoGame.format_numbers(drawn), inline=False)
-            embed.add_field(name='Acertos', value=f'**{matches}/{len(numbers_list)}**', inline=True)
-            embed.add_field(name='Bet', value=f'{bet_amount:,} 🪙', inline=True)
-            embed.add_field(name='🎉 WON!' if won else '❌ Lost', value=f'{net_change:+,} 🪙' + (f' ({multiplier}x)' if won else ''), inline=False)
-            user = self.db.get_user(str(ctx.author.id), ctx.author.name)
-            embed.set_footer(text=f'Current balance: {user["coins"]:,} 🪙')
-            await msg.edit(embed=embed)
-            new_achievements = self.achievements.check_achievements(str(ctx.author.id), ctx.author.name)
-            if new_achievements:
-                await ctx.send(f'🏆 **Conquistas Desbloqueadas!**\n' + '\n'.join([f'{a.emoji} **{a.title}** (+{a.reward} 🪙)' for a in new_achievements]))
-        finally:
-            end_game(ctx.author.id)
+        await self.engine.run(ctx, 'keno', bet_amount, *numbers)
 
 
 
     @commands.command(name='baccarat', aliases=['bac'])
     async def baccarat(self, ctx, bet_amount: int, bet_type: str):
         """Baccarat - jogue contra a banca. Uso: /baccarat <valor> <jogador|banca|empate>"""
-        if not await ensure_not_playing(ctx) or bet_amount < 10 or not BaccaratGame.validate_bet(bet_type) or not await self.check_balance(ctx, bet_amount):
-            if bet_amount < 10: await ctx.send(MSG.aposta_minima())
-            elif not BaccaratGame.validate_bet(bet_type): await ctx.send('❌ Aposta inválida! Use: jogador, banca ou empate')
-            return
-        start_game(ctx.author.id, 'baccarat')
-        try:
-            embed = discord.Embed(title='🎴 Baccarat', description='Distribuindo cartas...', color=discord.Color.blue())
-            msg = await ctx.send(embed=embed)
-            await asyncio.sleep(1.2)
-            winner, player_hand, banker_hand, player_value, banker_value = BaccaratGame.play_game()
-            won, multiplier = BaccaratGame.calculate_win(winner, bet_type)
-            success, net_change = self.economy.process_bet(str(ctx.author.id), ctx.author.name, bet_amount, 'baccarat', won, multiplier)
-            if not success: await ctx.send(MSG.erro_processar()); return
-            embed = discord.Embed(title=f'🎴 Baccarat - {ctx.author.display_name}', color=discord.Color.green() if won else discord.Color.red())
-            embed.add_field(name='Jogador', value=BaccaratGame.format_hand(player_hand, player_value), inline=False)
-            embed.add_field(name='Banca', value=BaccaratGame.format_hand(banker_hand, banker_value), inline=False)
-            embed.add_field(name='Vencedor', value=winner.title(), inline=True)
-            embed.add_field(name='Your Bet', value=bet_type.title(), inline=True)
-            embed.add_field(name='🎉 WON!' if won else '❌ Lost', value=f'{net_change:+,} 🪙' + (f' ({multiplier}x)' if won else ''), inline=False)
-            user = self.db.get_user(str(ctx.author.id), ctx.author.name)
-            embed.set_footer(text=f'Current balance: {user["coins"]:,} 🪙')
-            await msg.edit(embed=embed)
-            new_achievements = self.achievements.check_achievements(str(ctx.author.id), ctx.author.name)
-            if new_achievements:
-                await ctx.send(f'🏆 **Conquistas Desbloqueadas!**\n' + '\n'.join([f'{a.emoji} **{a.title}** (+{a.reward} 🪙)' for a in new_achievements]))
-        finally:
-            end_game(ctx.author.id)
+        await self.engine.run(ctx, 'baccarat', bet_amount, bet_type)
 
     @commands.command(name='hilo', aliases=['highlow', 'hl'])
     async def hilo(self, ctx, bet_amount: int, guess: str):
         """Hi-Lo - próxima carta maior ou menor. Uso: /hilo <valor> <alto|baixo|igual>"""
-        if not await ensure_not_playing(ctx) or bet_amount < 10 or not HiLoGame.validate_guess(guess) or not await self.check_balance(ctx, bet_amount):
-            if bet_amount < 10: await ctx.send(MSG.aposta_minima())
-            elif not HiLoGame.validate_guess(guess): await ctx.send('❌ Escolha inválida! Use: alto, baixo ou igual')
-            return
-        start_game(ctx.author.id, 'hilo')
-        try:
-            current = HiLoGame.draw_card()
-            embed = discord.Embed(title='🎴 Hi-Lo', description=f'Carta atual: {HiLoGame.format_card(current)}\n\n{HiLoGame.get_odds(current)}\n\nSua escolha: **{guess.title()}**\n\nRevelando próxima carta...', color=discord.Color.blue())
-            msg = await ctx.send(embed=embed)
-            await asyncio.sleep(1.5)
-            next_card = HiLoGame.draw_card()
-            won, multiplier = HiLoGame.compare_cards(current, next_card, guess)
-            success, net_change = self.economy.process_bet(str(ctx.author.id), ctx.author.name, bet_amount, 'hilo', won, multiplier)
-            if not success: await ctx.send(MSG.erro_processar()); return
-            embed = discord.Embed(title=f'🎴 Hi-Lo - {ctx.author.display_name}', color=discord.Color.green() if won else discord.Color.red())
-            embed.add_field(name='Carta Anterior', value=HiLoGame.format_card(current), inline=True)
-            embed.add_field(name='Nova Carta', value=HiLoGame.format_card(next_card), inline=True)
-            embed.add_field(name='Sua Escolha', value=guess.title(), inline=True)
-            embed.add_field(name='🎉 WON!' if won else '❌ Lost', value=f'{net_change:+,} 🪙' + (f' ({multiplier}x)' if won else ''), inline=False)
-            user = self.db.get_user(str(ctx.author.id), ctx.author.name)
-            embed.set_footer(text=f'Current balance: {user["coins"]:,} 🪙')
-            await msg.edit(embed=embed)
-            new_achievements = self.achievements.check_achievements(str(ctx.author.id), ctx.author.name)
-            if new_achievements:
-                await ctx.send(f'🏆 **Conquistas Desbloqueadas!**\n' + '\n'.join([f'{a.emoji} **{a.title}** (+{a.reward} 🪙)' for a in new_achievements]))
-        finally:
-            end_game(ctx.author.id)
+        await self.engine.run(ctx, 'hilo', bet_amount, guess)
 
     @commands.command(name='tower', aliases=['torre', 'tw'])
     async def tower(self, ctx, bet_amount: int, difficulty: str = 'medio'):
         """Tower - suba a torre interativo. Uso: /tower <valor> [dificuldade]"""
-        if not await ensure_not_playing(ctx) or bet_amount < 10 or not TowerGame.validate_difficulty(difficulty) or not await self.check_balance(ctx, bet_amount):
+        if not await ensure_not_playing(ctx) or bet_amount < 10 or not TowerGame.validate_difficulty(difficulty):
             if bet_amount < 10: await ctx.send(MSG.aposta_minima())
             elif not TowerGame.validate_difficulty(difficulty): await ctx.send('❌ Dificuldade inválida! Use: facil, medio, dificil, extremo')
             return
-        start_game(ctx.author.id, 'tower')
-        try:
+        async with self.staked(ctx, 'tower', bet_amount) as hold:
+            if hold is None:
+                return
             game = TowerGame(difficulty)
             embed = discord.Embed(title='🗼 Tower', description=f'{TowerGame.get_difficulty_info(difficulty)}\n\nEscolha um tile (0-{game.tiles_per_level-1}) ou digite `sair` para sacar', color=discord.Color.blue())
             embed.add_field(name='Torre', value=f'```\n{game.format_tower()}\n```', inline=False)
             embed.add_field(name='Multiplicador', value=f'{game.get_multiplier():.2f}x', inline=True)
             await ctx.send(embed=embed)
             
+            user = None
             while not game.game_over:
                 def check(m): return m.author == ctx.author and m.channel == ctx.channel
                 try:
@@ -1431,11 +567,11 @@ class Games(commands.Cog):
                     content = response.content.lower().strip()
                     if content in ['sair', 'cashout']:
                         multiplier = game.cash_out()
-                        success, net_change = self.economy.process_bet(str(ctx.author.id), ctx.author.name, bet_amount, 'tower', True, multiplier)
+                        success, net_change, user = await self.economy.settle_hold(hold, ctx.author.name, True, multiplier)
+                        if not success: await ctx.send(MSG.erro_processar()); break
                         embed = discord.Embed(title=f'🗼 Tower - {ctx.author.display_name}', description='✅ Cash out!', color=discord.Color.green())
                         embed.add_field(name='Torre', value=f'```\n{game.format_tower(True)}\n```', inline=False)
                         embed.add_field(name='🎉 WON!', value=f'+{net_change:,} 🪙 ({multiplier:.2f}x)', inline=False)
-                        user = self.db.get_user(str(ctx.author.id), ctx.author.name)
                         embed.set_footer(text=f'Current balance: {user["coins"]:,} 🪙')
                         await ctx.send(embed=embed)
                         break
@@ -1443,21 +579,21 @@ class Games(commands.Cog):
                         tile_index = int(content)
                         is_safe, current_mult = game.choose_tile(tile_index)
                         if not is_safe:
-                            success, net_change = self.economy.process_bet(str(ctx.author.id), ctx.author.name, bet_amount, 'tower', False, 0)
+                            success, net_change, user = await self.economy.settle_hold(hold, ctx.author.name, False, 0)
+                            if not success: await ctx.send(MSG.erro_processar()); break
                             embed = discord.Embed(title=f'🗼 Tower - {ctx.author.display_name}', description='💥 Tile errado!', color=discord.Color.red())
                             embed.add_field(name='Torre', value=f'```\n{game.format_tower(True)}\n```', inline=False)
                             embed.add_field(name='❌ Lost', value=f'{net_change:,} 🪙', inline=False)
-                            user = self.db.get_user(str(ctx.author.id), ctx.author.name)
                             embed.set_footer(text=f'Current balance: {user["coins"]:,} 🪙')
                             await ctx.send(embed=embed)
                             break
                         else:
                             if game.won:
-                                success, net_change = self.economy.process_bet(str(ctx.author.id), ctx.author.name, bet_amount, 'tower', True, current_mult)
+                                success, net_change, user = await self.economy.settle_hold(hold, ctx.author.name, True, current_mult)
+                                if not success: await ctx.send(MSG.erro_processar()); break
                                 embed = discord.Embed(title=f'🗼 Tower - {ctx.author.display_name}', description='🏆 Topo alcançado!', color=discord.Color.gold())
                                 embed.add_field(name='Torre', value=f'```\n{game.format_tower(True)}\n```', inline=False)
                                 embed.add_field(name='🏆 VITÓRIA!', value=f'+{net_change:,} 🪙 ({current_mult:.2f}x)', inline=False)
-                                user = self.db.get_user(str(ctx.author.id), ctx.author.name)
                                 embed.set_footer(text=f'Current balance: {user["coins"]:,} 🪙')
                                 await ctx.send(embed=embed)
                                 break
@@ -1471,26 +607,25 @@ class Games(commands.Cog):
                 except asyncio.TimeoutError:
                     if game.current_level > 0:
                         multiplier = game.cash_out()
-                        success, net_change = self.economy.process_bet(str(ctx.author.id), ctx.author.name, bet_amount, 'tower', True, multiplier)
+                        success, net_change, user = await self.economy.settle_hold(hold, ctx.author.name, True, multiplier)
                         await ctx.send(f'⏰ Tempo esgotado! Cash out automático: +{net_change:,} 🪙')
                     else:
                         await ctx.send('⏰ Tempo esgotado!')
                     break
             
-            new_achievements = self.achievements.check_achievements(str(ctx.author.id), ctx.author.name)
+            new_achievements = await self.achievements.check_achievements(ctx.author.id, ctx.author.name, user)
             if new_achievements:
                 await ctx.send(f'🏆 **Conquistas Desbloqueadas!**\n' + '\n'.join([f'{a.emoji} **{a.title}** (+{a.reward} 🪙)' for a in new_achievements]))
-        finally:
-            end_game(ctx.author.id)
 
     @commands.command(name='videopoker', aliases=['poker', 'vp'])
     async def videopoker(self, ctx, bet_amount: int):
         """Video Poker - Jacks or Better. Uso: /videopoker <valor>"""
-        if not await ensure_not_playing(ctx) or bet_amount < 10 or not await self.check_balance(ctx, bet_amount):
+        if not await ensure_not_playing(ctx) or bet_amount < 10:
             if bet_amount < 10: await ctx.send(MSG.aposta_minima())
             return
-        start_game(ctx.author.id, 'videopoker')
-        try:
+        async with self.staked(ctx, 'videopoker', bet_amount) as hold:
+            if hold is None:
+                return
             game = VideoPokerGame()
             hand = game.deal()
             embed = discord.Embed(title='🎰 Video Poker', description='Digite os números das cartas para segurar (0-4) separados por espaço.\nExemplo: `0 2 4` ou `todas` ou `nenhuma`', color=discord.Color.blue())
@@ -1516,7 +651,7 @@ class Games(commands.Cog):
                 final_hand = game.draw()
                 hand_name, multiplier = game.evaluate_hand()
                 won = multiplier > 0
-                success, net_change = self.economy.process_bet(str(ctx.author.id), ctx.author.name, bet_amount, 'videopoker', won, multiplier)
+                success, net_change, user = await self.economy.settle_hold(hold, ctx.author.name, won, multiplier)
                 if not success: await ctx.send(MSG.erro_processar()); return
                 
                 embed = discord.Embed(title=f'🎰 Video Poker - {ctx.author.display_name}', color=discord.Color.green() if won else discord.Color.red())
@@ -1524,17 +659,14 @@ class Games(commands.Cog):
                 embed.add_field(name='Result', value=hand_name, inline=True)
                 embed.add_field(name='Bet', value=f'{bet_amount:,} 🪙', inline=True)
                 embed.add_field(name='🎉 WON!' if won else '❌ Lost', value=f'{net_change:+,} 🪙' + (f' ({multiplier}x)' if won else ''), inline=False)
-                user = self.db.get_user(str(ctx.author.id), ctx.author.name)
                 embed.set_footer(text=f'Current balance: {user["coins"]:,} 🪙')
                 await ctx.send(embed=embed)
                 
-                new_achievements = self.achievements.check_achievements(str(ctx.author.id), ctx.author.name)
+                new_achievements = await self.achievements.check_achievements(ctx.author.id, ctx.author.name, user)
                 if new_achievements:
                     await ctx.send(f'🏆 **Conquistas Desbloqueadas!**\n' + '\n'.join([f'{a.emoji} **{a.title}** (+{a.reward} 🪙)' for a in new_achievements]))
             except asyncio.TimeoutError:
                 await ctx.send('⏰ Tempo esgotado!')
-        finally:
-            end_game(ctx.author.id)
 
 
     @commands.command(name='jogos', aliases=['games', 'listgames'])
@@ -1656,8 +788,117 @@ class Games(commands.Cog):
             inline=True
         )
         
-        embed.set_footer(text='Minimum bet: 10 🪙 | Use /balance to check your coins')
+        embed.set_footer(text='Minimum bet: 10 🪙 | Use /balance to check your coins | /odds <jogo> for the odds')
+        
+        await ctx.send(embed=embed)
+    
+    @commands.command(name='odds', aliases=['chances', 'probabilidades'])
+    async def odds_command(self, ctx, game: str = None):
+        """
+        Mostra as chances exatas e o retorno esperado de um jogo
+        Uso: /odds <jogo>
+        """
+        available = ', '.join(f'`{name}`' for name in self.odds)
+        if game is None:
+            await ctx.send(f'🎲 Uso: `{PREFIX}odds <jogo>`\nJogos: {available}')
+            return
+        
+        # Command aliases resolve too (roulette -> roleta, dice -> dados, ...)
+        command = self.bot.get_command(game.lower())
+        name = command.name if command else game.lower()
+        odds = self.odds.get(name)
+        if odds is None:
+            await ctx.send(f'❌ Sem tabela de odds para esse jogo. Jogos: {available}')
+            return
+        
+        plugin = PLUGINS.get(name)
+        embed = discord.Embed(
+            title=f'📊 Odds - {plugin.title if plugin else name}',
+            description='Chances exatas e retorno esperado (RTP) por aposta',
+            color=discord.Color.blue()
+        )
+        
+        for table in odds.tables:
+            summary = f'Chance: **{format_chance(table.win_chance)}** · RTP: **{table.rtp:.2%}**'
+            if [line.label for line in table.lines] in (['Win', 'Lose'], ['Lose', 'Win']):
+                paid = max(line.multiplier for line in table.lines)
+                embed.add_field(name=table.bet, value=f'{summary}\nPaga {paid:g}x', inline=True)
+                continue
+            
+            lines = [f'{line.label}: {format_chance(line.probability)} → {line.multiplier:g}x' for line in table.lines]
+            embed.add_field(name=table.bet, value='\n'.join(lines + [summary]), inline=False)
+        
+        embed.set_footer(text='RTP abaixo de 100% = vantagem da casa')
+        await ctx.send(embed=embed)
+    
+    @commands.command(name='seed', aliases=['clientseed', 'semente'])
+    async def seed_command(self, ctx, *, client_seed: str = None):
+        """
+        Mostra ou troca sua client seed dos jogos provably fair
+        Uso: /seed [nova seed]
+        """
+        if client_seed is not None:
+            if not await self.fairness.set_client_seed(ctx.author.id, client_seed):
+                await ctx.send('❌ A client seed deve ter de 1 a 64 caracteres!')
+                return
+        
+        seed, nonce = await self.fairness.client_seed(ctx.author.id)
+        published = await self.fairness.published_hash()
+        games = ', '.join(f'`{name}`' for name, plugin in PLUGINS.items() if plugin.provably_fair)
+        
+        embed = discord.Embed(
+            title='🔐 Provably Fair',
+            description=(
+                f'Os resultados de {games} vêm de uma cadeia de hashes gerada antes das apostas.\n'
+                'Cada rodada usa o próximo server seed da cadeia: '
+                '`HMAC-SHA256(server seed, "client seed:nonce:cursor")`.\n'
+                f'Depois da rodada, `{PREFIX}verify <rodada>` revela o server seed para você conferir.'
+            ),
+            color=discord.Color.blue()
+        )
+        embed.add_field(name='Sua client seed', value=f'`{seed}`', inline=True)
+        embed.add_field(name='Próximo nonce', value=str(nonce), inline=True)
+        embed.add_field(name='Hash publicado da cadeia', value=f'`{published or "gerando..."}`', inline=False)
+        embed.set_footer(text=f'Troque a seed com {PREFIX}seed <texto>')
+        await ctx.send(embed=embed)
+    
+    @commands.command(name='verify', aliases=['verificar'])
+    async def verify_command(self, ctx, round_id: int = None):
+        """
+        Revela o server seed de uma rodada e refaz o resultado
+        Uso: /verify <rodada>
+        """
+        if round_id is None:
+            await ctx.send(f'🔐 Uso: `{PREFIX}verify <rodada>` (o número aparece no rodapé do resultado)')
+            return
+        
+        check = await self.fairness.verify(round_id)
+        if check is None:
+            await ctx.send(f'❌ Rodada #{round_id} não encontrada!')
+            return
         
+        round, replayed = check.round, check.replayed
+        ok = check.chain_ok and check.outcome_ok
+        plugin = PLUGINS[round.game]
+        embed = discord.Embed(
+            title=f'🔐 Rodada #{round_id} - {plugin.title}',
+            description=f'Jogador: <@{round.user_id}> · Aposta: `{" ".join(str(arg) for arg in round.args)}`',
+            color=discord.Color.green() if ok else discord.Color.red()
+        )
+        embed.add_field(name='Server seed', value=f'`{round.server_seed.hex()}`', inline=False)
+        embed.add_field(
+            name=f'SHA-256 do server seed {"✅" if check.chain_ok else "❌"}',
+            value=f'`{check.committed.hex()}`\n= {check.commitment}',
+            inline=False
+        )
+        embed.add_field(name='Client seed', value=f'`{round.client_seed}`', inline=True)
+        embed.add_field(name='Nonce', value=str(round.nonce), inline=True)
+        
+        details = ', '.join(f'{key}: {value}' for key, value in vars(replayed).items()
+                            if key not in ('won', 'multiplier'))
+        result = f'{"Ganhou" if replayed.won else "Perdeu"} ({replayed.multiplier}x)' + (f' · {details}' if details else '')
+        embed.add_field(name=f'Resultado refeito {"✅" if check.outcome_ok else "❌"}', value=result, inline=False)
+        embed.set_footer(text=f'Cadeia {round.chain_id}, hash publicado {check.terminal[:16]}…')
         await ctx.send(embed=embed)
 
     @commands.command(name='roubar', aliases=['rob', 'steal', 'heist'])
@@ -1688,8 +929,8 @@ class Games(commands.Cog):
                 return
         
         # Check balances
-        robber = self.db.get_user(str(ctx.author.id), ctx.author.name)
-        victim = self.db.get_user(str(target.id), target.name)
+        robber = await self.db.get_user(ctx.author.id, ctx.author.name)
+        victim = await self.db.get_user(target.id, target.name)
         
         # Verificar se o ladrão está negativado
         if robber['coins'] < 0:
@@ -1707,6 +948,13 @@ class Games(commands.Cog):
         # Debug log
         print(f"[HEIST] Victim: {target.name} | Balance: {victim['coins']:,} | Amount stolen: {steal_amount:,}")
         
+        # Escrow the loot so the victim can't spend it during the defense window
+        hold = await self.economy.hold(target.id, target.name, steal_amount, 'heist',
+                                       ttl=HeistGame.DEFENSE_TIME + 60)
+        if hold is None:
+            await ctx.send(f'❌ {target.display_name} não tem saldo livre pra ser roubado agora!')
+            return
+        
         # Gerar desafio de defesa
         challenge_type, question, correct_answer = HeistGame.generate_challenge()
         
@@ -1777,8 +1025,9 @@ class Games(commands.Cog):
                     actual_penalty = penalty  # Cobra a multa completa mesmo que não tenha
                 
                 # Transferir penalidade do ladrão para a vítima (pode deixar negativo)
-                self.economy.remove_coins(str(ctx.author.id), actual_penalty, 'Penalidade de roubo falho')
-                self.economy.add_coins(str(target.id), actual_penalty, 'Defesa de roubo')
+                await self.economy.release_hold(hold)
+                await self.economy.remove_coins(ctx.author.id, actual_penalty, 'Penalidade de roubo falho')
+                await self.economy.add_coins(target.id, actual_penalty, 'Defesa de roubo')
                 
                 defense_msg = random.choice(HeistGame.get_defense_messages())
                 
@@ -1814,8 +1063,8 @@ class Games(commands.Cog):
                 
             else:
                 # ROUBO BEM SUCEDIDO!
-                self.economy.remove_coins(str(target.id), steal_amount, f'Roubado por {ctx.author.name}')
-                self.economy.add_coins(str(ctx.author.id), steal_amount, f'Roubou de {target.name}')
+                await self.economy.transfer_hold(hold, ctx.author.id, f'Roubado por {ctx.author.name}',
+                                                 f'Roubou de {target.name}')
                 
                 success_msg = random.choice(HeistGame.get_success_messages())
                 
@@ -1845,8 +1094,8 @@ class Games(commands.Cog):
         
         except asyncio.TimeoutError:
             # TEMPO ESGOTADO - ROUBO BEM SUCEDIDO!
-            self.economy.remove_coins(str(target.id), steal_amount, f'Roubado por {ctx.author.name}')
-            self.economy.add_coins(str(ctx.author.id), steal_amount, f'Roubou de {target.name}')
+            await self.economy.transfer_hold(hold, ctx.author.id, f'Roubado por {ctx.author.name}',
+                                             f'Roubou de {target.name}')
             
             success_msg = random.choice(HeistGame.get_success_messages())
             
@@ -1885,11 +1134,11 @@ class Games(commands.Cog):
             del self.active_heists[heist_msg.id]
         
         # Verificar conquistas
-        new_achievements = self.achievements.check_achievements(str(ctx.author.id), ctx.author.name)
+        new_achievements = await self.achievements.check_achievements(ctx.author.id, ctx.author.name)
         if new_achievements:
             await ctx.send(f'🏆 **Conquistas Desbloqueadas!**\n' + '\n'.join([f'{a.emoji} **{a.title}** (+{a.reward} 🪙)' for a in new_achievements]))
 
 
 async def setup(bot):
     """Setup function to add the cog to the bot"""
-    await bot.add_cog(Games(bot))
+    await bot.add_cog(Games(bot, bot.services))
@@ -37,7 +37,8 @@ class General(commands.Cog):
                 f'`{PREFIX}balance` - Check your balance\n'
                 f'`{PREFIX}daily` - Claim daily reward\n'
                 f'`{PREFIX}transfer <@user> <amount>` - Send coins\n'
-                f'`{PREFIX}ranking` - Top 10 richest\n'
+                f'`{PREFIX}ranking [coins|won|wins|streak]` - Top 10\n'
+                f'`{PREFIX}rank [@user]` - Your position\n'
                 f'`{PREFIX}achievements` - Your achievements'
             ),
             inline=False
@@ -81,7 +82,8 @@ class General(commands.Cog):
         embed.add_field(
             name='📊 Info',
             value=(
-                f'`{PREFIX}history` - Transaction history\n'
+                f'`{PREFIX}history [type|game]` - Transaction history\n'
+                f'`{PREFIX}gamehistory [game]` - Game history\n'
                 f'`{PREFIX}help` - This menu'
             ),
             inline=False
@@ -10,6 +10,9 @@ load_dotenv()
 TOKEN = os.getenv('DISCORD_TOKEN')
 PREFIX = os.getenv('PREFIX', '/')
 
+# Record game leases in the database so several bot processes can share it
+SHARED_LEASES = os.getenv('SHARED_LEASES', '').lower() in ('1', 'true', 'yes')
+
 COOKIES_FILE = Path(__file__).parent.parent / 'youtube_cookies.txt'
 USE_COOKIES = COOKIES_FILE.exists()
 
@@ -2,5 +2,6 @@
 
 from .achievements import AchievementManager
 from .checks import is_user_playing
+from .services import Services, build_services
 
-__all__ = ['AchievementManager', 'is_user_playing']
+__all__ = ['AchievementManager', 'is_user_playing', 'Services', 'build_services']
@@ -0,0 +1,204 @@
+"""Set-based achievement backfill"""
+
+import argparse
+import time
+from typing import Dict, Iterable, List, Tuple
+from src.database.db_manager import DatabaseManager
+from src.database.ledger import TYPE_ID
+from src.database.writer import Rollback
+from .achievements import Achievement, AchievementManager, STATS
+
+SQL_OPERATORS = {'>=': '>=', '>': '>', '<=': '<=', '<': '<', '==': '='}
+
+
+def achievement_sql(achievement: Achievement) -> Tuple[str, list]:
+    """
+    Translate an achievement's clauses into a WHERE predicate over users
+
+    Returns:
+        tuple: (SQL predicate, parameters)
+    """
+    parts, params = [], []
+    for stat, op, value in achievement.clauses:
+        if stat not in STATS:
+            raise ValueError(f'{achievement.name}: unknown stat {stat}')
+        # NULL stats count as 0, like the in-memory evaluation
+        column = f'COALESCE({stat}, 0)'
+        if op == 'in':
+            parts.append(f"{column} IN ({', '.join('?' * len(value))})")
+            params.extend(value)
+        else:
+            parts.append(f'{column} {SQL_OPERATORS[op]} ?')
+            params.append(value)
+    return ' AND '.join(parts), params
+
+
+class AchievementBackfill:
+    """
+    Grants achievements players already qualify for, without them playing
+
+    Every achievement becomes one INSERT ... SELECT over a chunk of users,
+    staged into a temp table. The chunk's unlocks, rewards and reward
+    transactions are then written from the staging table in one
+    transaction. Safe to run while the bot is up: unlocks are
+    INSERT OR IGNORE, so nothing can be granted or rewarded twice.
+    """
+
+    def __init__(self, db: DatabaseManager, achievements: Iterable[Achievement] = None,
+                 chunk_size: int = 5000):
+        """
+        Initialize the backfill
+
+        Args:
+            db: Database manager (chunks run on its writer)
+            achievements: What to backfill, defaults to every defined achievement
+            chunk_size: Users per transaction
+        """
+        self.db = db
+        if achievements is None:
+            achievements = AchievementManager.define_achievements().values()
+        self.achievements = list(achievements)
+        self.chunk_size = chunk_size
+        self._predicates = [(a, *achievement_sql(a)) for a in self.achievements]
+
+    def _chunks(self) -> List[Tuple[int, int]]:
+        # user_id is the rowid, so each range scans the table directly. Snowflakes
+        # are sparse, so every chunk_size-th id starts a chunk
+        conn = self.db.get_connection()
+        ids = [row[0] for row in conn.execute('SELECT user_id FROM users ORDER BY user_id')]
+        if not ids:
+            return []
+        starts = ids[::self.chunk_size]
+        return [(first, nxt - 1) for first, nxt in zip(starts, starts[1:])] + [(starts[-1], ids[-1])]
+
+    def _backfill_chunk(self, first: int, last: int, dry_run: bool) -> List[Tuple[str, int, int]]:
+        """Stage and (unless dry_run) write one chunk, runs on the writer thread"""
+        report = []
+        with self.db.transaction() as cursor:
+            # Staged rows only carry an index into the catalog, keeping them narrow
+            cursor.execute('''
+                CREATE TEMP TABLE IF NOT EXISTS achievement_catalog (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    reward INTEGER NOT NULL
+                )
+            ''')
+            cursor.execute('''
+                CREATE TEMP TABLE IF NOT EXISTS achievement_backfill (
+                    user_id INTEGER NOT NULL,
+                    achievement_id INTEGER NOT NULL
+                )
+            ''')
+            cursor.execute('DELETE FROM temp.achievement_catalog')
+            cursor.execute('DELETE FROM temp.achievement_backfill')
+            cursor.executemany(
+                'INSERT INTO temp.achievement_catalog (id, name, title, reward) VALUES (?, ?, ?, ?)',
+                [(i, a.name, a.title, a.reward) for i, (a, _, _) in enumerate(self._predicates)]
+            )
+
+            for i, (achievement, predicate, params) in enumerate(self._predicates):
+                cursor.execute(f'''
+                    INSERT INTO temp.achievement_backfill (user_id, achievement_id)
+                    SELECT user_id, ? FROM users
+                    WHERE user_id BETWEEN ? AND ? AND {predicate}
+                      AND NOT EXISTS (
+                          SELECT 1 FROM achievements
+                          WHERE achievements.user_id = users.user_id AND achievement_name = ?
+                      )
+                ''', [i, first, last, *params, achievement.name])
+
+            cursor.execute('''
+                SELECT c.name, COUNT(*), SUM(c.reward)
+                FROM temp.achievement_backfill b
+                JOIN temp.achievement_catalog c ON c.id = b.achievement_id
+                GROUP BY c.id
+            ''')
+            report = [tuple(row) for row in cursor.fetchall()]
+            if dry_run:
+                raise Rollback()
+
+            # Inserting in user_id order keeps the index updates sequential
+            cursor.execute('''
+                INSERT OR IGNORE INTO achievements (user_id, achievement_name)
+                SELECT b.user_id, c.name
+                FROM temp.achievement_backfill b
+                JOIN temp.achievement_catalog c ON c.id = b.achievement_id
+                ORDER BY b.user_id
+            ''')
+            cursor.execute('''
+                UPDATE users SET coins = coins + rewards.total
+                FROM (
+                    SELECT b.user_id, SUM(c.reward) AS total
+                    FROM temp.achievement_backfill b
+                    JOIN temp.achievement_catalog c ON c.id = b.achievement_id
+                    GROUP BY b.user_id
+                ) AS rewards
+                WHERE users.user_id = rewards.user_id AND rewards.total > 0
+                RETURNING *
+            ''')
+            for row in cursor.fetchall():
+                self.db._row_changed(row)
+            cursor.execute(f'''
+                INSERT INTO transactions (user_id, amount, type_id, detail)
+                SELECT b.user_id, c.reward, {TYPE_ID}, c.title
+                FROM temp.achievement_backfill b
+                JOIN temp.achievement_catalog c ON c.id = b.achievement_id
+                WHERE c.reward > 0
+                ORDER BY b.user_id
+            ''', ('achievement',))
+            cursor.execute('DELETE FROM temp.achievement_backfill')
+        return report
+
+    def run(self, dry_run: bool = False) -> Dict[str, Tuple[int, int]]:
+        """
+        Backfill every chunk
+
+        Returns:
+            dict: achievement name -> (users unlocked, coins rewarded)
+        """
+        totals: Dict[str, Tuple[int, int]] = {}
+        for first, last in self._chunks():
+            report = self.db.writer.call(self._backfill_chunk, first, last, dry_run)
+            for name, users, coins in report:
+                prev_users, prev_coins = totals.get(name, (0, 0))
+                totals[name] = (prev_users + users, prev_coins + coins)
+        return totals
+
+
+def main():
+    """Backfill achievements from the command line"""
+    parser = argparse.ArgumentParser(description='Grant achievements players already qualify for')
+    parser.add_argument('--db', default='data/macacolandia.db', help='Path to the SQLite database')
+    parser.add_argument('--dry-run', action='store_true', help='Report what would be granted, write nothing')
+    parser.add_argument('--chunk-size', type=int, default=5000, help='Users per transaction')
+    parser.add_argument('--only', nargs='+', metavar='NAME', help='Only these achievements')
+    args = parser.parse_args()
+
+    db = DatabaseManager(args.db)
+    try:
+        achievements = AchievementManager.define_achievements()
+        if args.only:
+            unknown = set(args.only) - achievements.keys()
+            if unknown:
+                parser.error(f'unknown achievements: {", ".join(sorted(unknown))}')
+            achievements = {name: achievements[name] for name in args.only}
+
+        start = time.perf_counter()
+        totals = AchievementBackfill(db, achievements.values(), args.chunk_size).run(args.dry_run)
+        elapsed = time.perf_counter() - start
+
+        for name in achievements:
+            if name in totals:
+                users, coins = totals[name]
+                print(f'   {name:<20} {users:>8,} users  {coins:>12,} 🪙')
+        users = sum(users for users, _ in totals.values())
+        coins = sum(coins for _, coins in totals.values())
+        verb = 'Would grant' if args.dry_run else 'Granted'
+        print(f'✅ {verb} {users:,} achievements and {coins:,} 🪙 in rewards ({elapsed:.2f}s)')
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
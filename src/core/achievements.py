@@ -1,145 +1,304 @@
 """Achievement definitions and management"""
 
-from typing import Dict, List, Callable
+import bisect
+import operator
+import sqlite3
+from typing import Dict, Iterable, List, Set, Tuple
 from src.database.db_manager import DatabaseManager
+from src.database.writer import writes
+
+# User columns achievements can be conditioned on
+STATS = ('coins', 'games_played', 'games_won', 'total_won', 'total_lost', 'streak')
+
+OPERATORS = {
+    '>=': operator.ge,
+    '>': operator.gt,
+    '<=': operator.le,
+    '<': operator.lt,
+    '==': operator.eq,
+    'in': lambda value, options: value in options,
+}
+
+# (stat, operator, value), an achievement's clauses must all hold
+Clause = Tuple[str, str, object]
 
 
 class Achievement:
     def __init__(self, name: str, title: str, description: str, 
-                 emoji: str, condition: Callable, reward: int = 0):
+                 emoji: str, clauses: List[Clause], reward: int = 0):
         self.name = name
         self.title = title
         self.description = description
         self.emoji = emoji
-        self.condition = condition
+        self.clauses = tuple(clauses)
         self.reward = reward
+    
+    def condition(self, stats: Dict[str, int]) -> bool:
+        """Whether every clause holds for these stats"""
+        return all(OPERATORS[op](stats[stat], value) for stat, op, value in self.clauses)
+
+
+class AchievementIndex:
+    """
+    Achievements indexed by the stat changes that can make them true
+    
+    A clause can only turn true when its stat moves: a threshold (>=, >)
+    when the stat rises past it, an exact value (==, in) when the stat
+    lands on it. Thresholds are kept sorted per stat so the ones crossed
+    between two snapshots are found by bisection. The few other clauses
+    (<, <=) are re-checked whenever their stat changes.
+    """
+    
+    def __init__(self, achievements: Iterable[Achievement]):
+        """Compile the achievements' clauses into per-stat tables"""
+        thresholds: Dict[str, List[Tuple[int, int, Achievement]]] = {}
+        self._exact: Dict[str, Dict[int, List[Achievement]]] = {}
+        self._on_change: Dict[str, List[Achievement]] = {}
+        
+        for order, achievement in enumerate(achievements):
+            for stat, op, value in achievement.clauses:
+                if op in ('>=', '>'):
+                    # Integer stats: x > v is x >= v + 1
+                    threshold = value if op == '>=' else value + 1
+                    thresholds.setdefault(stat, []).append((threshold, order, achievement))
+                elif op in ('==', 'in'):
+                    for option in (value if op == 'in' else (value,)):
+                        self._exact.setdefault(stat, {}).setdefault(option, []).append(achievement)
+                else:
+                    self._on_change.setdefault(stat, []).append(achievement)
+        
+        self._values: Dict[str, List[int]] = {}
+        self._achievements: Dict[str, List[Achievement]] = {}
+        for stat, entries in thresholds.items():
+            entries.sort(key=lambda entry: entry[:2])
+            self._values[stat] = [entry[0] for entry in entries]
+            self._achievements[stat] = [entry[2] for entry in entries]
+    
+    def candidates(self, old: Dict[str, int], new: Dict[str, int]) -> Set[Achievement]:
+        """Achievements with a clause that may have turned true from old to new"""
+        found = set()
+        for stat in STATS:
+            before, after = old[stat], new[stat]
+            if before == after:
+                continue
+            
+            if after > before and stat in self._values:
+                values = self._values[stat]
+                lo = bisect.bisect_right(values, before)
+                hi = bisect.bisect_right(values, after)
+                found.update(self._achievements[stat][lo:hi])
+            found.update(self._exact.get(stat, {}).get(after, ()))
+            found.update(self._on_change.get(stat, ()))
+        return found
 
 
 class AchievementManager:
+    """
+    Unlocks achievements as users' stats change
+    
+    Bets are checked from inside their settlement transaction (a settle
+    hook), so unlocks and rewards commit together with the bet. Only
+    achievements whose clauses were crossed since the user's last check
+    are evaluated, against a cached set of what they already unlocked.
+    The first check of a user in this process evaluates everything once
+    to catch up. All state here is touched on the writer thread only,
+    except take_unlocked().
+    """
+    
     def __init__(self, db: DatabaseManager):
         self.db = db
-        self.achievements = self._define_achievements()
+        self.writer = db.writer
+        self.achievements = self.define_achievements()
+        self.index = AchievementIndex(self.achievements.values())
+        self._order = {name: i for i, name in enumerate(self.achievements)}
+        # user_id -> unlocked names / stats at the last check / unlocks not yet shown
+        self._unlocked: Dict[str, Set[str]] = {}
+        self._checked: Dict[str, Dict[str, int]] = {}
+        self._pending: Dict[str, List[Achievement]] = {}
+        db.add_settle_hook(self.on_settle)
     
-    def _define_achievements(self) -> Dict[str, Achievement]:
+    @staticmethod
+    def define_achievements() -> Dict[str, Achievement]:
         achievements = {
             # Starter achievements
-            'first_game': Achievement('first_game', 'First Timer', 'Play your first game', '🎮', lambda u: u['games_played'] >= 1, 100),
-            'beginner': Achievement('beginner', 'Beginner', 'Play 5 games', '🌱', lambda u: u['games_played'] >= 5, 50),
-            'getting_started': Achievement('getting_started', 'Getting Started', 'Play 10 games', '🎯', lambda u: u['games_played'] >= 10, 100),
+            'first_game': Achievement('first_game', 'First Timer', 'Play your first game', '🎮', [('games_played', '>=', 1)], 100),
+            'beginner': Achievement('beginner', 'Beginner', 'Play 5 games', '🌱', [('games_played', '>=', 5)], 50),
+            'getting_started': Achievement('getting_started', 'Getting Started', 'Play 10 games', '🎯', [('games_played', '>=', 10)], 100),
             
             # Game count achievements
-            'casual_player': Achievement('casual_player', 'Casual Player', 'Play 25 games', '🎲', lambda u: u['games_played'] >= 25, 200),
-            'regular': Achievement('regular', 'Regular', 'Play 50 games', '🎪', lambda u: u['games_played'] >= 50, 500),
-            'veteran': Achievement('veteran', 'Veteran', 'Play 100 games', '🎖️', lambda u: u['games_played'] >= 100, 1000),
-            'expert': Achievement('expert', 'Expert', 'Play 250 games', '🏅', lambda u: u['games_played'] >= 250, 2500),
-            'master': Achievement('master', 'Casino Master', 'Play 500 games', '👑', lambda u: u['games_played'] >= 500, 5000),
-            'legend': Achievement('legend', 'Living Legend', 'Play 1000 games', '⭐', lambda u: u['games_played'] >= 1000, 10000),
-            'god_tier': Achievement('god_tier', 'God Tier', 'Play 2500 games', '🌟', lambda u: u['games_played'] >= 2500, 25000),
-            'unstoppable': Achievement('unstoppable', 'Unstoppable', 'Play 5000 games', '💫', lambda u: u['games_played'] >= 5000, 50000),
+            'casual_player': Achievement('casual_player', 'Casual Player', 'Play 25 games', '🎲', [('games_played', '>=', 25)], 200),
+            'regular': Achievement('regular', 'Regular', 'Play 50 games', '🎪', [('games_played', '>=', 50)], 500),
+            'veteran': Achievement('veteran', 'Veteran', 'Play 100 games', '🎖️', [('games_played', '>=', 100)], 1000),
+            'expert': Achievement('expert', 'Expert', 'Play 250 games', '🏅', [('games_played', '>=', 250)], 2500),
+            'master': Achievement('master', 'Casino Master', 'Play 500 games', '👑', [('games_played', '>=', 500)], 5000),
+            'legend': Achievement('legend', 'Living Legend', 'Play 1000 games', '⭐', [('games_played', '>=', 1000)], 10000),
+            'god_tier': Achievement('god_tier', 'God Tier', 'Play 2500 games', '🌟', [('games_played', '>=', 2500)], 25000),
+            'unstoppable': Achievement('unstoppable', 'Unstoppable', 'Play 5000 games', '💫', [('games_played', '>=', 5000)], 50000),
             
             # Coin achievements
-            'first_coins': Achievement('first_coins', 'Got Coins', 'Have 100 coins', '🪙', lambda u: u['coins'] >= 100, 50),
-            'getting_rich': Achievement('getting_rich', 'Getting Rich', 'Have 500 coins', '💵', lambda u: u['coins'] >= 500, 100),
-            'moneybags': Achievement('moneybags', 'Moneybags', 'Have 1,000 coins', '💰', lambda u: u['coins'] >= 1000, 200),
-            'wealthy': Achievement('wealthy', 'Wealthy', 'Have 5,000 coins', '💎', lambda u: u['coins'] >= 5000, 500),
-            'high_roller': Achievement('high_roller', 'High Roller', 'Have 10,000 coins', '🎰', lambda u: u['coins'] >= 10000, 1000),
-            'tycoon': Achievement('tycoon', 'Tycoon', 'Have 25,000 coins', '🏦', lambda u: u['coins'] >= 25000, 2500),
-            'millionaire': Achievement('millionaire', 'Millionaire', 'Have 50,000 coins', '🤑', lambda u: u['coins'] >= 50000, 5000),
-            'multi_millionaire': Achievement('multi_millionaire', 'Multi-Millionaire', 'Have 100,000 coins', '💸', lambda u: u['coins'] >= 100000, 10000),
-            'billionaire': Achievement('billionaire', 'Billionaire', 'Have 500,000 coins', '🏰', lambda u: u['coins'] >= 500000, 50000),
-            'trillionaire': Achievement('trillionaire', 'Trillionaire', 'Have 1,000,000 coins', '👑', lambda u: u['coins'] >= 1000000, 100000),
+            'first_coins': Achievement('first_coins', 'Got Coins', 'Have 100 coins', '🪙', [('coins', '>=', 100)], 50),
+            'getting_rich': Achievement('getting_rich', 'Getting Rich', 'Have 500 coins', '💵', [('coins', '>=', 500)], 100),
+            'moneybags': Achievement('moneybags', 'Moneybags', 'Have 1,000 coins', '💰', [('coins', '>=', 1000)], 200),
+            'wealthy': Achievement('wealthy', 'Wealthy', 'Have 5,000 coins', '💎', [('coins', '>=', 5000)], 500),
+            'high_roller': Achievement('high_roller', 'High Roller', 'Have 10,000 coins', '🎰', [('coins', '>=', 10000)], 1000),
+            'tycoon': Achievement('tycoon', 'Tycoon', 'Have 25,000 coins', '🏦', [('coins', '>=', 25000)], 2500),
+            'millionaire': Achievement('millionaire', 'Millionaire', 'Have 50,000 coins', '🤑', [('coins', '>=', 50000)], 5000),
+            'multi_millionaire': Achievement('multi_millionaire', 'Multi-Millionaire', 'Have 100,000 coins', '💸', [('coins', '>=', 100000)], 10000),
+            'billionaire': Achievement('billionaire', 'Billionaire', 'Have 500,000 coins', '🏰', [('coins', '>=', 500000)], 50000),
+            'trillionaire': Achievement('trillionaire', 'Trillionaire', 'Have 1,000,000 coins', '👑', [('coins', '>=', 1000000)], 100000),
             
             # Win achievements
-            'first_win': Achievement('first_win', 'First Win', 'Win your first game', '🎉', lambda u: u['games_won'] >= 1, 100),
-            'lucky_one': Achievement('lucky_one', 'Lucky', 'Win 5 times', '🍀', lambda u: u['games_won'] >= 5, 100),
-            'winner': Achievement('winner', 'Winner', 'Win 10 times', '🏆', lambda u: u['games_won'] >= 10, 200),
-            'champion': Achievement('champion', 'Champion', 'Win 25 times', '🥇', lambda u: u['games_won'] >= 25, 500),
-            'big_winner': Achievement('big_winner', 'Big Winner', 'Win 50 times', '🎊', lambda u: u['games_won'] >= 50, 1000),
-            'dominator': Achievement('dominator', 'Dominator', 'Win 100 times', '👊', lambda u: u['games_won'] >= 100, 2000),
-            'conqueror': Achievement('conqueror', 'Conqueror', 'Win 250 times', '⚔️', lambda u: u['games_won'] >= 250, 5000),
-            'destroyer': Achievement('destroyer', 'Destroyer', 'Win 500 times', '💥', lambda u: u['games_won'] >= 500, 10000),
+            'first_win': Achievement('first_win', 'First Win', 'Win your first game', '🎉', [('games_won', '>=', 1)], 100),
+            'lucky_one': Achievement('lucky_one', 'Lucky', 'Win 5 times', '🍀', [('games_won', '>=', 5)], 100),
+            'winner': Achievement('winner', 'Winner', 'Win 10 times', '🏆', [('games_won', '>=', 10)], 200),
+            'champion': Achievement('champion', 'Champion', 'Win 25 times', '🥇', [('games_won', '>=', 25)], 500),
+            'big_winner': Achievement('big_winner', 'Big Winner', 'Win 50 times', '🎊', [('games_won', '>=', 50)], 1000),
+            'dominator': Achievement('dominator', 'Dominator', 'Win 100 times', '👊', [('games_won', '>=', 100)], 2000),
+            'conqueror': Achievement('conqueror', 'Conqueror', 'Win 250 times', '⚔️', [('games_won', '>=', 250)], 5000),
+            'destroyer': Achievement('destroyer', 'Destroyer', 'Win 500 times', '💥', [('games_won', '>=', 500)], 10000),
             
             # Total winnings achievements
-            'small_profit': Achievement('small_profit', 'Small Profit', 'Win 1,000 coins total', '💵', lambda u: u['total_won'] >= 1000, 100),
-            'good_profit': Achievement('good_profit', 'Good Profit', 'Win 5,000 coins total', '💰', lambda u: u['total_won'] >= 5000, 250),
-            'big_profit': Achievement('big_profit', 'Big Profit', 'Win 10,000 coins total', '💎', lambda u: u['total_won'] >= 10000, 500),
-            'huge_profit': Achievement('huge_profit', 'Huge Profit', 'Win 25,000 coins total', '🤑', lambda u: u['total_won'] >= 25000, 1000),
-            'massive_profit': Achievement('massive_profit', 'Massive Profit', 'Win 50,000 coins total', '💸', lambda u: u['total_won'] >= 50000, 2500),
-            'insane_profit': Achievement('insane_profit', 'Insane Profit', 'Win 100,000 coins total', '🏆', lambda u: u['total_won'] >= 100000, 5000),
+            'small_profit': Achievement('small_profit', 'Small Profit', 'Win 1,000 coins total', '💵', [('total_won', '>=', 1000)], 100),
+            'good_profit': Achievement('good_profit', 'Good Profit', 'Win 5,000 coins total', '💰', [('total_won', '>=', 5000)], 250),
+            'big_profit': Achievement('big_profit', 'Big Profit', 'Win 10,000 coins total', '💎', [('total_won', '>=', 10000)], 500),
+            'huge_profit': Achievement('huge_profit', 'Huge Profit', 'Win 25,000 coins total', '🤑', [('total_won', '>=', 25000)], 1000),
+            'massive_profit': Achievement('massive_profit', 'Massive Profit', 'Win 50,000 coins total', '💸', [('total_won', '>=', 50000)], 2500),
+            'insane_profit': Achievement('insane_profit', 'Insane Profit', 'Win 100,000 coins total', '🏆', [('total_won', '>=', 100000)], 5000),
             
             # Streak achievements
-            'consistent': Achievement('consistent', 'Consistent', '3 days streak', '📅', lambda u: u['streak'] >= 3, 100),
-            'dedicated': Achievement('dedicated', 'Dedicated', '5 days streak', '🔥', lambda u: u['streak'] >= 5, 250),
-            'lucky_streak': Achievement('lucky_streak', 'Lucky Streak', '7 days streak', '🍀', lambda u: u['streak'] >= 7, 500),
-            'committed': Achievement('committed', 'Committed', '10 days streak', '💪', lambda u: u['streak'] >= 10, 1000),
-            'persistent': Achievement('persistent', 'Persistent', '15 days streak', '🎯', lambda u: u['streak'] >= 15, 1500),
-            'unstoppable_streak': Achievement('unstoppable_streak', 'Unstoppable', '21 days streak', '⚡', lambda u: u['streak'] >= 21, 2500),
-            'month_streak': Achievement('month_streak', 'Full Month', '30 days streak', '📆', lambda u: u['streak'] >= 30, 5000),
-            'two_months': Achievement('two_months', 'Two Months', '60 days streak', '🌟', lambda u: u['streak'] >= 60, 10000),
-            'three_months': Achievement('three_months', 'Three Months', '90 days streak', '💫', lambda u: u['streak'] >= 90, 20000),
-            'half_year': Achievement('half_year', 'Half Year', '180 days streak', '👑', lambda u: u['streak'] >= 180, 50000),
-            'full_year': Achievement('full_year', 'Full Year', '365 days streak', '🏆', lambda u: u['streak'] >= 365, 100000),
+            'consistent': Achievement('consistent', 'Consistent', '3 days streak', '📅', [('streak', '>=', 3)], 100),
+            'dedicated': Achievement('dedicated', 'Dedicated', '5 days streak', '🔥', [('streak', '>=', 5)], 250),
+            'lucky_streak': Achievement('lucky_streak', 'Lucky Streak', '7 days streak', '🍀', [('streak', '>=', 7)], 500),
+            'committed': Achievement('committed', 'Committed', '10 days streak', '💪', [('streak', '>=', 10)], 1000),
+            'persistent': Achievement('persistent', 'Persistent', '15 days streak', '🎯', [('streak', '>=', 15)], 1500),
+            'unstoppable_streak': Achievement('unstoppable_streak', 'Unstoppable', '21 days streak', '⚡', [('streak', '>=', 21)], 2500),
+            'month_streak': Achievement('month_streak', 'Full Month', '30 days streak', '📆', [('streak', '>=', 30)], 5000),
+            'two_months': Achievement('two_months', 'Two Months', '60 days streak', '🌟', [('streak', '>=', 60)], 10000),
+            'three_months': Achievement('three_months', 'Three Months', '90 days streak', '💫', [('streak', '>=', 90)], 20000),
+            'half_year': Achievement('half_year', 'Half Year', '180 days streak', '👑', [('streak', '>=', 180)], 50000),
+            'full_year': Achievement('full_year', 'Full Year', '365 days streak', '🏆', [('streak', '>=', 365)], 100000),
             
             # Loss achievements
-            'disaster': Achievement('disaster', 'Disaster', 'Lose 1,000 coins total', '💀', lambda u: u['total_lost'] >= 1000, 100),
-            'bankruptcy': Achievement('bankruptcy', 'Bankruptcy', 'Lose 5,000 coins total', '☠️', lambda u: u['total_lost'] >= 5000, 250),
-            'rock_bottom': Achievement('rock_bottom', 'Rock Bottom', 'Lose 10,000 coins total', '🕳️', lambda u: u['total_lost'] >= 10000, 500),
+            'disaster': Achievement('disaster', 'Disaster', 'Lose 1,000 coins total', '💀', [('total_lost', '>=', 1000)], 100),
+            'bankruptcy': Achievement('bankruptcy', 'Bankruptcy', 'Lose 5,000 coins total', '☠️', [('total_lost', '>=', 5000)], 250),
+            'rock_bottom': Achievement('rock_bottom', 'Rock Bottom', 'Lose 10,000 coins total', '🕳️', [('total_lost', '>=', 10000)], 500),
             
             # Special number achievements
-            'lucky_number': Achievement('lucky_number', 'Lucky Number', 'Have exactly 6,969 coins', '😏', lambda u: u['coins'] == 6969, 6969),
-            'illuminati': Achievement('illuminati', 'Illuminati Confirmed', 'Have exactly 666 or 777 coins', '👁️', lambda u: u['coins'] in [666, 777], 1000),
+            'lucky_number': Achievement('lucky_number', 'Lucky Number', 'Have exactly 6,969 coins', '😏', [('coins', '==', 6969)], 6969),
+            'illuminati': Achievement('illuminati', 'Illuminati Confirmed', 'Have exactly 666 or 777 coins', '👁️', [('coins', 'in', (666, 777))], 1000),
             
             # Meme achievements
-            'skibidi_toilet': Achievement('skibidi_toilet', 'Skibidi Toilet', 'Play exactly 69 times', '🚽', lambda u: u['games_played'] == 69, 690),
-            'rizz_god': Achievement('rizz_god', 'Rizz God', 'Have exactly 777 coins', '😎', lambda u: u['coins'] == 777, 777),
-            'sigma_grindset': Achievement('sigma_grindset', 'Sigma Grindset', 'Play 500 times', '💪', lambda u: u['games_played'] >= 500, 5000),
-            'alpha_male': Achievement('alpha_male', 'Alpha Male', 'Win 100 games', '🗿', lambda u: u['games_won'] >= 100, 2000),
-            'based': Achievement('based', 'Based', 'Have exactly 1,337 coins', '🧠', lambda u: u['coins'] == 1337, 1337),
-            'gigachad': Achievement('gigachad', 'Gigachad', 'Win 1,000 games', '💎', lambda u: u['games_won'] >= 1000, 10000),
-            'no_cap': Achievement('no_cap', 'No Cap', 'Win 50,000 coins total', '🧢', lambda u: u['total_won'] >= 50000, 5000),
-            'its_giving': Achievement('its_giving', 'Its Giving Broke', 'Have less than 10 coins', '💀', lambda u: u['coins'] < 10, 100),
-            'slay': Achievement('slay', 'Slay Queen', 'Keep 10 days streak', '👑', lambda u: u['streak'] >= 10, 1000),
+            'skibidi_toilet': Achievement('skibidi_toilet', 'Skibidi Toilet', 'Play exactly 69 times', '🚽', [('games_played', '==', 69)], 690),
+            'rizz_god': Achievement('rizz_god', 'Rizz God', 'Have exactly 777 coins', '😎', [('coins', '==', 777)], 777),
+            'sigma_grindset': Achievement('sigma_grindset', 'Sigma Grindset', 'Play 500 times', '💪', [('games_played', '>=', 500)], 5000),
+            'alpha_male': Achievement('alpha_male', 'Alpha Male', 'Win 100 games', '🗿', [('games_won', '>=', 100)], 2000),
+            'based': Achievement('based', 'Based', 'Have exactly 1,337 coins', '🧠', [('coins', '==', 1337)], 1337),
+            'gigachad': Achievement('gigachad', 'Gigachad', 'Win 1,000 games', '💎', [('games_won', '>=', 1000)], 10000),
+            'no_cap': Achievement('no_cap', 'No Cap', 'Win 50,000 coins total', '🧢', [('total_won', '>=', 50000)], 5000),
+            'its_giving': Achievement('its_giving', 'Its Giving Broke', 'Have less than 10 coins', '💀', [('coins', '<', 10)], 100),
+            'slay': Achievement('slay', 'Slay Queen', 'Keep 10 days streak', '👑', [('streak', '>=', 10)], 1000),
             
             # Number memes
-            'stonks': Achievement('stonks', 'Stonks', 'Win 10,000 coins total', '📈', lambda u: u['total_won'] >= 10000, 1000),
-            'not_stonks': Achievement('not_stonks', 'Not Stonks', 'Lose 10,000 coins total', '📉', lambda u: u['total_lost'] >= 10000, 1000),
-            'over_9000': Achievement('over_9000', 'Its Over 9000!', 'Have more than 9,000 coins', '🐉', lambda u: u['coins'] > 9000, 9001),
-            'ordem_66': Achievement('ordem_66', 'Order 66', 'Have exactly 66 coins', '⚔️', lambda u: u['coins'] == 66, 660),
+            'stonks': Achievement('stonks', 'Stonks', 'Win 10,000 coins total', '📈', [('total_won', '>=', 10000)], 1000),
+            'not_stonks': Achievement('not_stonks', 'Not Stonks', 'Lose 10,000 coins total', '📉', [('total_lost', '>=', 10000)], 1000),
+            'over_9000': Achievement('over_9000', 'Its Over 9000!', 'Have more than 9,000 coins', '🐉', [('coins', '>', 9000)], 9001),
+            'ordem_66': Achievement('ordem_66', 'Order 66', 'Have exactly 66 coins', '⚔️', [('coins', '==', 66)], 660),
             
             # Gaming achievements
-            'respawn': Achievement('respawn', 'Respawn', 'Keep playing after losing coins', '♻️', lambda u: u['games_played'] >= 10 and u['total_lost'] >= 100, 100),
-            'gg_ez': Achievement('gg_ez', 'GG EZ', 'Win 100 games', '🎮', lambda u: u['games_won'] >= 100, 1000),
-            'noob': Achievement('noob', 'Noob', 'Play 5 times without winning', '🤡', lambda u: u['games_played'] >= 5 and u['games_won'] == 0, 500),
-            'hacker': Achievement('hacker', 'Hacker (or lucky)', 'Win 25 games with high streak', '👨‍💻', lambda u: u['games_won'] >= 25 and u['streak'] >= 5, 2500),
+            'respawn': Achievement('respawn', 'Respawn', 'Keep playing after losing coins', '♻️', [('games_played', '>=', 10), ('total_lost', '>=', 100)], 100),
+            'gg_ez': Achievement('gg_ez', 'GG EZ', 'Win 100 games', '🎮', [('games_won', '>=', 100)], 1000),
+            'noob': Achievement('noob', 'Noob', 'Play 5 times without winning', '🤡', [('games_played', '>=', 5), ('games_won', '==', 0)], 500),
+            'hacker': Achievement('hacker', 'Hacker (or lucky)', 'Win 25 games with high streak', '👨‍💻', [('games_won', '>=', 25), ('streak', '>=', 5)], 2500),
             
             # Ironic achievements
-            'todo_dia_isso': Achievement('todo_dia_isso', 'Every Day', 'Play for 30 days straight', '😩', lambda u: u['streak'] >= 30, 3000),
-            'paciencia': Achievement('paciencia', 'Patience', 'Play 2,000 times', '🧘', lambda u: u['games_played'] >= 2000, 20000),
-            'perdemo': Achievement('perdemo', 'We Lost', 'Have 0 coins', '☠️', lambda u: u['coins'] == 0, 1000),
-            'confusion': Achievement('confusion', 'Confusion', 'Win and lose 10k coins each', '❓', lambda u: u['total_won'] >= 10000 and u['total_lost'] >= 10000, 2000),
+            'todo_dia_isso': Achievement('todo_dia_isso', 'Every Day', 'Play for 30 days straight', '😩', [('streak', '>=', 30)], 3000),
+            'paciencia': Achievement('paciencia', 'Patience', 'Play 2,000 times', '🧘', [('games_played', '>=', 2000)], 20000),
+            'perdemo': Achievement('perdemo', 'We Lost', 'Have 0 coins', '☠️', [('coins', '==', 0)], 1000),
+            'confusion': Achievement('confusion', 'Confusion', 'Win and lose 10k coins each', '❓', [('total_won', '>=', 10000), ('total_lost', '>=', 10000)], 2000),
         }
         return achievements
     
-    def check_achievements(self, user_id: str, username: str) -> List[Achievement]:
-        user = self.db.get_user(user_id, username)
-        user_stats = dict(user)
+    def _unlocked_names(self, user_id: int) -> Set[str]:
+        unlocked = self._unlocked.get(user_id)
+        if unlocked is None:
+            rows = self.db.get_connection().execute(
+                'SELECT achievement_name FROM achievements WHERE user_id = ?', (user_id,)
+            ).fetchall()
+            unlocked = self._unlocked[user_id] = {row[0] for row in rows}
+        return unlocked
+    
+    def _evaluate(self, user: sqlite3.Row) -> List[Achievement]:
+        """Unlock (and reward) what the user's current stats newly satisfy"""
+        user_id = user['user_id']
+        stats = {stat: user[stat] or 0 for stat in STATS}
+        unlocked = self._unlocked_names(user_id)
         
-        unlocked = []
+        last = self._checked.get(user_id)
+        candidates = self.achievements.values() if last is None else self.index.candidates(last, stats)
+        satisfied = sorted(
+            (a for a in candidates if a.name not in unlocked and a.condition(stats)),
+            key=lambda a: self._order[a.name]
+        )
         
-        for achievement in self.achievements.values():
-            if achievement.condition(user_stats):
-                if self.db.unlock_achievement(user_id, achievement.name):
-                    if achievement.reward > 0:
-                        self.db.update_coins(user_id, achievement.reward)
-                        self.db.add_transaction(
-                            user_id, 
-                            achievement.reward, 
-                            'achievement',
-                            f'Achievement unlocked: {achievement.title}'
-                        )
-                    unlocked.append(achievement)
+        # unlock_achievement is an INSERT OR IGNORE, the table stays the arbiter
+        new = [a for a in satisfied if self.db.unlock_achievement(user_id, a.name)]
+        reward = sum(a.reward for a in new)
+        if reward > 0:
+            self.db.update_coins(user_id, reward)
+        for achievement in new:
+            if achievement.reward > 0:
+                self.db.add_transaction(
+                    user_id, 
+                    achievement.reward, 
+                    'achievement',
+                    achievement.title
+                )
         
-        return unlocked
+        def remember():
+            unlocked.update(a.name for a in new)
+            self._checked[user_id] = stats
+        
+        self.db._after_commit(remember)
+        return new
+    
+    def on_settle(self, user: sqlite3.Row):
+        """Settle hook: unlock what this bet crossed, inside its transaction"""
+        try:
+            # Own savepoint, a failure here must not undo the bet
+            with self.db.transaction():
+                new = self._evaluate(user)
+        except Exception as e:
+            print(f"Error checking achievements for {user['user_id']}: {e}")
+            return
+        
+        if new:
+            user_id = user['user_id']
+            self.db._after_commit(lambda: self._pending.setdefault(user_id, []).extend(new))
+    
+    def take_unlocked(self, user_id: int) -> List[Achievement]:
+        """
+        Hand back what a just-settled bet unlocked, without touching the database
+        
+        After-commit hooks run before a write's caller is woken, so once
+        process_bet returns its unlocks are already here. Meant for a user
+        holding their game slot, whose bets can't be settling meanwhile.
+        """
+        return self._pending.pop(user_id, [])
+    
+    @writes
+    def check_achievements(self, user_id: int, username: str, user=None) -> List[Achievement]:
+        """
+        Get achievements unlocked since the last call
+        
+        Bets already evaluated themselves when they settled, so after a game
+        this mostly just hands back those unlocks. Stats changed some other
+        way (daily reward, heist) are evaluated here.
+        """
+        # Reuse the row returned by the settlement when the caller has it
+        if user is None:
+            user = self.db.get_user(user_id, username)
+        
+        return self._pending.pop(user['user_id'], []) + self._evaluate(user)
     
     def get_achievement(self, name: str) -> Achievement:
         return self.achievements.get(name)
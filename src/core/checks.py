@@ -1,25 +1,46 @@
 """Command checks and utilities"""
 
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
 from discord.ext import commands
+from .leases import Lease
 
-active_games = {}
+ALREADY_PLAYING = '❌ You are already playing! Finish the current game first.'
 
 
-def is_user_playing(user_id: int) -> bool:
-    return user_id in active_games
+def game_key(user_id: int) -> str:
+    """Lease key for a user's game slot"""
+    return f'game:{user_id}'
 
 
-def start_game(user_id: int, game_type: str):
-    active_games[user_id] = game_type
-
-
-def end_game(user_id: int):
-    if user_id in active_games:
-        del active_games[user_id]
+def is_user_playing(ctx, user_id: int = None) -> bool:
+    """Whether a user (the command author by default) is in a game"""
+    user_id = ctx.author.id if user_id is None else user_id
+    return ctx.bot.services.leases.holder(game_key(user_id)) is not None
 
 
 async def ensure_not_playing(ctx):
-    if is_user_playing(ctx.author.id):
-        await ctx.send('❌ You are already playing! Finish the current game first.')
+    """Early check so a busy user is told before any validation runs"""
+    if is_user_playing(ctx):
+        await ctx.send(ALREADY_PLAYING)
         return False
     return True
+
+
+@asynccontextmanager
+async def playing(ctx, game_type: str) -> AsyncIterator[Optional[Lease]]:
+    """
+    Hold the author's game slot for the duration of the block
+
+    Yields the lease, or None (after telling the user) if they are
+    already in a game, in which case the block should just return.
+    """
+    leases = ctx.bot.services.leases
+    lease = await leases.acquire(game_key(ctx.author.id), game_type)
+    if lease is None:
+        await ctx.send(ALREADY_PLAYING)
+    try:
+        yield lease
+    finally:
+        if lease is not None:
+            await leases.release(lease)
@@ -0,0 +1,290 @@
+"""Provably fair rounds: hash chain bookkeeping, client seeds and verification"""
+
+import json
+import os
+import secrets
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from src.database.db_manager import DatabaseManager
+from src.database.writer import writes
+from src.economy.economy_manager import EconomyManager
+from src.games.fair import CHAIN_LENGTH, FairRandom, HashChain, next_link
+from src.games.plugin import PLUGINS, Outcome
+
+# Where python -m src.games.fair can be run from
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MAX_CLIENT_SEED = 64
+
+# The next chain starts generating once this fraction of the active one is left
+SPARE_AT = 0.1
+
+
+class FairRound:
+    """One provably fair round: the seeds it was derived from and what it decided"""
+
+    def __init__(self, round_id: int, chain_id: int, position: int, user_id: int, game: str, args: tuple,
+                 client_seed: str, nonce: int, server_seed: bytes):
+        self.round_id = round_id
+        self.chain_id = chain_id
+        self.position = position
+        self.user_id = user_id
+        self.game = game
+        self.args = args
+        self.client_seed = client_seed
+        self.nonce = nonce
+        self.server_seed = server_seed
+        self.outcome: Optional[Outcome] = None
+
+    def derive(self) -> Outcome:
+        """Play the round from its seeds, the same way every time"""
+        return PLUGINS[self.game].play(*self.args, rng=FairRandom(self.server_seed, self.client_seed, self.nonce))
+
+
+class Verification:
+    """A recorded round replayed from its revealed server seed"""
+
+    def __init__(self, round: FairRound, record: sqlite3.Row, committed: bytes, commitment: str,
+                 terminal: str, replayed: Outcome):
+        self.round = round
+        self.record = record
+        # What SHA256(server seed) must equal, and what that value is
+        self.committed = committed
+        self.commitment = commitment
+        self.terminal = terminal
+        self.replayed = replayed
+
+    @property
+    def chain_ok(self) -> bool:
+        return next_link(self.round.server_seed) == self.committed
+
+    @property
+    def outcome_ok(self) -> bool:
+        return (bool(self.record['won']) == bool(self.replayed.won)
+                and abs(self.record['multiplier'] - self.replayed.multiplier) < 1e-9)
+
+
+class FairnessManager:
+    """
+    Decides and settles the rounds of provably fair games
+
+    A round is decided inside its settlement op on the writer thread: it
+    takes the next round id, which maps to a link of the active chain
+    (read by offset from the memory-mapped chain file), and the player's
+    client seed and nonce, then plays the game from their HMAC stream.
+    That is O(1) per bet, and ids and nonces advance in commit order with
+    a refused bet consuming neither. Round ids, chain positions and the
+    seed cache are only advanced on the writer thread; client_seed() may
+    hand out a fresh seed from any thread.
+
+    Chains are generated by python -m src.games.fair in a background
+    process, the first one included: until it is registered ready() is
+    False and fair rounds are refused. The next chain is started once
+    SPARE_AT of the last one is left, early enough that rounds never wait
+    for it.
+    """
+
+    def __init__(self, db: DatabaseManager, directory: str = None, chain_length: int = CHAIN_LENGTH):
+        """
+        Initialize the manager, starting a first chain in the background if there is none
+
+        Args:
+            db: Database manager
+            directory: Where chain files live, defaults to fair/ next to the database
+            chain_length: Rounds per generated chain
+        """
+        self.db = db
+        self.writer = db.writer
+        self.economy = EconomyManager(db)
+        # Absolute, the generator process runs from the project root
+        self.directory = os.path.abspath(directory or os.path.join(os.path.dirname(db.db_path), 'fair'))
+        self.chain_length = chain_length
+        # fair_chains rows by first_round, and their opened files by chain_id
+        self._chains: List[sqlite3.Row] = []
+        self._files: Dict[int, HashChain] = {}
+        # user_id -> [client seed, next nonce]
+        self._seeds: Dict[int, List] = {}
+        self._generating: Optional[threading.Thread] = None
+        self._load()
+
+    def _load(self):
+        conn = self.db.get_connection()
+        self._chains = conn.execute('SELECT * FROM fair_chains ORDER BY first_round').fetchall()
+        for row in conn.execute('SELECT user_id, client_seed, nonce FROM fair_seeds'):
+            self._seeds[row['user_id']] = [row['client_seed'], row['nonce']]
+        last = conn.execute('SELECT MAX(round_id) FROM fair_rounds').fetchone()[0]
+        self._next_round = last + 1 if last is not None else (self._chains[0]['first_round'] if self._chains else 1)
+
+        # Chains generated but never registered, e.g. the bot stopped in between
+        registered = {row['file'] for row in self._chains}
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                if not name.startswith('chain-') or name in registered:
+                    continue
+                if name.endswith('.bin.tmp'):
+                    os.remove(path)
+                elif name.endswith('.bin'):
+                    # Kept aside rather than deleted, nothing else should be using the name
+                    os.makedirs(os.path.join(self.directory, 'quarantine'), exist_ok=True)
+                    os.replace(path, os.path.join(self.directory, 'quarantine', name))
+
+        self._ensure_spare()
+
+    def _chain_for(self, round_id: int) -> Optional[sqlite3.Row]:
+        for chain in reversed(self._chains):
+            if chain['first_round'] <= round_id < chain['first_round'] + chain['length']:
+                return chain
+        return None
+
+    def _file(self, chain: sqlite3.Row) -> HashChain:
+        hash_chain = self._files.get(chain['chain_id'])
+        if hash_chain is None:
+            hash_chain = self._files[chain['chain_id']] = HashChain(os.path.join(self.directory, chain['file']))
+        return hash_chain
+
+    def _ensure_spare(self):
+        """Start generating the next chain once the last one is running out (or there is none)"""
+        if self._generating is not None:
+            return
+        if self._chains:
+            last = self._chains[-1]
+            if last['first_round'] + last['length'] - self._next_round > last['length'] * SPARE_AT:
+                return
+        self._generating = threading.Thread(target=self._generate, name='fair-chain', daemon=True)
+        self._generating.start()
+
+    def _generate(self):
+        name = f'chain-{int(time.time())}-{secrets.token_hex(4)}.bin'
+        path = os.path.join(self.directory, name)
+        try:
+            start = time.perf_counter()
+            result = subprocess.run(
+                [sys.executable, '-m', 'src.games.fair', path, '--links', str(self.chain_length)],
+                cwd=ROOT, capture_output=True, text=True, check=True
+            )
+            terminal = result.stdout.strip().splitlines()[-1]
+            written = HashChain(path)
+            written.close()
+            if written.terminal != terminal:
+                raise ValueError(f'{name} does not end in the hash it reported')
+            self._add_chain(name, terminal)
+            print(f'🔐 Provably fair chain {name} ready ({self.chain_length:,} rounds, '
+                  f'{time.perf_counter() - start:.1f}s), published hash {terminal}')
+        except Exception as e:
+            print(f'Error generating provably fair chain: {e}')
+        finally:
+            self._generating = None
+
+    @writes
+    def _add_chain(self, name: str, terminal: str):
+        """Register a generated chain after the last one"""
+        conn = self.db.get_connection()
+        first_round = self._chains[-1]['first_round'] + self._chains[-1]['length'] if self._chains else 1
+        row = conn.execute('''
+            INSERT INTO fair_chains (file, terminal_hash, length, first_round, created_at)
+            VALUES (?, ?, ?, ?, ?)
+            RETURNING *
+        ''', (name, terminal, self.chain_length, first_round, int(time.time()))).fetchone()
+        self._chains = self._chains + [row]
+
+    def client_seed(self, user_id: int) -> Tuple[str, int]:
+        """A player's client seed and next nonce (a fresh seed is saved with their first round)"""
+        seed = self._seeds.setdefault(user_id, [secrets.token_hex(8), 0])
+        return seed[0], seed[1]
+
+    def ready(self) -> bool:
+        """Whether there is a chain for the next round (False while the first one is generated)"""
+        return self._chain_for(self._next_round) is not None
+
+    def published_hash(self) -> Optional[str]:
+        """Terminal hash of the chain the next round is played on"""
+        chain = self._chain_for(self._next_round)
+        return chain['terminal_hash'] if chain else None
+
+    @writes
+    def set_client_seed(self, user_id: int, client_seed: str) -> bool:
+        """Change a player's client seed for their next rounds (the nonce keeps counting)"""
+        client_seed = client_seed.strip()
+        if not 0 < len(client_seed) <= MAX_CLIENT_SEED or not client_seed.isprintable():
+            return False
+
+        nonce = self.client_seed(user_id)[1]
+        self.db.get_connection().execute('''
+            INSERT INTO fair_seeds (user_id, client_seed, nonce) VALUES (?, ?, ?)
+            ON CONFLICT(user_id) DO UPDATE SET client_seed = excluded.client_seed
+        ''', (user_id, client_seed, nonce))
+        self._seeds[user_id] = [client_seed, nonce]
+        return True
+
+    @writes
+    def settle(self, user_id: int, username: str, game: str, args: tuple,
+               bet_amount: int) -> Tuple[bool, int, Optional[sqlite3.Row], Optional[FairRound]]:
+        """
+        Decide a round from the next chain link and settle its bet, in one transaction
+
+        Returns:
+            (success, net_change, user row after settlement, the round)
+        """
+        chain = self._chain_for(self._next_round)
+        if chain is None:
+            print('Error in fair settle: no provably fair chain ready')
+            return False, 0, None, None
+
+        client_seed, nonce = self.client_seed(user_id)
+        position = self._next_round - chain['first_round']
+        round = FairRound(self._next_round, chain['chain_id'], position, user_id, game, tuple(args),
+                          client_seed, nonce, self._file(chain).seed(position))
+
+        try:
+            with self.db.transaction() as cursor:
+                round.outcome = outcome = round.derive()
+                success, net_change, user = self.economy.process_bet(user_id, username, bet_amount, game,
+                                                                     outcome.won, outcome.multiplier)
+                if not success:
+                    return False, 0, None, None
+
+                cursor.execute('''
+                    INSERT INTO fair_rounds (round_id, chain_id, user_id, game, args, client_seed, nonce,
+                                             bet_amount, won, multiplier, timestamp)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (round.round_id, round.chain_id, user_id, game, json.dumps(round.args), client_seed, nonce,
+                      bet_amount, 1 if outcome.won else 0, outcome.multiplier, int(time.time())))
+                cursor.execute('''
+                    INSERT INTO fair_seeds (user_id, client_seed, nonce) VALUES (?, ?, ?)
+                    ON CONFLICT(user_id) DO UPDATE SET nonce = excluded.nonce
+                ''', (user_id, client_seed, nonce + 1))
+        except Exception as e:
+            print(f'Error in fair settle: {e}')
+            return False, 0, None, None
+
+        self._seeds[user_id] = [client_seed, nonce + 1]
+        self._next_round += 1
+        self._ensure_spare()
+        return True, net_change, user, round
+
+    def verify(self, round_id: int) -> Optional[Verification]:
+        """Replay a recorded round from its revealed server seed, None if there is no such round"""
+        record = self.db.get_connection().execute(
+            'SELECT * FROM fair_rounds WHERE round_id = ?', (round_id,)
+        ).fetchone()
+        if record is None:
+            return None
+
+        chain = next(row for row in self._chains if row['chain_id'] == record['chain_id'])
+        hash_chain = self._file(chain)
+        position = round_id - chain['first_round']
+        round = FairRound(round_id, chain['chain_id'], position, record['user_id'], record['game'],
+                          tuple(json.loads(record['args'])), record['client_seed'], record['nonce'],
+                          hash_chain.seed(position))
+
+        # The seed hashes to the round before it on the chain, or to the published hash
+        if position:
+            committed, commitment = hash_chain.seed(position - 1), f'server seed da rodada #{round_id - 1}'
+        else:
+            committed, commitment = bytes.fromhex(chain['terminal_hash']), 'hash publicado da cadeia'
+        return Verification(round, record, committed, commitment, chain['terminal_hash'], round.derive())
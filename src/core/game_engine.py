@@ -0,0 +1,214 @@
+"""Pipeline running one round of a one-shot game"""
+
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Type
+import discord
+from src.games.plugin import PLUGINS, RESULT, GamePlugin, Round
+from .checks import ALREADY_PLAYING, ensure_not_playing, game_key
+from .mensagens import MensagensCasuais as MSG
+
+FIELD_LIMIT = 1024
+
+FAIR_NOT_READY = '⏳ A cadeia provably fair ainda está sendo gerada, tente de novo em alguns segundos!'
+
+# A stage gets the command context and the round so far, False ends the round
+Stage = Callable[..., Awaitable[bool]]
+
+
+class GameEngine:
+    """
+    Runs game plugins through validate → lock → play → settle → render → announce
+
+    validate and play never touch the database. settle is the round's
+    only database work: one process_bet transaction, which checks the
+    available balance and unlocks achievements as it settles, so nothing
+    is read before it (the balance is only read to explain a refused
+    bet). announce sends exactly one message, the result embed with any
+    unlocked achievements in it.
+
+    With a fairness manager, provably_fair plugins are not played in
+    play: settle decides the round from its hash chain link and settles
+    it in the same single transaction.
+
+    Stages are (name, coroutine) pairs in self.stages and can be replaced
+    or added to with use(). Every stage is timed into self.stats.
+    """
+
+    def __init__(self, economy, achievements, leases, plugins: Dict[str, Type[GamePlugin]] = None,
+                 fairness=None):
+        """
+        Initialize the engine
+
+        Args:
+            economy: Async-wrapped EconomyManager
+            achievements: Async-wrapped AchievementManager
+            leases: LeaseManager holding each player's game slot
+            plugins: Games by name, defaults to every registered plugin
+            fairness: Async-wrapped FairnessManager deciding provably fair rounds (optional)
+        """
+        self.economy = economy
+        self.achievements = achievements
+        self.leases = leases
+        self.fairness = fairness
+        self.plugins = dict(PLUGINS if plugins is None else plugins)
+        self.stages: List[Tuple[str, Stage]] = [
+            ('validate', self.validate),
+            ('lock', self.lock),
+            ('play', self.play),
+            ('settle', self.settle),
+            ('render', self.render),
+            ('announce', self.announce),
+        ]
+        self.stats = {'rounds': 0, 'completed': 0, 'stages': {}}
+
+    def use(self, name: str, stage: Stage, before: str = None):
+        """Replace the stage called name, or insert it (before another stage, or last)"""
+        names = [existing for existing, _ in self.stages]
+        if name in names:
+            self.stages[names.index(name)] = (name, stage)
+        elif before is not None:
+            self.stages.insert(names.index(before), (name, stage))
+        else:
+            self.stages.append((name, stage))
+
+    def _timed(self, name: str, seconds: float):
+        stats = self.stats['stages'].setdefault(name, {'count': 0, 'seconds': 0.0, 'max': 0.0})
+        stats['count'] += 1
+        stats['seconds'] += seconds
+        stats['max'] = max(stats['max'], seconds)
+
+    def timings(self) -> Dict[str, float]:
+        """Mean milliseconds per stage"""
+        return {name: stats['seconds'] / stats['count'] * 1000
+                for name, stats in self.stats['stages'].items() if stats['count']}
+
+    async def run(self, ctx, name: str, bet_amount: int, *args) -> Optional[Round]:
+        """
+        Play one round of a plugin for the command author
+
+        Returns:
+            Round: The finished round, or None if a stage ended it early
+        """
+        round = Round(self.plugins[name], bet_amount, args)
+        self.stats['rounds'] += 1
+        try:
+            for stage_name, stage in self.stages:
+                start = time.perf_counter()
+                proceed = await stage(ctx, round)
+                round.timings[stage_name] = elapsed = time.perf_counter() - start
+                self._timed(stage_name, elapsed)
+                if not proceed:
+                    return None
+        finally:
+            lease = getattr(round, 'lease', None)
+            if lease is not None:
+                await self.leases.release(lease)
+        self.stats['completed'] += 1
+        return round
+
+    async def validate(self, ctx, round: Round) -> bool:
+        """Reject a busy player, a bet under the minimum, invalid arguments or a fair game with no chain yet"""
+        if not await ensure_not_playing(ctx):
+            return False
+        if round.bet_amount < round.plugin.min_bet:
+            await ctx.send(MSG.aposta_minima())
+            return False
+        error = round.plugin.validate(*round.args)
+        if error:
+            await ctx.send(error)
+            return False
+        if self.is_fair(round) and not await self.fairness.ready():
+            await ctx.send(FAIR_NOT_READY)
+            return False
+        return True
+
+    async def lock(self, ctx, round: Round) -> bool:
+        """Hold the player's game slot until the round ends"""
+        round.lease = await self.leases.acquire(game_key(ctx.author.id), round.plugin.name)
+        if round.lease is None:
+            await ctx.send(ALREADY_PLAYING)
+            return False
+        return True
+
+    def is_fair(self, round: Round) -> bool:
+        return self.fairness is not None and round.plugin.provably_fair
+
+    async def play(self, ctx, round: Round) -> bool:
+        if not self.is_fair(round):
+            round.outcome = round.plugin.play(*round.args)
+        return True
+
+    async def settle(self, ctx, round: Round) -> bool:
+        """Settle the bet in one transaction and collect the achievements it unlocked"""
+        if self.is_fair(round):
+            success, round.net_change, round.user, round.fair = await self.fairness.settle(
+                ctx.author.id,
+                ctx.author.name,
+                round.plugin.name,
+                round.args,
+                round.bet_amount
+            )
+            if success:
+                round.outcome = round.fair.outcome
+        else:
+            outcome = round.outcome
+            success, round.net_change, round.user = await self.economy.process_bet(
+                ctx.author.id,
+                ctx.author.name,
+                round.bet_amount,
+                round.plugin.name,
+                outcome.won,
+                outcome.multiplier
+            )
+
+        if not success:
+            # Refused by the balance condition, or failed: only now is it worth a read
+            available = await self.economy.get_available(ctx.author.id, ctx.author.name)
+            if available < 0:
+                await ctx.send(f'🚨 **YOU ARE IN DEBT!**\nBalance: **{available:,} 🪙**\n\nPay your debts before playing!')
+            elif available < round.bet_amount:
+                await ctx.send(MSG.saldo_insuficiente())
+            else:
+                await ctx.send(MSG.erro_processar())
+            return False
+
+        # Evaluated inside the settlement, only collected here
+        round.achievements = await self.achievements.take_unlocked(ctx.author.id)
+        return True
+
+    async def render(self, ctx, round: Round) -> bool:
+        """Build the result embed from the plugin's fields"""
+        plugin, outcome = round.plugin, round.outcome
+        description, fields = plugin.render(round)
+        if RESULT not in fields:
+            fields = fields + [RESULT]
+
+        embed = discord.Embed(
+            title=f'{plugin.title} - {ctx.author.display_name}',
+            description=description,
+            color=discord.Color.green() if outcome.won else discord.Color.red()
+        )
+        for field in fields:
+            name, value, inline = (*plugin.result_field(round), False) if field is RESULT else field
+            embed.add_field(name=name, value=value, inline=inline)
+
+        # A first catch-up can unlock dozens, field values are capped at 1024 characters
+        chunks = []
+        for a in round.achievements:
+            line = f'{a.emoji} **{a.title}** (+{a.reward} 🪙)'
+            if chunks and len(chunks[-1]) + len(line) < FIELD_LIMIT:
+                chunks[-1] += '\n' + line
+            else:
+                chunks.append(line)
+        for i, chunk in enumerate(chunks):
+            embed.add_field(name='🏆 Conquistas Desbloqueadas!' if i == 0 else '\u200b', value=chunk, inline=False)
+        footer = f'Current balance: {round.user["coins"]:,} 🪙'
+        if round.fair is not None:
+            footer += f' | 🔐 Rodada #{round.fair.round_id} (/verify {round.fair.round_id})'
+        embed.set_footer(text=footer)
+        round.embed = embed
+        return True
+
+    async def announce(self, ctx, round: Round) -> bool:
+        await ctx.send(embed=round.embed)
+        return True
@@ -0,0 +1,143 @@
+"""Keyed locks with expiring leases"""
+
+import asyncio
+import os
+import socket
+import time
+import uuid
+from typing import Dict, Optional
+
+
+class Lease:
+    """Proof of holding a key, valid until expires_at"""
+
+    __slots__ = ('key', 'game', 'token', 'expires_at', 'lock')
+
+    def __init__(self, key: str, game: str, ttl: float, lock: asyncio.Lock):
+        self.key = key
+        self.game = game
+        self.token = uuid.uuid4().hex
+        self.expires_at = time.monotonic() + ttl
+        self.lock = lock
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at <= time.monotonic()
+
+
+class LeaseManager:
+    """
+    One asyncio lock per key, held through an expiring lease
+
+    Different keys never contend, the same key is strictly serialized. A
+    lease that outlives ttl (a game that crashed without releasing) is
+    taken over by the next caller, together with its lock so anyone
+    waiting on it keeps waiting behind the new holder. A key's lock is
+    dropped once nobody holds or waits for it. With db set, leases are
+    also recorded in the game_leases table so several bot processes
+    exclude each other.
+    """
+
+    def __init__(self, ttl: float = 600.0, db=None, owner: str = None):
+        """
+        Initialize the lease manager
+
+        Args:
+            ttl: Seconds before an unreleased lease can be taken over
+            db: AsyncDatabaseManager for the shared lease table (optional)
+            owner: Name recorded in the shared table, defaults to host:pid
+        """
+        self.ttl = ttl
+        self.db = db
+        self.owner = owner or f'{socket.gethostname()}:{os.getpid()}'
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._leases: Dict[str, Lease] = {}
+        # Callers waiting for each key's lock
+        self._waiting: Dict[str, int] = {}
+
+    def holder(self, key: str) -> Optional[str]:
+        """Game currently holding key, or None if it's free"""
+        lease = self._leases.get(key)
+        if lease is None or lease.expired:
+            return None
+        return lease.game
+
+    async def acquire(self, key: str, game: str, wait: float = 0.0) -> Optional[Lease]:
+        """
+        Take the lease on key
+
+        Returns None right away if someone else holds it, unless wait is
+        set, in which case it waits up to wait seconds for a release (or
+        for the holder's lease to expire).
+        """
+        lease = self._leases.get(key)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        if lease is not None and lease.expired:
+            # Take the stale holder's lock as it is, its release becomes a no-op
+            del self._leases[key]
+        elif lock.locked():
+            if wait <= 0:
+                return None
+            deadline = time.monotonic() + wait
+            self._waiting[key] = self._waiting.get(key, 0) + 1
+            try:
+                while True:
+                    holding = self._leases.get(key)
+                    if holding is not None and holding.expired:
+                        # Its holder never released it, take it over from the queue
+                        del self._leases[key]
+                        break
+                    left = deadline - time.monotonic()
+                    if left <= 0:
+                        return None
+                    if holding is not None:
+                        left = min(left, holding.expires_at - time.monotonic())
+                    try:
+                        await asyncio.wait_for(lock.acquire(), max(left, 0))
+                        break
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                self._waiting[key] -= 1
+                if not self._waiting[key]:
+                    del self._waiting[key]
+                self._forget(key, lock)
+        else:
+            # Never suspends on a free lock, so check-and-take is atomic
+            await lock.acquire()
+
+        lease = Lease(key, game, self.ttl, lock)
+        self._leases[key] = lease
+
+        if self.db is not None:
+            try:
+                shared = await self.db.acquire_lease(key, self.owner, lease.token, game, self.ttl)
+            except Exception as e:
+                print(f"Error acquiring shared lease {key}: {e}")
+                shared = False
+            if not shared:
+                self._drop(lease)
+                return None
+
+        return lease
+
+    def _drop(self, lease: Lease) -> bool:
+        if self._leases.get(lease.key) is not lease:
+            return False
+        del self._leases[lease.key]
+        lease.lock.release()
+        self._forget(lease.key, lease.lock)
+        return True
+
+    def _forget(self, key: str, lock: asyncio.Lock):
+        """Drop key's lock once it is free and nobody is waiting for it"""
+        if not lock.locked() and key not in self._waiting and self._locks.get(key) is lock:
+            del self._locks[key]
+
+    async def release(self, lease: Lease):
+        """Give a lease back (no-op if it already expired and was taken over)"""
+        if self._drop(lease) and self.db is not None:
+            try:
+                await self.db.release_lease(lease.key, lease.token)
+            except Exception as e:
+                print(f"Error releasing shared lease {lease.key}: {e}")
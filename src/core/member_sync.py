@@ -0,0 +1,95 @@
+"""Diff-based guild/member sync"""
+
+import asyncio
+import time
+from typing import Iterable, Set
+from src.database.async_db_manager import AsyncDatabaseManager
+
+
+class MemberSync:
+    """
+    Keeps guilds and guild_members in line with what Discord reports
+
+    For each guild the stored member set is loaded once and diffed against
+    the live member list in memory, then only the adds and removes are
+    written, in chunks of chunk_size rows per transaction. Syncs run as
+    background tasks so on_ready returns immediately.
+    """
+
+    def __init__(self, db: AsyncDatabaseManager, chunk_size: int = 500):
+        """Initialize the sync engine"""
+        self.db = db
+        self.chunk_size = chunk_size
+        self.stats = {
+            'guilds': 0,
+            'members': 0,
+            'added': 0,
+            'removed': 0,
+            'seconds': 0.0,
+            'running': False
+        }
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def sync_guild(self, guild) -> tuple:
+        """
+        Sync one guild
+
+        Returns:
+            tuple: (added, removed)
+        """
+        guild_id = guild.id
+        icon_url = str(guild.icon.url) if guild.icon else None
+        await self.db.update_guild(guild_id, guild.name, guild.member_count, icon_url)
+
+        current = {m.id: m.name for m in guild.members if not m.bot}
+        stored = await self.db.get_guild_member_ids(guild_id)
+
+        adds = [(user_id, current[user_id]) for user_id in current.keys() - stored]
+        removes = list(stored - current.keys())
+
+        for i in range(0, len(adds), self.chunk_size):
+            chunk = adds[i:i + self.chunk_size]
+            await self.db.bulk_add_guild_members(guild_id, chunk)
+            self.stats['added'] += len(chunk)
+
+        for i in range(0, len(removes), self.chunk_size):
+            chunk = removes[i:i + self.chunk_size]
+            await self.db.bulk_remove_guild_members(guild_id, chunk)
+            self.stats['removed'] += len(chunk)
+
+        self.stats['guilds'] += 1
+        self.stats['members'] += len(current)
+        return len(adds), len(removes)
+
+    async def sync_all(self, guilds: Iterable):
+        """Sync every guild, printing per-guild progress"""
+        guilds = list(guilds)
+        self.stats.update(guilds=0, members=0, added=0, removed=0, seconds=0.0, running=True)
+        start = time.perf_counter()
+
+        print(f'🔄 Syncing {len(guilds)} servers and members to database...')
+        try:
+            for index, guild in enumerate(guilds, 1):
+                try:
+                    added, removed = await self.sync_guild(guild)
+                    print(f'   [{index}/{len(guilds)}] Synced {guild.name}: +{added} -{removed}')
+                except Exception as e:
+                    print(f'   [{index}/{len(guilds)}] Error syncing {guild.name}: {e}')
+        finally:
+            self.stats['seconds'] = time.perf_counter() - start
+            self.stats['running'] = False
+
+        print(f'✅ Servers and members synced! ({self.stats["members"]} members, '
+              f'+{self.stats["added"]} -{self.stats["removed"]}, {self.stats["seconds"]:.2f}s)')
+
+    def start(self, guilds: Iterable) -> asyncio.Task:
+        """Run a sync in the background"""
+        task = asyncio.create_task(self.sync_all(guilds))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def stop(self):
+        """Cancel any sync still running"""
+        for task in list(self._tasks):
+            task.cancel()
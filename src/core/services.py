@@ -0,0 +1,85 @@
+"""Shared bot-level services"""
+
+import os
+from typing import Any, Callable, Dict, List, Optional
+from src.database.db_manager import DatabaseManager
+from src.database.async_db_manager import AsyncDatabaseManager
+from src.economy.economy_manager import EconomyManager
+from src.economy.leaderboard import LeaderboardService
+from src.economy.hold_sweeper import HoldSweeper
+from src.games import odds
+from .achievements import AchievementManager
+from .fairness import FairnessManager
+from .game_engine import GameEngine
+from .leases import LeaseManager
+from .member_sync import MemberSync
+
+
+class Services:
+    """
+    Registry of shared services, attached to the bot as bot.services
+
+    Each service is built once, on first access, and reused by every cog.
+    close() tears them down in the reverse order they were built.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry"""
+        self._factories: Dict[str, Callable[['Services'], Any]] = {}
+        self._closers: Dict[str, Optional[Callable[[Any], None]]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._built: List[str] = []
+
+    def register(self, name: str, factory: Callable[['Services'], Any],
+                 close: Callable[[Any], None] = None):
+        """Register a factory (and optional teardown) under a name"""
+        self._factories[name] = factory
+        self._closers[name] = close
+
+    def get(self, name: str) -> Any:
+        """Get a service, building it (and its dependencies) on first use"""
+        if name not in self._instances:
+            if name not in self._factories:
+                raise KeyError(f'Unknown service: {name}')
+            self._instances[name] = self._factories[name](self)
+            self._built.append(name)
+        return self._instances[name]
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self.get(name)
+        except KeyError as e:
+            raise AttributeError(name) from e
+
+    def close(self):
+        """Tear down every built service, most recently built first"""
+        while self._built:
+            name = self._built.pop()
+            instance = self._instances.pop(name)
+            closer = self._closers.get(name)
+            if closer:
+                try:
+                    closer(instance)
+                except Exception as e:
+                    print(f'Error closing service {name}: {e}')
+
+
+def build_services(db_path: str = 'data/macacolandia.db', shared_leases: bool = False) -> Services:
+    """Register the bot's standard services"""
+    services = Services()
+    # The async facade owns the DatabaseManager and closes it after draining
+    services.register('db', lambda s: AsyncDatabaseManager(DatabaseManager(db_path)), close=lambda db: db.close())
+    services.register('economy', lambda s: s.db.wrap(EconomyManager(s.db.sync)))
+    services.register('achievements', lambda s: s.db.wrap(AchievementManager(s.db.sync)))
+    services.register('leaderboards', lambda s: LeaderboardService(s.db.sync))
+    services.register('member_sync', lambda s: MemberSync(s.db), close=lambda sync: sync.stop())
+    services.register('hold_sweeper', lambda s: HoldSweeper(s.economy), close=lambda sweeper: sweeper.stop())
+    services.register('leases', lambda s: LeaseManager(db=s.db if shared_leases else None))
+    services.register('fairness', lambda s: s.db.wrap(FairnessManager(s.db.sync)))
+    services.register('game_engine', lambda s: GameEngine(s.economy, s.achievements, s.leases,
+                                                          fairness=s.fairness))
+    # Cached next to the database, where the webapp's /api/odds reads it
+    services.register('odds', lambda s: odds.load(os.path.join(os.path.dirname(db_path), 'odds.json')))
+    return services
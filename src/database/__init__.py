@@ -1,6 +1,7 @@
 """Database module for persistent storage"""
 
 from .db_manager import DatabaseManager
+from .pool import ConnectionPool
 from .models import User, Transaction, Achievement, GameHistory
 
-__all__ = ['DatabaseManager', 'User', 'Transaction', 'Achievement', 'GameHistory']
+__all__ = ['DatabaseManager', 'ConnectionPool', 'User', 'Transaction', 'Achievement', 'GameHistory']
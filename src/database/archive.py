@@ -0,0 +1,268 @@
+"""Monthly cold storage for old game_history and transactions rows"""
+
+import argparse
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from .pool import ConnectionPool
+
+# Tables whose old rows move to the archive, keeping their ids
+ARCHIVED_TABLES = ('game_history', 'transactions')
+# Code tables archived transactions rows refer to, copied whole into every month
+LOOKUP_TABLES = ('transaction_types', 'game_types')
+
+DAY = 86400
+
+
+def month_of(timestamp: int) -> str:
+    """'YYYY-MM' (UTC) of a unix timestamp"""
+    return time.strftime('%Y-%m', time.gmtime(timestamp))
+
+
+def month_bounds(month: str) -> Tuple[int, int]:
+    """Unix time range [start, end) of a 'YYYY-MM' month (UTC)"""
+    year, mon = map(int, month.split('-'))
+    start = datetime(year, mon, 1, tzinfo=timezone.utc)
+    end = datetime(year + mon // 12, mon % 12 + 1, 1, tzinfo=timezone.utc)
+    return int(start.timestamp()), int(end.timestamp())
+
+
+class ColdStorage:
+    """
+    Monthly archive files next to the hot database
+
+    archive/macacolandia-2025-03.db holds the game_history and
+    transactions rows of March 2025 moved out of macacolandia.db, with
+    the same schema, indexes and ids, so history queries run unchanged
+    against it. Each month is read through its own ConnectionPool.
+    """
+
+    def __init__(self, db_path: str, directory: str = None):
+        """
+        Initialize cold storage (files are opened lazily)
+
+        Args:
+            db_path: Path of the hot database
+            directory: Where the month files live, defaults to archive/ next to db_path
+        """
+        self.directory = directory or os.path.join(os.path.dirname(db_path), 'archive')
+        self.stem = os.path.splitext(os.path.basename(db_path))[0]
+        self._pattern = re.compile(rf'{re.escape(self.stem)}-(\d{{4}}-\d{{2}})\.db$')
+        self._lock = threading.Lock()
+        self._pools: Dict[str, ConnectionPool] = {}
+        # Listing of the directory as of its mtime, so an archiver process is picked up
+        self._listing: Tuple[Optional[int], List[str]] = (None, [])
+
+    def path(self, month: str) -> str:
+        """File of an archived month"""
+        return os.path.join(self.directory, f'{self.stem}-{month}.db')
+
+    def months(self) -> List[str]:
+        """Archived months, newest first"""
+        try:
+            mtime = os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            return []
+        listed_at, months = self._listing
+        if mtime != listed_at:
+            found = (self._pattern.match(name) for name in os.listdir(self.directory))
+            months = sorted((match.group(1) for match in found if match), reverse=True)
+            self._listing = (mtime, months)
+        return months
+
+    def connection(self, month: str) -> sqlite3.Connection:
+        """The calling thread's connection to an archived month"""
+        with self._lock:
+            pool = self._pools.get(month)
+            if pool is None:
+                pool = self._pools[month] = ConnectionPool(self.path(month))
+        return pool.get()
+
+    def close(self):
+        """Close every month's connections"""
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.close_all()
+
+
+class Archiver:
+    """
+    Moves game_history and transactions rows past a horizon into ColdStorage
+
+    Only whole months older than the horizon are archived, so a month
+    file is complete once written. Rows move in chunks: a chunk is first
+    committed to its month file (INSERT OR IGNORE on the kept id), then
+    deleted from the hot database on the writer. An interrupted run can
+    only leave rows in both places, and the next run finishes moving
+    them. The rollups stay in the hot database.
+    """
+
+    def __init__(self, db, horizon_days: int = 180, chunk_size: int = 5000):
+        """
+        Initialize the archiver
+
+        Args:
+            db: Database manager (deletes run on its writer)
+            horizon_days: Rows younger than this stay hot
+            chunk_size: Rows per hot-database delete transaction
+        """
+        self.db = db
+        self.storage = db.archive
+        self.horizon_days = horizon_days
+        self.chunk_size = chunk_size
+        self._files: Dict[str, sqlite3.Connection] = {}
+
+    def cutoff(self, now: float = None) -> int:
+        """Start of the month the horizon falls in, everything before it is archived"""
+        if now is None:
+            now = time.time()
+        return month_bounds(month_of(int(now) - self.horizon_days * DAY))[0]
+
+    def pending(self, cutoff: int) -> Dict[str, Dict[str, int]]:
+        """Rows that would be archived, table -> month -> rows"""
+        conn = self.db.get_connection()
+        report = {}
+        for table in ARCHIVED_TABLES:
+            cursor = conn.execute(f'''
+                SELECT strftime('%Y-%m', timestamp, 'unixepoch'), COUNT(*)
+                FROM {table}
+                WHERE timestamp < ?
+                GROUP BY 1
+            ''', (cutoff,))
+            report[table] = dict(cursor.fetchall())
+        return report
+
+    def _month_file(self, month: str) -> sqlite3.Connection:
+        """Open (creating if needed) a month file with the hot tables' schema"""
+        conn = self._files.get(month)
+        if conn is not None:
+            return conn
+
+        os.makedirs(self.storage.directory, exist_ok=True)
+        conn = sqlite3.connect(self.storage.path(month))
+        conn.execute('PRAGMA journal_mode = WAL')
+        hot = self.db.get_connection()
+        existing = {row[0] for row in conn.execute('SELECT name FROM sqlite_master')}
+        tables = ARCHIVED_TABLES + LOOKUP_TABLES
+        schema = hot.execute(f'''
+            SELECT name, sql FROM sqlite_master
+            WHERE tbl_name IN ({', '.join('?' * len(tables))}) AND sql IS NOT NULL
+            ORDER BY type = 'index'
+        ''', tables)
+        with conn:
+            for name, sql in schema.fetchall():
+                if name not in existing:
+                    conn.execute(sql)
+        self._files[month] = conn
+        return conn
+
+    def _copy_lookups(self, conn: sqlite3.Connection):
+        hot = self.db.get_connection()
+        for table in LOOKUP_TABLES:
+            rows = hot.execute(f'SELECT * FROM {table}').fetchall()
+            if rows:
+                conn.executemany(f"INSERT OR REPLACE INTO {table} VALUES ({', '.join('?' * len(rows[0]))})",
+                                 [tuple(row) for row in rows])
+
+    def _delete_chunk(self, table: str, ids: List[int], user_months: List[Tuple[int, str]]):
+        """Drop rows already committed to their month file, runs on the writer thread"""
+        with self.db.transaction() as cursor:
+            cursor.executemany('INSERT OR IGNORE INTO archived_months (user_id, month) VALUES (?, ?)', user_months)
+            cursor.executemany(f'DELETE FROM {table} WHERE id = ?', [(row_id,) for row_id in ids])
+
+    def _archive_table(self, table: str, cutoff: int) -> int:
+        hot = self.db.get_connection()
+        moved = 0
+        while True:
+            # Rows are inserted in time order, so the old ones sit at the start of the rowid range
+            rows = hot.execute(f'''
+                SELECT * FROM {table}
+                WHERE timestamp < ?
+                ORDER BY id
+                LIMIT ?
+            ''', (cutoff, self.chunk_size)).fetchall()
+            if not rows:
+                return moved
+
+            by_month: Dict[str, List[tuple]] = {}
+            user_months = set()
+            for row in rows:
+                month = month_of(row['timestamp'])
+                by_month.setdefault(month, []).append(tuple(row))
+                user_months.add((row['user_id'], month))
+            for month, month_rows in by_month.items():
+                conn = self._month_file(month)
+                with conn:
+                    if table == 'transactions':
+                        self._copy_lookups(conn)
+                    conn.executemany(f"INSERT OR IGNORE INTO {table} VALUES ({', '.join('?' * len(month_rows[0]))})",
+                                     month_rows)
+
+            self.db.writer.call(self._delete_chunk, table, [row['id'] for row in rows], list(user_months))
+            moved += len(rows)
+
+    def run(self, dry_run: bool = False) -> Dict[str, Dict[str, int]]:
+        """
+        Archive every whole month past the horizon
+
+        Returns:
+            dict: table -> month -> rows archived (or pending, for a dry run)
+        """
+        cutoff = self.cutoff()
+        report = self.pending(cutoff)
+        if dry_run:
+            return report
+        try:
+            for table in ARCHIVED_TABLES:
+                self._archive_table(table, cutoff)
+        finally:
+            for conn in self._files.values():
+                conn.close()
+            self._files = {}
+        return report
+
+
+def main():
+    """Archive old history from the command line"""
+    from .db_manager import DatabaseManager
+
+    parser = argparse.ArgumentParser(description='Move old game_history and transactions rows into monthly archive files')
+    parser.add_argument('--db', default='data/macacolandia.db', help='Path to the SQLite database')
+    parser.add_argument('--horizon-days', type=int, default=180, help='Keep rows younger than this in the hot database')
+    parser.add_argument('--chunk-size', type=int, default=5000, help='Rows per delete transaction')
+    parser.add_argument('--dry-run', action='store_true', help='Report what would be archived, move nothing')
+    parser.add_argument('--vacuum', action='store_true', help='VACUUM the hot database afterwards (stop the bot first)')
+    args = parser.parse_args()
+
+    db = DatabaseManager(args.db)
+    try:
+        archiver = Archiver(db, args.horizon_days, args.chunk_size)
+        start = time.perf_counter()
+        report = archiver.run(args.dry_run)
+        elapsed = time.perf_counter() - start
+
+        for table, months in report.items():
+            for month, rows in sorted(months.items()):
+                print(f'   {table:<14} {month}  {rows:>10,} rows')
+        rows = sum(sum(months.values()) for months in report.values())
+        verb = 'Would archive' if args.dry_run else 'Archived'
+        cutoff = time.strftime('%Y-%m-%d', time.gmtime(archiver.cutoff()))
+        print(f'✅ {verb} {rows:,} rows older than {cutoff} ({elapsed:.2f}s)')
+    finally:
+        db.close()
+
+    if args.vacuum and not args.dry_run:
+        conn = sqlite3.connect(args.db, isolation_level=None)
+        try:
+            conn.execute('VACUUM')
+        finally:
+            conn.close()
+
+
+if __name__ == '__main__':
+    main()
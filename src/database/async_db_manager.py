@@ -0,0 +1,83 @@
+"""Async facade over DatabaseManager"""
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+from .db_manager import DatabaseManager
+from . import read_memo
+
+
+class AsyncProxy:
+    """Exposes every method of a synchronous object as an awaitable run on the DB workers"""
+
+    def __init__(self, target: Any, runner: 'AsyncDatabaseManager'):
+        self._target = target
+        self._runner = runner
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+
+        if getattr(attr, 'db_write', False):
+            # Writes go straight onto the writer queue instead of tying up a reader
+            @functools.wraps(attr)
+            async def call(*args, **kwargs):
+                return await self._runner.write(attr, *args, **kwargs)
+        else:
+            @functools.wraps(attr)
+            async def call(*args, **kwargs):
+                return await self._runner.run(attr, *args, **kwargs)
+
+        # Cache the wrapper so later lookups skip __getattr__
+        setattr(self, name, call)
+        return call
+
+
+class AsyncDatabaseManager(AsyncProxy):
+    """
+    Mirrors the DatabaseManager API as awaitables
+
+    Reads are handed to a small pool of reader threads, each with its own
+    pooled connection, so sqlite I/O never runs on the event loop. Methods
+    marked @writes are queued on the DatabaseManager's single writer.
+    Inside a read memo (see read_memo) repeated @memoized reads are served
+    from it without leaving the event loop, and every write clears it.
+    """
+
+    def __init__(self, db: DatabaseManager = None, workers: int = 4):
+        """Initialize the facade and its reader threads"""
+        self.sync = db or DatabaseManager()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='db-reader')
+        super().__init__(self.sync, self)
+
+    async def run(self, func: Callable, *args, **kwargs):
+        """Run any blocking callable on the reader threads"""
+        if getattr(func, 'db_memoized', False):
+            result = read_memo.lookup(func.__name__, args, kwargs)
+            if result is not read_memo.MISSING:
+                return result
+
+        loop = asyncio.get_running_loop()
+        # Carry the caller's context (and its read memo) onto the reader thread
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self._executor, functools.partial(context.run, func, *args, **kwargs))
+
+    async def write(self, func: Callable, *args, **kwargs):
+        """Queue a callable on the writer thread and wait for its batch to commit"""
+        read_memo.invalidate()
+        try:
+            return await asyncio.wrap_future(self.sync.writer.submit(func, *args, **kwargs))
+        finally:
+            read_memo.invalidate()
+
+    def wrap(self, target: Any) -> AsyncProxy:
+        """Wrap another DB-backed object (e.g. EconomyManager) to share these threads"""
+        return AsyncProxy(target, self)
+
+    def close(self):
+        """Wait for pending calls, then close the underlying connections"""
+        self._executor.shutdown(wait=True)
+        self.sync.close()
@@ -0,0 +1,95 @@
+"""Write-behind buffer for audit rows (transactions and game_history)"""
+
+import threading
+import time
+from typing import Callable, List, Tuple
+
+
+def _timestamp() -> int:
+    """Current time as stored in the timestamp columns (unix epoch seconds)"""
+    return int(time.time())
+
+
+class AuditBuffer:
+    """
+    Collects audit rows in memory and writes them in batches
+
+    Rows are stamped when they are queued, so the stored timestamp is the
+    time of the bet, not the time of the flush. A background thread flushes
+    every flush_interval seconds, or sooner once max_rows rows are waiting.
+    write_rows(transactions, games) does the actual inserts in one
+    transaction; it must not be called back into from inside a flush.
+    """
+
+    def __init__(self, write_rows: Callable[[List[Tuple], List[Tuple]], None],
+                 flush_interval: float = 0.25, max_rows: int = 500):
+        """Initialize the buffer and start the flusher thread"""
+        self.write_rows = write_rows
+        self.flush_interval = flush_interval
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._transactions: List[Tuple] = []
+        self._games: List[Tuple] = []
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='db-audit-flush', daemon=True)
+        self._thread.start()
+
+    def add_transaction(self, user_id: int, amount: int, transaction_type: str, detail: str = None,
+                        game_type: str = None):
+        """Queue a transactions row"""
+        self._append(self._transactions, (user_id, amount, transaction_type, game_type, detail, _timestamp()))
+
+    def add_game(self, user_id: int, game_type: str, bet_amount: int, result: str, winnings: int):
+        """Queue a game_history row"""
+        self._append(self._games, (user_id, game_type, bet_amount, result, winnings, _timestamp()))
+
+    def _append(self, rows: List[Tuple], row: Tuple):
+        with self._lock:
+            rows.append(row)
+            pending = len(self._transactions) + len(self._games)
+        if pending >= self.max_rows:
+            self._wakeup.set()
+
+    def pending(self) -> int:
+        """Number of rows waiting to be written"""
+        with self._lock:
+            return len(self._transactions) + len(self._games)
+
+    def flush(self) -> int:
+        """Write all queued rows in one transaction, returns how many were written"""
+        with self._flush_lock:
+            with self._lock:
+                transactions, self._transactions = self._transactions, []
+                games, self._games = self._games, []
+
+            if not transactions and not games:
+                return 0
+
+            try:
+                self.write_rows(transactions, games)
+            except Exception:
+                # Put the rows back in front so the next flush retries them
+                with self._lock:
+                    self._transactions[:0] = transactions
+                    self._games[:0] = games
+                raise
+
+            return len(transactions) + len(games)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Error flushing audit rows: {e}")
+
+    def close(self):
+        """Stop the flusher thread and drain whatever is still queued"""
+        self._stopped.set()
+        self._wakeup.set()
+        self._thread.join()
+        self.flush()
@@ -0,0 +1,125 @@
+"""Bet settlement throughput under concurrent bettors: python -m src.database.bench"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+from src.economy.economy_manager import EconomyManager
+from .async_db_manager import AsyncDatabaseManager
+from .audit_buffer import AuditBuffer
+from .db_manager import DatabaseManager
+
+
+class InlineAudit(AuditBuffer):
+    """Writes audit rows as they are queued instead of behind the bet (no flusher thread)"""
+
+    def __init__(self, write_rows: Callable[[List[Tuple], List[Tuple]], None]):
+        self.write_rows = write_rows
+
+    def add_transaction(self, user_id: int, amount: int, transaction_type: str, detail: str = None,
+                        game_type: str = None):
+        self.write_rows([(user_id, amount, transaction_type, game_type, detail, int(time.time()))], [])
+
+    def add_game(self, user_id: int, game_type: str, bet_amount: int, result: str, winnings: int):
+        self.write_rows([], [(user_id, game_type, bet_amount, result, winnings, int(time.time()))])
+
+    def pending(self) -> int:
+        return 0
+
+    def flush(self) -> int:
+        return 0
+
+    def close(self):
+        pass
+
+
+def benchmark(bettors: int = 1000, bets: int = 5, max_batch: int = None,
+              write_behind: bool = True) -> Dict[str, float]:
+    """
+    Settle bets * bettors bets from that many concurrent tasks on a fresh database
+
+    Every bettor awaits process_bet through the AsyncDatabaseManager the
+    way the game cogs do. max_batch caps the writer's batch size, 1 is one
+    transaction per bet as before the single writer batched them. Without
+    write_behind the transactions and game_history rows are inserted inside
+    the bet's own transaction, as before the AuditBuffer.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        db = DatabaseManager(os.path.join(directory, 'bench.db'))
+        if max_batch is not None:
+            db.writer.max_batch = max_batch
+        if not write_behind:
+            db.audit.close()
+            db.audit = InlineAudit(db._write_audit_rows)
+            # Run after-commit hooks (the audit queueing among them) inside the bet's transaction
+            db._after_commit = lambda hook: hook()
+        conn = db.get_connection()
+        conn.executemany('INSERT INTO users (user_id, username, coins) VALUES (?, ?, ?)',
+                         [(user_id, f'bettor{user_id}', 10 ** 6) for user_id in range(1, bettors + 1)])
+        conn.commit()
+
+        async_db = AsyncDatabaseManager(db)
+        economy = async_db.wrap(EconomyManager(db))
+
+        async def bettor(user_id: int) -> int:
+            failed = 0
+            for _ in range(bets):
+                success, _, _ = await economy.process_bet(user_id, f'bettor{user_id}', 10, 'slots',
+                                                          random.random() < 0.5, 2.0)
+                failed += not success
+            return failed
+
+        async def run() -> int:
+            return sum(await asyncio.gather(*(bettor(user_id) for user_id in range(1, bettors + 1))))
+
+        try:
+            start = time.perf_counter()
+            failed = asyncio.run(run())
+            seconds = time.perf_counter() - start
+            # Until every audit row is on disk too
+            db.audit.flush()
+            flushed = time.perf_counter() - start
+            stats = dict(db.writer.stats)
+            rows = db.get_connection().execute(
+                'SELECT (SELECT COUNT(*) FROM transactions) + (SELECT COUNT(*) FROM game_history)'
+            ).fetchone()[0]
+        finally:
+            async_db.close()
+
+    return {
+        'bets': bettors * bets,
+        'failed': failed,
+        'seconds': seconds,
+        'bets_per_second': bettors * bets / seconds,
+        'flushed_seconds': flushed,
+        'audit_rows': rows,
+        'batches': stats['batches'],
+        'largest_batch': stats['largest_batch'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stress the database writer with concurrent bettors')
+    parser.add_argument('--bettors', type=int, default=1000, help='Concurrent bettors')
+    parser.add_argument('--bets', type=int, default=5, help='Bets per bettor')
+    parser.add_argument('--audit', choices=('both', 'behind', 'inline'), default='both',
+                        help='Audit rows written behind the bet (AuditBuffer), inside it, or compare both')
+    args = parser.parse_args()
+    audits = {'both': (False, True), 'behind': (True,), 'inline': (False,)}[args.audit]
+
+    print(f'{"writer":<10}{"audit":<8}{"bets":>8}{"failed":>8}{"seconds":>9}{"bets/s":>9}'
+          f'{"flushed":>9}{"rows":>8}{"batches":>9}{"largest":>9}')
+    for label, max_batch in (('per bet', 1), ('batched', None)):
+        for write_behind in audits:
+            result = benchmark(args.bettors, args.bets, max_batch, write_behind)
+            print(f'{label:<10}{"behind" if write_behind else "inline":<8}{result["bets"]:>8,}'
+                  f'{result["failed"]:>8,}{result["seconds"]:>9.2f}{result["bets_per_second"]:>9,.0f}'
+                  f'{result["flushed_seconds"]:>9.2f}{result["audit_rows"]:>8,}'
+                  f'{result["batches"]:>9,}{result["largest_batch"]:>9,}')
+
+
+if __name__ == '__main__':
+    main()
@@ -2,30 +2,162 @@
 
 import sqlite3
 import os
-from datetime import datetime
-from typing import Optional, List, Tuple
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Optional, List, Set, Tuple
+from .pool import ConnectionPool
+from .archive import ColdStorage, month_of
+from .audit_buffer import AuditBuffer
+from .migrations import migrate
+from .user_cache import UserCache
+from .writer import DatabaseWriter, Rollback, writes
+from .read_memo import memoized
+from .ids import snowflake
+from .ledger import GAME_ID, TYPE_ID
+from . import rollups
+
+# Coins reserved by a user's open holds, spendable balance is coins minus this
+HELD_COINS = '(SELECT COALESCE(SUM(amount), 0) FROM holds WHERE holds.user_id = users.user_id)'
+
+# Seconds between daily rewards
+DAY = 86400
 
 
 class DatabaseManager:
-    """Manages all database operations for the bot"""
+    """
+    Manages all database operations for the bot
+    
+    Reads run on the calling thread's pooled connection. Methods marked
+    @writes run on the single writer thread, batched into shared
+    transactions (see DatabaseWriter).
+    
+    User and guild IDs are INTEGER snowflakes and timestamps unix epoch
+    seconds (migration 7). Callers still passing str IDs keep working:
+    the INTEGER columns convert them in SQL, and the in-memory caches key
+    on snowflake().
+    """
     
     def __init__(self, db_path='data/macacolandia.db'):
         """Initialize database manager"""
         self.db_path = db_path
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.pool = ConnectionPool(self.db_path)
+        # Months of history moved out by the archiver (see archive.Archiver)
+        self.archive = ColdStorage(self.db_path)
+        self._tx = threading.local()
         self.init_database()
+        self.writer = DatabaseWriter(self)
+        # Audit rows are written behind, balance updates stay synchronous
+        self.audit = AuditBuffer(self._write_audit_rows)
+        # Every write path below publishes the user row it touched
+        self.cache = UserCache()
+        self._row_listeners: List[Callable] = [self.cache.put]
+        self._settle_hooks: List[Callable] = []
     
     def get_connection(self):
-        """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get this thread's persistent database connection"""
+        return self.pool.get()
+    
+    @contextmanager
+    def transaction(self, begin: Callable[[sqlite3.Connection], None] = None):
+        """
+        Reentrant transaction on this thread's connection
+        
+        The outermost level runs BEGIN IMMEDIATE ... COMMIT, nested levels
+        use SAVEPOINTs. Work registered with _after_commit only runs once the
+        outermost level has committed. Raising Rollback undoes the current
+        level without propagating.
+        """
+        conn = self.get_connection()
+        depth = getattr(self._tx, 'depth', 0)
+        
+        if depth == 0:
+            if begin:
+                begin(conn)
+            else:
+                conn.execute('BEGIN IMMEDIATE')
+            self._tx.hooks = [[]]
+        else:
+            conn.execute(f'SAVEPOINT sp{depth}')
+            self._tx.hooks.append([])
+        self._tx.depth = depth + 1
+        
+        try:
+            yield conn.cursor()
+        except BaseException as e:
+            self._tx.hooks.pop()
+            self._tx.depth = depth
+            if depth == 0:
+                conn.rollback()
+            else:
+                conn.execute(f'ROLLBACK TO sp{depth}')
+                conn.execute(f'RELEASE sp{depth}')
+            if not isinstance(e, Rollback):
+                raise
+        else:
+            hooks = self._tx.hooks.pop()
+            self._tx.depth = depth
+            if depth == 0:
+                try:
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                for hook in hooks:
+                    hook()
+            else:
+                conn.execute(f'RELEASE sp{depth}')
+                self._tx.hooks[-1].extend(hooks)
+    
+    def _after_commit(self, hook: Callable[[], None]):
+        """Run hook once the current transaction commits (immediately if there is none)"""
+        if getattr(self._tx, 'depth', 0):
+            self._tx.hooks[-1].append(hook)
+        else:
+            hook()
+    
+    def add_row_listener(self, listener: Callable[[sqlite3.Row, Optional[str]], None]):
+        """Call listener(row, guild_id) whenever a users/guild_coins row changes"""
+        self._row_listeners.append(listener)
+    
+    def _row_changed(self, row: Optional[sqlite3.Row], guild_id: int = None):
+        """Publish a user row a write path changed, once its transaction commits"""
+        if row is None:
+            return
+        self._after_commit(lambda: self._notify_row_listeners(row, guild_id))
+    
+    def add_settle_hook(self, hook: Callable[[sqlite3.Row], None]):
+        """Call hook(user row) inside the transaction of every settled global bet"""
+        self._settle_hooks.append(hook)
+    
+    def _settled(self, user: Optional[sqlite3.Row]):
+        if user is None:
+            return
+        for hook in self._settle_hooks:
+            hook(user)
+    
+    def _notify_row_listeners(self, row: sqlite3.Row, guild_id: int = None):
+        for listener in self._row_listeners:
+            try:
+                listener(row, guild_id)
+            except Exception as e:
+                print(f"Error in row listener: {e}")
+    
+    def close(self):
+        """Drain queued audit rows and writes, then close all pooled connections"""
+        self.audit.close()
+        self.writer.close()
+        self.pool.close_all()
+        self.archive.close()
     
     def init_database(self):
         """Initialize database tables"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
+        # Baseline schema, migrate() brings it up to date (IDs and
+        # timestamps become INTEGER in migration 7)
         # Users table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS users (
@@ -42,12 +174,6 @@ class DatabaseManager:
             )
         ''')
         
-        # Add games_won column if it doesn't exist (for existing databases)
-        cursor.execute("PRAGMA table_info(users)")
-        columns = [column[1] for column in cursor.fetchall()]
-        if 'games_won' not in columns:
-            cursor.execute('ALTER TABLE users ADD COLUMN games_won INTEGER DEFAULT 0')
-        
         # Transactions table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS transactions (
@@ -129,38 +255,37 @@ class DatabaseManager:
         ''')
         
         conn.commit()
-        conn.close()
+        
+        # Column changes and indexes live in versioned migrations
+        migrate(conn)
     
     # Guild operations
-    def update_guild(self, guild_id: str, name: str, member_count: int, icon_url: str = None):
+    @writes
+    def update_guild(self, guild_id: int, name: str, member_count: int, icon_url: str = None):
         """Update or insert guild information"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
         cursor.execute('''
             INSERT INTO guilds (guild_id, name, member_count, icon_url, joined_at)
-            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            VALUES (?, ?, ?, ?, unixepoch())
             ON CONFLICT(guild_id) DO UPDATE SET
                 name = excluded.name,
                 member_count = excluded.member_count,
                 icon_url = excluded.icon_url
-        ''', (str(guild_id), name, member_count, icon_url))
-        
-        conn.commit()
-        conn.close()
+        ''', (snowflake(guild_id), name, member_count, icon_url))
 
-    def remove_guild(self, guild_id: str):
+    @writes
+    def remove_guild(self, guild_id: int):
         """Remove a guild from the database"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('DELETE FROM guilds WHERE guild_id = ?', (str(guild_id),))
-        cursor.execute('DELETE FROM guild_members WHERE guild_id = ?', (str(guild_id),))
-        
-        conn.commit()
-        conn.close()
+        cursor.execute('DELETE FROM guilds WHERE guild_id = ?', (snowflake(guild_id),))
+        cursor.execute('DELETE FROM guild_members WHERE guild_id = ?', (snowflake(guild_id),))
 
-    def add_guild_member(self, guild_id: str, user_id: str):
+    @writes
+    def add_guild_member(self, guild_id: int, user_id: int):
         """Add a member to a guild"""
         conn = self.get_connection()
         cursor = conn.cursor()
@@ -171,21 +296,51 @@ class DatabaseManager:
         cursor.execute('''
             INSERT OR IGNORE INTO guild_members (guild_id, user_id)
             VALUES (?, ?)
-        ''', (str(guild_id), str(user_id)))
-        
-        conn.commit()
-        conn.close()
+        ''', (snowflake(guild_id), snowflake(user_id)))
 
-    def remove_guild_member(self, guild_id: str, user_id: str):
+    @writes
+    def remove_guild_member(self, guild_id: int, user_id: int):
         """Remove a member from a guild"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
         cursor.execute('DELETE FROM guild_members WHERE guild_id = ? AND user_id = ?', 
-                      (str(guild_id), str(user_id)))
+                      (snowflake(guild_id), snowflake(user_id)))
+
+    def get_guild_member_ids(self, guild_id: int) -> Set[int]:
+        """Get the user IDs currently stored for a guild"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
         
-        conn.commit()
-        conn.close()
+        cursor.execute('SELECT user_id FROM guild_members WHERE guild_id = ?', (snowflake(guild_id),))
+        
+        return {row['user_id'] for row in cursor.fetchall()}
+
+    @writes
+    def bulk_add_guild_members(self, guild_id: int, members: List[Tuple[int, str]]):
+        """Add many (user_id, username) members to a guild in one transaction"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        # Ensure users exist first
+        cursor.executemany('''
+            INSERT OR IGNORE INTO users (user_id, username, coins)
+            VALUES (?, ?, 0)
+        ''', [(snowflake(user_id), username or 'Unknown') for user_id, username in members])
+        
+        cursor.executemany('''
+            INSERT OR IGNORE INTO guild_members (guild_id, user_id)
+            VALUES (?, ?)
+        ''', [(snowflake(guild_id), snowflake(user_id)) for user_id, _ in members])
+
+    @writes
+    def bulk_remove_guild_members(self, guild_id: int, user_ids: List[int]):
+        """Remove many members from a guild in one transaction"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.executemany('DELETE FROM guild_members WHERE guild_id = ? AND user_id = ?',
+                           [(snowflake(guild_id), snowflake(user_id)) for user_id in user_ids])
 
     def get_all_guilds(self) -> List[sqlite3.Row]:
         """Get all guilds"""
@@ -195,12 +350,16 @@ class DatabaseManager:
         cursor.execute('SELECT * FROM guilds ORDER BY member_count DESC')
         
         guilds = cursor.fetchall()
-        conn.close()
         return guilds
 
     # User operations
-    def get_user(self, user_id: str, username: str = None, guild_id: str = None) -> sqlite3.Row:
+    @memoized
+    def get_user(self, user_id: int, username: str = None, guild_id: int = None) -> sqlite3.Row:
         """Get or create a user (with guild-specific balance if guild_id provided)"""
+        cached = self.cache.get(user_id, guild_id)
+        if cached is not None:
+            return cached
+        
         conn = self.get_connection()
         cursor = conn.cursor()
         
@@ -208,87 +367,95 @@ class DatabaseManager:
         user = cursor.fetchone()
         
         if not user:
-            cursor.execute('''
-                INSERT INTO users (user_id, username, coins)
-                VALUES (?, ?, 0)
-            ''', (user_id, username or 'Unknown'))
-            conn.commit()
-            cursor.execute('SELECT * FROM users WHERE user_id = ?', (user_id,))
-            user = cursor.fetchone()
+            return self._create_user(user_id, username, guild_id)
+        
+        self.cache.fill(user)
         
         # If guild_id provided, get guild-specific balance
         if guild_id:
             cursor.execute('''
                 SELECT * FROM guild_coins WHERE guild_id = ? AND user_id = ?
-            ''', (str(guild_id), user_id))
+            ''', (snowflake(guild_id), user_id))
             guild_coins = cursor.fetchone()
             
             if not guild_coins:
-                # Initialize guild-specific balance
-                cursor.execute('''
-                    INSERT INTO guild_coins (guild_id, user_id, coins)
-                    VALUES (?, ?, 1000)
-                ''', (str(guild_id), user_id))
-                conn.commit()
-                cursor.execute('''
-                    SELECT * FROM guild_coins WHERE guild_id = ? AND user_id = ?
-                ''', (str(guild_id), user_id))
-                guild_coins = cursor.fetchone()
+                return self._create_user(user_id, username, guild_id)
             
             # Return guild-specific data merged with user data
-            conn.close()
+            self.cache.fill(guild_coins, guild_id)
+            return guild_coins
+        
+        return user
+    
+    @writes
+    def _create_user(self, user_id: int, username: str = None, guild_id: int = None) -> sqlite3.Row:
+        """Create whatever rows get_user found missing and return the requested one"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT OR IGNORE INTO users (user_id, username, coins)
+            VALUES (?, ?, 0)
+        ''', (user_id, username or 'Unknown'))
+        cursor.execute('SELECT * FROM users WHERE user_id = ?', (user_id,))
+        user = cursor.fetchone()
+        self._row_changed(user)
+        
+        if guild_id:
+            # Initialize guild-specific balance
+            cursor.execute('''
+                INSERT OR IGNORE INTO guild_coins (guild_id, user_id, coins)
+                VALUES (?, ?, 1000)
+            ''', (snowflake(guild_id), user_id))
+            cursor.execute('''
+                SELECT * FROM guild_coins WHERE guild_id = ? AND user_id = ?
+            ''', (snowflake(guild_id), user_id))
+            guild_coins = cursor.fetchone()
+            self._row_changed(guild_coins, guild_id)
             return guild_coins
         
-        conn.close()
         return user
     
-    def update_coins(self, user_id: str, amount: int, guild_id: str = None) -> bool:
+    @writes
+    def update_coins(self, user_id: int, amount: int, guild_id: int = None) -> bool:
         """Update user coins (can be negative for deduction) - guild-specific if guild_id provided"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
+        # Apply only if the row exists and the balance stays non-negative
         if guild_id:
             # Update guild-specific balance
-            cursor.execute('SELECT coins FROM guild_coins WHERE guild_id = ? AND user_id = ?', 
-                          (str(guild_id), user_id))
-            user = cursor.fetchone()
-            
-            if not user:
-                conn.close()
-                return False
-            
-            new_balance = user['coins'] + amount
-            if new_balance < 0:
-                conn.close()
-                return False
-            
-            cursor.execute('UPDATE guild_coins SET coins = ? WHERE guild_id = ? AND user_id = ?', 
-                          (new_balance, str(guild_id), user_id))
+            cursor.execute('''
+                UPDATE guild_coins SET coins = coins + ?
+                WHERE guild_id = ? AND user_id = ? AND coins + ? >= 0
+                RETURNING *
+            ''', (amount, snowflake(guild_id), user_id, amount))
         else:
             # Update global balance (for legacy compatibility)
-            cursor.execute('SELECT coins FROM users WHERE user_id = ?', (user_id,))
-            user = cursor.fetchone()
-            
-            if not user:
-                conn.close()
-                return False
-            
-            new_balance = user['coins'] + amount
-            if new_balance < 0:
-                conn.close()
-                return False
-            
-            cursor.execute('UPDATE users SET coins = ? WHERE user_id = ?', (new_balance, user_id))
+            cursor.execute(f'''
+                UPDATE users SET coins = coins + ?
+                WHERE user_id = ? AND coins - {HELD_COINS} + ? >= 0
+                RETURNING *
+            ''', (amount, user_id, amount))
         
-        conn.commit()
-        conn.close()
+        user = cursor.fetchone()
+        
+        if not user:
+            return False
+        
+        self._row_changed(user, guild_id)
         return True
     
-    def process_bet_atomic(self, user_id: str, bet_amount: int, net_change: int, 
-                          game_type: str, won: bool, guild_id: str = None) -> bool:
+    @writes
+    def process_bet_atomic(self, user_id: int, bet_amount: int, net_change: int,
+                          game_type: str, won: bool, guild_id: int = None,
+                          username: str = None) -> Optional[sqlite3.Row]:
         """
         Process a bet atomically in a single transaction (guild-specific if guild_id provided)
-        This prevents race conditions when multiple users play simultaneously
+        
+        Balance check, debit/credit and stats happen in one conditional UPDATE
+        on the writer thread, so concurrent bets can't interleave between
+        the check and the write.
         
         Args:
             user_id: User identifier
@@ -297,113 +464,84 @@ class DatabaseManager:
             game_type: Type of game played
             won: Whether the user won
             guild_id: Guild ID for server-specific balance
+            username: Username used if the user has to be created
         
         Returns:
-            bool: True if successful, False if insufficient balance or error
+            sqlite3.Row: The user row after settlement, or None if insufficient balance or error
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        stats = (net_change, 1 if won else 0, max(0, net_change), max(0, -net_change))
+        user = None
         
         try:
-            # Check current balance (guild-specific if guild_id provided)
-            if guild_id:
-                cursor.execute('SELECT coins FROM guild_coins WHERE guild_id = ? AND user_id = ?', 
-                              (str(guild_id), user_id))
-                user = cursor.fetchone()
-                
-                if not user:
-                    # Initialize if doesn't exist
+            with self.transaction() as cursor:
+                # Settle balance and stats in one statement (guild-specific or global)
+                if guild_id:
                     cursor.execute('''
-                        INSERT INTO guild_coins (guild_id, user_id, coins)
+                        INSERT OR IGNORE INTO guild_coins (guild_id, user_id, coins)
                         VALUES (?, ?, 1000)
-                    ''', (str(guild_id), user_id))
-                    conn.commit()
-                    cursor.execute('SELECT coins FROM guild_coins WHERE guild_id = ? AND user_id = ?', 
-                                  (str(guild_id), user_id))
-                    user = cursor.fetchone()
-            else:
-                cursor.execute('SELECT coins FROM users WHERE user_id = ?', (user_id,))
+                    ''', (snowflake(guild_id), user_id))
+                    cursor.execute('''
+                        UPDATE guild_coins
+                        SET coins = coins + ?,
+                            games_played = games_played + 1,
+                            games_won = games_won + ?,
+                            total_won = total_won + ?,
+                            total_lost = total_lost + ?
+                        WHERE guild_id = ? AND user_id = ? AND coins >= ? AND coins + ? >= 0
+                        RETURNING *
+                    ''', stats + (snowflake(guild_id), user_id, bet_amount, net_change))
+                else:
+                    cursor.execute('''
+                        INSERT OR IGNORE INTO users (user_id, username, coins)
+                        VALUES (?, ?, 0)
+                    ''', (user_id, username or 'Unknown'))
+                    cursor.execute(f'''
+                        UPDATE users
+                        SET coins = coins + ?,
+                            games_played = games_played + 1,
+                            games_won = games_won + ?,
+                            total_won = total_won + ?,
+                            total_lost = total_lost + ?
+                        WHERE user_id = ? AND coins - {HELD_COINS} >= ?
+                          AND coins - {HELD_COINS} + ? >= 0
+                        RETURNING *
+                    ''', stats + (user_id, bet_amount, net_change))
+                
                 user = cursor.fetchone()
+                if not user:
+                    # Insufficient balance
+                    raise Rollback()
+                
+                # Per-game aggregates settle together with the balance
+                rollups.record_bet(cursor, user_id, game_type, bet_amount, net_change, won, guild_id)
+                self._row_changed(user, guild_id)
+                if not guild_id:
+                    # Achievements unlock in the same transaction as the bet
+                    self._settled(user)
+                # Audit rows are only queued once the balance change has committed
+                self._after_commit(lambda: self._queue_bet_audit(user_id, bet_amount, net_change, game_type, won))
             
-            if not user:
-                conn.close()
-                return False
-            
-            current_balance = user['coins']
-            
-            # Check if user can afford the bet
-            if current_balance < bet_amount:
-                conn.close()
-                return False
-            
-            # Calculate new balance (deduct bet, add winnings if won)
-            new_balance = current_balance + net_change
-            
-            # Ensure balance doesn't go negative
-            if new_balance < 0:
-                conn.close()
-                return False
-            
-            # Update balance (guild-specific or global)
-            if guild_id:
-                cursor.execute('UPDATE guild_coins SET coins = ? WHERE guild_id = ? AND user_id = ?', 
-                              (new_balance, str(guild_id), user_id))
-            else:
-                cursor.execute('UPDATE users SET coins = ? WHERE user_id = ?', (new_balance, user_id))
-            
-            # Record transactions
-            cursor.execute('''
-                INSERT INTO transactions (user_id, amount, transaction_type, description)
-                VALUES (?, ?, 'spend', ?)
-            ''', (user_id, -bet_amount, f'{game_type} - Aposta'))
-            
-            if won and net_change > 0:
-                winnings = bet_amount + net_change
-                cursor.execute('''
-                    INSERT INTO transactions (user_id, amount, transaction_type, description)
-                    VALUES (?, ?, 'earn', ?)
-                ''', (user_id, winnings, f'{game_type} - Vitória'))
-            
-            # Record game history
-            result_str = 'win' if won else 'loss'
-            cursor.execute('''
-                INSERT INTO game_history (user_id, game_type, bet_amount, result, winnings)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (user_id, game_type, bet_amount, result_str, net_change))
-            
-            # Update user stats (guild-specific or global)
-            if guild_id:
-                cursor.execute('''
-                    UPDATE guild_coins 
-                    SET games_played = games_played + 1,
-                        games_won = games_won + ?,
-                        total_won = total_won + ?,
-                        total_lost = total_lost + ?
-                    WHERE guild_id = ? AND user_id = ?
-                ''', (1 if won else 0, max(0, net_change), max(0, -net_change), str(guild_id), user_id))
-            else:
-                cursor.execute('''
-                    UPDATE users 
-                    SET games_played = games_played + 1,
-                        games_won = games_won + ?,
-                        total_won = total_won + ?,
-                        total_lost = total_lost + ?
-                    WHERE user_id = ?
-                ''', (1 if won else 0, max(0, net_change), max(0, -net_change), user_id))
-            
-            # Commit all changes atomically
-            conn.commit()
-            conn.close()
-            return True
-            
+            return user
+        
         except Exception as e:
-            # Rollback on any error
-            conn.rollback()
-            conn.close()
             print(f"Error in process_bet_atomic: {e}")
-            return False
+            return None
+    
+    def _queue_bet_audit(self, user_id: int, bet_amount: int, net_change: int, game_type: str, won: bool):
+        """Queue the transactions and game_history rows for a settled bet"""
+        # Record transactions
+        self.audit.add_transaction(user_id, -bet_amount, 'spend', game_type=game_type)
+        
+        if won and net_change > 0:
+            winnings = bet_amount + net_change
+            self.audit.add_transaction(user_id, winnings, 'earn', game_type=game_type)
+        
+        # Record game history
+        result_str = 'win' if won else 'loss'
+        self.audit.add_game(user_id, game_type, bet_amount, result_str, net_change)
     
-    def transfer_coins(self, from_user: str, to_user: str, amount: int) -> Tuple[bool, str]:
+    @writes
+    def transfer_coins(self, from_user: int, to_user: int, amount: int) -> Tuple[bool, str]:
         """Transfer coins between users"""
         if amount <= 0:
             return False, "Quantidade inválida!"
@@ -411,75 +549,147 @@ class DatabaseManager:
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        # Check sender balance
-        cursor.execute('SELECT coins FROM users WHERE user_id = ?', (from_user,))
+        # Check sender balance (coins held by running games can't be sent)
+        cursor.execute(f'SELECT coins - {HELD_COINS} AS available FROM users WHERE user_id = ?', (from_user,))
         sender = cursor.fetchone()
         
-        if not sender or sender['coins'] < amount:
-            conn.close()
+        if not sender or sender['available'] < amount:
             return False, "Saldo insuficiente!"
         
         # Update both users
-        cursor.execute('UPDATE users SET coins = coins - ? WHERE user_id = ?', (amount, from_user))
-        cursor.execute('UPDATE users SET coins = coins + ? WHERE user_id = ?', (amount, to_user))
-        
-        # Log transactions
-        cursor.execute('''
-            INSERT INTO transactions (user_id, amount, transaction_type, description)
-            VALUES (?, ?, 'transfer_out', ?)
-        ''', (from_user, -amount, f'Transferência para {to_user}'))
-        
-        cursor.execute('''
-            INSERT INTO transactions (user_id, amount, transaction_type, description)
-            VALUES (?, ?, 'transfer_in', ?)
-        ''', (to_user, amount, f'Transferência de {from_user}'))
-        
-        conn.commit()
-        conn.close()
+        cursor.execute('UPDATE users SET coins = coins - ? WHERE user_id = ? RETURNING *', (amount, from_user))
+        sender = cursor.fetchone()
+        cursor.execute('UPDATE users SET coins = coins + ? WHERE user_id = ? RETURNING *', (amount, to_user))
+        receiver = cursor.fetchone()
+        
+        # Log transactions (detail is the other party, see ledger.DETAIL_TEMPLATES)
+        cursor.execute(f'''
+            INSERT INTO transactions (user_id, amount, type_id, detail)
+            VALUES (?, ?, {TYPE_ID}, ?)
+        ''', (from_user, -amount, 'transfer_out', str(to_user)))
+        
+        cursor.execute(f'''
+            INSERT INTO transactions (user_id, amount, type_id, detail)
+            VALUES (?, ?, {TYPE_ID}, ?)
+        ''', (to_user, amount, 'transfer_in', str(from_user)))
+        
+        self._row_changed(sender)
+        self._row_changed(receiver)
         return True, "Transferência realizada com sucesso!"
     
-    def add_transaction(self, user_id: str, amount: int, transaction_type: str, description: str = None):
-        """Add a transaction record"""
+    def add_transaction(self, user_id: int, amount: int, transaction_type: str, detail: str = None,
+                        game_type: str = None):
+        """Add a transaction record (queued, see AuditBuffer and ledger.describe)"""
+        self._after_commit(lambda: self.audit.add_transaction(user_id, amount, transaction_type, detail, game_type))
+    
+    @writes
+    def _write_audit_rows(self, transactions: List[Tuple], games: List[Tuple]):
+        """Insert a batch of queued audit rows (called by AuditBuffer)"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            INSERT INTO transactions (user_id, amount, transaction_type, description)
-            VALUES (?, ?, ?, ?)
-        ''', (user_id, amount, transaction_type, description))
-        
-        conn.commit()
-        conn.close()
+        # Names seen for the first time get their code here
+        cursor.executemany('INSERT OR IGNORE INTO transaction_types (name) VALUES (?)',
+                           [(name,) for name in {row[2] for row in transactions}])
+        cursor.executemany('INSERT OR IGNORE INTO game_types (name) VALUES (?)',
+                           [(name,) for name in {row[3] for row in transactions} if name is not None])
+        cursor.executemany(f'''
+            INSERT INTO transactions (user_id, amount, type_id, game_id, detail, timestamp)
+            VALUES (?, ?, {TYPE_ID}, {GAME_ID}, ?, ?)
+        ''', transactions)
+        cursor.executemany('''
+            INSERT INTO game_history (user_id, game_type, bet_amount, result, winnings, timestamp)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', games)
     
-    def get_transaction_history(self, user_id: str, limit: int = 10) -> List[sqlite3.Row]:
-        """Get user transaction history"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    def get_transaction_history(self, user_id: int, limit: int = 10, before: Optional[Tuple[int, int]] = None,
+                                transaction_type: str = None, game_type: str = None) -> List[sqlite3.Row]:
+        """
+        Get user transaction history, newest first (older pages read archived months)
         
-        cursor.execute('''
-            SELECT * FROM transactions
-            WHERE user_id = ?
-            ORDER BY timestamp DESC
+        Rows carry transaction_type and game_type names and the raw detail,
+        ledger.describe() renders them.
+        
+        Args:
+            user_id: User ID
+            limit: Maximum rows to return
+            before: Keyset cursor (timestamp, id) of the last row already shown
+            transaction_type: Only this type of transaction
+            game_type: Only bets and payouts of this game
+        """
+        self.audit.flush()
+        return self._history_page('''
+            SELECT t.id, t.user_id, t.amount, tt.name AS transaction_type,
+                   g.name AS game_type, t.detail, t.timestamp
+            FROM transactions t
+            JOIN transaction_types tt USING (type_id)
+            LEFT JOIN game_types g USING (game_id)
+            WHERE {where}
+            ORDER BY t.timestamp DESC, t.id DESC
             LIMIT ?
-        ''', (user_id, limit))
+        ''', user_id, limit, before, [
+            (f'type_id = {TYPE_ID}', transaction_type),
+            (f'game_id = {GAME_ID}', game_type),
+        ])
+    
+    def _history_page(self, query: str, user_id: int, limit: int, before: Optional[Tuple[int, int]],
+                      filters: List[Tuple[str, Any]]) -> List[sqlite3.Row]:
+        """
+        Run a keyset history query ({where} placeholder) on the hot database
         
-        transactions = cursor.fetchall()
-        conn.close()
-        return transactions
+        Only a page the hot rows can't fill falls through to the archived
+        months holding the user's rows, newest first, skipping months newer
+        than the cursor.
+        """
+        conn = self.get_connection()
+        where, params = self._history_filter(user_id, before, filters)
+        rows = conn.execute(query.format(where=where), (*params, limit)).fetchall()
+        if len(rows) >= limit:
+            return rows
+        
+        if rows:
+            before = (rows[-1]['timestamp'], rows[-1]['id'])
+        months = conn.execute('''
+            SELECT month FROM archived_months
+            WHERE user_id = ? AND month <= ?
+            ORDER BY month DESC
+        ''', (user_id, month_of(before[0]) if before else '9999-12')).fetchall()
+        for (month,) in months:
+            where, params = self._history_filter(user_id, before, filters)
+            rows += self.archive.connection(month).execute(query.format(where=where),
+                                                           (*params, limit - len(rows))).fetchall()
+            if len(rows) >= limit:
+                break
+            if rows:
+                before = (rows[-1]['timestamp'], rows[-1]['id'])
+        return rows
+    
+    @staticmethod
+    def _history_filter(user_id: int, before: Optional[Tuple[int, int]],
+                        filters: List[Tuple[str, Any]]) -> Tuple[str, list]:
+        """
+        WHERE clause of a keyset history page, a range read on (user_id[, filter column], timestamp, id)
+        
+        filters are (condition with one ?, value) pairs, skipped when value is None.
+        """
+        where, params = ['user_id = ?'], [user_id]
+        for condition, value in filters:
+            if value is not None:
+                where.append(condition)
+                params.append(value)
+        if before is not None:
+            where.append('(timestamp, id) < (?, ?)')
+            params.extend(before)
+        return ' AND '.join(where), params
     
     # Game operations
-    def record_game(self, user_id: str, game_type: str, bet_amount: int, 
-                   result: str, winnings: int):
-        """Record a game result"""
+    @writes
+    def record_game(self, user_id: int, game_type: str, bet_amount: int, 
+                   result: str, winnings: int) -> Optional[sqlite3.Row]:
+        """Record a game result and return the updated user row"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        # Record game history
-        cursor.execute('''
-            INSERT INTO game_history (user_id, game_type, bet_amount, result, winnings)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (user_id, game_type, bet_amount, result, winnings))
-        
         # Update user stats
         cursor.execute('''
             UPDATE users 
@@ -487,26 +697,91 @@ class DatabaseManager:
                 total_won = total_won + ?,
                 total_lost = total_lost + ?
             WHERE user_id = ?
+            RETURNING *
         ''', (max(0, winnings), max(0, -winnings), user_id))
+        user = cursor.fetchone()
+        rollups.record_bet(cursor, user_id, game_type, bet_amount, winnings, result == 'win')
+        self._row_changed(user)
+        self._settled(user)
         
-        conn.commit()
-        conn.close()
+        # Record game history
+        self._after_commit(lambda: self.audit.add_game(user_id, game_type, bet_amount, result, winnings))
+        return user
+    
+    def get_game_history(self, user_id: int, limit: int = 10, before: Optional[Tuple[int, int]] = None,
+                         game_type: str = None) -> List[sqlite3.Row]:
+        """
+        Get user game history, newest first (older pages read archived months)
+        
+        Args:
+            user_id: User ID
+            limit: Maximum rows to return
+            before: Keyset cursor (timestamp, id) of the last row already shown
+            game_type: Only this game
+        """
+        self.audit.flush()
+        return self._history_page('''
+            SELECT * FROM game_history
+            WHERE {where}
+            ORDER BY timestamp DESC, id DESC
+            LIMIT ?
+        ''', user_id, limit, before, [('game_type = ?', game_type)])
     
-    def get_game_history(self, user_id: str, limit: int = 10) -> List[sqlite3.Row]:
-        """Get user game history"""
+    def get_game_stats(self, game_type: str = None, guild_id: int = None) -> List[sqlite3.Row]:
+        """Get per-game totals from the daily rollups (guild_id 0 is the global balance)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        conditions = []
+        params = []
+        if game_type:
+            conditions.append('game_type = ?')
+            params.append(game_type)
+        if guild_id is not None:
+            conditions.append('guild_id = ?')
+            params.append(snowflake(guild_id))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        
+        cursor.execute(f'''
+            SELECT game_type,
+                   SUM(bets) AS bets,
+                   SUM(wins) AS wins,
+                   SUM(wagered) AS wagered,
+                   SUM(paid_out) AS paid_out,
+                   SUM(paid_out) - SUM(wagered) AS net
+            FROM game_stats_daily
+            {where}
+            GROUP BY game_type
+            ORDER BY bets DESC
+        ''', params)
+        
+        return cursor.fetchall()
+    
+    @memoized
+    def get_user_game_stats(self, user_id: int) -> List[sqlite3.Row]:
+        """Get a user's per-game totals"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
         cursor.execute('''
-            SELECT * FROM game_history
+            SELECT * FROM user_game_stats
             WHERE user_id = ?
-            ORDER BY timestamp DESC
-            LIMIT ?
-        ''', (user_id, limit))
+            ORDER BY bets DESC
+        ''', (user_id,))
         
-        games = cursor.fetchall()
-        conn.close()
-        return games
+        return cursor.fetchall()
+    
+    def rebuild_game_stats(self) -> Tuple[int, int]:
+        """Rebuild the global rollups from game_history and its archive (guild rows are kept), returns rows per table"""
+        # Flush from here, the writer thread must never wait on the audit buffer
+        self.audit.flush()
+        return self._backfill_game_stats()
+    
+    @writes
+    def _backfill_game_stats(self) -> Tuple[int, int]:
+        conn = self.get_connection()
+        archived = [self.archive.connection(month) for month in self.archive.months()]
+        return rollups.backfill(conn.cursor(), archived)
     
     def get_leaderboard(self, limit: int = 10) -> List[sqlite3.Row]:
         """Get top users by coins"""
@@ -521,29 +796,24 @@ class DatabaseManager:
         ''', (limit,))
         
         leaders = cursor.fetchall()
-        conn.close()
         return leaders
     
     # Achievement operations
-    def unlock_achievement(self, user_id: str, achievement_name: str) -> bool:
+    @writes
+    def unlock_achievement(self, user_id: int, achievement_name: str) -> bool:
         """Unlock an achievement for a user"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        try:
-            cursor.execute('''
-                INSERT INTO achievements (user_id, achievement_name)
-                VALUES (?, ?)
-            ''', (user_id, achievement_name))
-            conn.commit()
-            conn.close()
-            return True
-        except sqlite3.IntegrityError:
-            # Achievement already unlocked
-            conn.close()
-            return False
+        # Ignored (rowcount 0) if the achievement was already unlocked
+        cursor.execute('''
+            INSERT OR IGNORE INTO achievements (user_id, achievement_name)
+            VALUES (?, ?)
+        ''', (user_id, achievement_name))
+        return cursor.rowcount == 1
     
-    def get_user_achievements(self, user_id: str) -> List[sqlite3.Row]:
+    @memoized
+    def get_user_achievements(self, user_id: int) -> List[sqlite3.Row]:
         """Get all achievements for a user"""
         conn = self.get_connection()
         cursor = conn.cursor()
@@ -556,11 +826,11 @@ class DatabaseManager:
         ''', (user_id,))
         
         achievements = cursor.fetchall()
-        conn.close()
         return achievements
     
     # Daily reward operations
-    def claim_daily_reward(self, user_id: str) -> Tuple[bool, int, int]:
+    @writes
+    def claim_daily_reward(self, user_id: int) -> Tuple[bool, int, int]:
         """
         Claim daily reward
         Returns: (success, coins_earned, current_streak)
@@ -572,29 +842,18 @@ class DatabaseManager:
         user = cursor.fetchone()
         
         if not user:
-            conn.close()
             return False, 0, 0
         
-        now = datetime.now()
+        now = int(time.time())
         last_daily = user['last_daily']
+        days = (now - last_daily) // DAY if last_daily else None
         
         # Check if already claimed today
-        if last_daily:
-            last_daily_dt = datetime.fromisoformat(last_daily)
-            if (now - last_daily_dt).days < 1:
-                conn.close()
-                return False, 0, user['streak']
+        if days is not None and days < 1:
+            return False, 0, user['streak']
         
         # Calculate streak
-        streak = user['streak']
-        if last_daily:
-            last_daily_dt = datetime.fromisoformat(last_daily)
-            if (now - last_daily_dt).days == 1:
-                streak += 1
-            else:
-                streak = 1
-        else:
-            streak = 1
+        streak = user['streak'] + 1 if days == 1 else 1
         
         # Calculate reward (base + streak bonus)
         base_reward = 100
@@ -608,15 +867,96 @@ class DatabaseManager:
                 streak = ?,
                 coins = coins + ?
             WHERE user_id = ?
-        ''', (now.isoformat(), streak, total_reward, user_id))
+            RETURNING *
+        ''', (now, streak, total_reward, user_id))
+        updated = cursor.fetchone()
         
         # Log transaction
-        cursor.execute('''
-            INSERT INTO transactions (user_id, amount, transaction_type, description)
-            VALUES (?, ?, 'daily_reward', ?)
-        ''', (user_id, total_reward, f'Recompensa diária (streak: {streak})'))
+        cursor.execute(f'''
+            INSERT INTO transactions (user_id, amount, type_id, detail)
+            VALUES (?, ?, {TYPE_ID}, ?)
+        ''', (user_id, total_reward, 'daily_reward', str(streak)))
         
-        conn.commit()
-        conn.close()
+        self._row_changed(updated)
         
         return True, total_reward, streak
+    
+    # Hold operations
+    @writes
+    def place_hold(self, user_id: int, amount: int, game_type: str, ttl: float) -> Optional[int]:
+        """
+        Reserve coins for a running game
+        
+        The availability check and the insert are one statement, so two
+        games can never reserve the same coins.
+        
+        Returns:
+            int: The hold id, or None if the user can't cover the amount
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        now = time.time()
+        
+        cursor.execute(f'''
+            INSERT INTO holds (user_id, amount, game_type, created_at, expires_at)
+            SELECT user_id, ?, ?, ?, ? FROM users
+            WHERE user_id = ? AND coins - {HELD_COINS} >= ?
+            RETURNING hold_id
+        ''', (amount, game_type, now, now + ttl, user_id, amount))
+        row = cursor.fetchone()
+        return row['hold_id'] if row else None
+    
+    @writes
+    def take_hold(self, hold_id: int) -> Optional[sqlite3.Row]:
+        """Close a hold, returning it (None if it was already settled or expired)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('DELETE FROM holds WHERE hold_id = ? RETURNING *', (hold_id,))
+        return cursor.fetchone()
+    
+    @writes
+    def sweep_holds(self) -> int:
+        """Release every expired hold, returns how many were released"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('DELETE FROM holds WHERE expires_at <= ?', (time.time(),))
+        return cursor.rowcount
+    
+    @memoized
+    def get_held_coins(self, user_id: int) -> int:
+        """Coins reserved by a user's open holds"""
+        conn = self.get_connection()
+        row = conn.execute('SELECT COALESCE(SUM(amount), 0) FROM holds WHERE user_id = ?', (user_id,)).fetchone()
+        return row[0]
+    
+    # Lease operations
+    @writes
+    def acquire_lease(self, lease_key: str, owner: str, token: str, game: str, ttl: float) -> bool:
+        """Take a shared lease unless another live one holds the key"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        now = time.time()
+        
+        # The DO UPDATE only fires on an expired row, so rowcount 0 means taken
+        cursor.execute('''
+            INSERT INTO game_leases (lease_key, owner, token, game, expires_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(lease_key) DO UPDATE SET
+                owner = excluded.owner,
+                token = excluded.token,
+                game = excluded.game,
+                expires_at = excluded.expires_at
+            WHERE game_leases.expires_at <= ?
+        ''', (lease_key, owner, token, game, now + ttl, now))
+        return cursor.rowcount == 1
+    
+    @writes
+    def release_lease(self, lease_key: str, token: str) -> bool:
+        """Drop a shared lease, only if it is still ours"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('DELETE FROM game_leases WHERE lease_key = ? AND token = ?', (lease_key, token))
+        return cursor.rowcount == 1
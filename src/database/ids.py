@@ -0,0 +1,15 @@
+"""Discord ID normalization"""
+
+from typing import Optional, Union
+
+
+def snowflake(value: Union[int, str, None]) -> Optional[int]:
+    """
+    Discord ID as stored, an INTEGER since migration 7
+
+    Accepts the str IDs callers used to pass. None and '' (the old
+    "no guild") map to None.
+    """
+    if value is None or value == '':
+        return None
+    return int(value)
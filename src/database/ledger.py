@@ -0,0 +1,42 @@
+"""Transaction type codes and ledger descriptions"""
+
+from typing import Optional
+
+# Stable type_id of every transaction type the bot writes. Only ever
+# append, the ids are stored in transactions.type_id. Other types (e.g.
+# the webapp's admin adjustments) get an id when first written.
+TRANSACTION_TYPES = {
+    'earn': 1,
+    'spend': 2,
+    'transfer_in': 3,
+    'transfer_out': 4,
+    'achievement': 5,
+    'daily_reward': 6,
+}
+
+# How a bet or payout row (game_id set, no detail) reads
+GAME_TEMPLATES = {
+    'spend': '{game} - Aposta',
+    'earn': '{game} - Vitória',
+}
+
+# How rows of these types read, detail holds the variable part
+DETAIL_TEMPLATES = {
+    'transfer_in': 'Transferência de {detail}',
+    'transfer_out': 'Transferência para {detail}',
+    'achievement': 'Achievement unlocked: {detail}',
+    'daily_reward': 'Recompensa diária (streak: {detail})',
+}
+
+# Subqueries resolving names to ids inside an INSERT or WHERE
+TYPE_ID = '(SELECT type_id FROM transaction_types WHERE name = ?)'
+GAME_ID = '(SELECT game_id FROM game_types WHERE name = ?)'
+
+
+def describe(transaction_type: str, game_type: Optional[str], detail: Optional[str]) -> str:
+    """Render the human-readable description of a transactions row"""
+    if game_type is not None and detail is None and transaction_type in GAME_TEMPLATES:
+        return GAME_TEMPLATES[transaction_type].format(game=game_type)
+    if detail is not None and transaction_type in DETAIL_TEMPLATES:
+        return DETAIL_TEMPLATES[transaction_type].format(detail=detail)
+    return detail or transaction_type
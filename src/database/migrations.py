@@ -0,0 +1,522 @@
+"""Versioned schema migrations"""
+
+import sqlite3
+from typing import Callable, List, Tuple
+from .ledger import DETAIL_TEMPLATES, GAME_TEMPLATES, TRANSACTION_TYPES
+
+
+def _add_games_won(cursor: sqlite3.Cursor):
+    """Add games_won to users tables created before the column existed"""
+    cursor.execute("PRAGMA table_info(users)")
+    columns = [column[1] for column in cursor.fetchall()]
+    if 'games_won' not in columns:
+        cursor.execute('ALTER TABLE users ADD COLUMN games_won INTEGER DEFAULT 0')
+
+
+def _add_hot_path_indexes(cursor: sqlite3.Cursor):
+    """Indexes for history lookups, game stats and leaderboards (frozen, later migrations copy it)"""
+    # History: WHERE user_id = ? ORDER BY timestamp DESC
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_transactions_user_time
+        ON transactions (user_id, timestamp)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_game_history_user_time
+        ON game_history (user_id, timestamp)
+    ''')
+    # Webapp game stats: WHERE game_type = ? / GROUP BY game_type
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_game_history_type_time
+        ON game_history (game_type, timestamp)
+    ''')
+    # Leaderboards: ORDER BY coins DESC
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_users_coins
+        ON users (coins DESC)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_guild_coins_guild_coins
+        ON guild_coins (guild_id, coins DESC)
+    ''')
+
+
+def _add_game_stat_rollups(cursor: sqlite3.Cursor):
+    """Per-day and per-user game aggregates, filled from existing history"""
+    # guild_id is '' for bets settled against the global balance
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS game_stats_daily (
+            guild_id TEXT NOT NULL,
+            game_type TEXT NOT NULL,
+            day TEXT NOT NULL,
+            bets INTEGER NOT NULL DEFAULT 0,
+            wagered INTEGER NOT NULL DEFAULT 0,
+            paid_out INTEGER NOT NULL DEFAULT 0,
+            wins INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (guild_id, game_type, day)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_game_stats (
+            user_id TEXT NOT NULL,
+            game_type TEXT NOT NULL,
+            bets INTEGER NOT NULL DEFAULT 0,
+            wagered INTEGER NOT NULL DEFAULT 0,
+            paid_out INTEGER NOT NULL DEFAULT 0,
+            wins INTEGER NOT NULL DEFAULT 0,
+            last_played TIMESTAMP,
+            PRIMARY KEY (user_id, game_type)
+        )
+    ''')
+    # Frozen copy of the backfill as of this version: ISO text timestamps, global is ''
+    cursor.execute('''
+        INSERT INTO game_stats_daily (guild_id, game_type, day, bets, wagered, paid_out, wins)
+        SELECT '', game_type, date(timestamp), COUNT(*),
+               SUM(bet_amount), SUM(bet_amount + winnings), SUM(result = 'win')
+        FROM game_history
+        GROUP BY game_type, date(timestamp)
+    ''')
+    cursor.execute('''
+        INSERT INTO user_game_stats (user_id, game_type, bets, wagered, paid_out, wins, last_played)
+        SELECT user_id, game_type, COUNT(*),
+               SUM(bet_amount), SUM(bet_amount + winnings), SUM(result = 'win'), MAX(timestamp)
+        FROM game_history
+        GROUP BY user_id, game_type
+    ''')
+
+
+def _add_game_leases(cursor: sqlite3.Cursor):
+    """Shared game leases, so several bot processes exclude each other"""
+    # expires_at is unix time, an expired row can be taken over by anyone
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS game_leases (
+            lease_key TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            token TEXT NOT NULL,
+            game TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        )
+    ''')
+
+
+def _add_holds(cursor: sqlite3.Cursor):
+    """Escrow holds, a user's spendable balance is coins minus open holds"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS holds (
+            hold_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL,
+            amount INTEGER NOT NULL,
+            game_type TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            expires_at REAL NOT NULL
+        )
+    ''')
+    # Every debit sums a user's open holds, the sweeper scans by expiry
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_holds_user ON holds (user_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_holds_expires ON holds (expires_at)')
+
+
+def _add_history_filter_indexes(cursor: sqlite3.Cursor):
+    """Indexes for history pages filtered by transaction or game type"""
+    # Keyset pages: WHERE user_id = ? AND <type> = ? AND (timestamp, id) < (?, ?)
+    # id is the rowid, so every index already ends in it
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_transactions_user_type_time
+        ON transactions (user_id, transaction_type, timestamp)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_game_history_user_game_time
+        ON game_history (user_id, game_type, timestamp)
+    ''')
+
+
+# (table, column) pairs holding Discord IDs
+SNOWFLAKE_COLUMNS = [
+    ('users', 'user_id'),
+    ('transactions', 'user_id'),
+    ('game_history', 'user_id'),
+    ('achievements', 'user_id'),
+    ('guilds', 'guild_id'),
+    ('guild_members', 'guild_id'),
+    ('guild_members', 'user_id'),
+    ('guild_coins', 'guild_id'),
+    ('guild_coins', 'user_id'),
+    ('user_game_stats', 'user_id'),
+    ('holds', 'user_id'),
+]
+
+
+def _epoch(column: str, localtime: bool = False) -> str:
+    """SQL converting an ISO text timestamp column to unix epoch seconds (NULL stays NULL)"""
+    # last_daily was written with datetime.now(), i.e. server local time
+    modifier = ", 'utc'" if localtime else ''
+    return f"CAST(strftime('%s', {column}{modifier}) AS INTEGER)"
+
+
+def _rebuild(cursor: sqlite3.Cursor, table: str, columns: str, select: str):
+    """Recreate a table with new column definitions, copying rows through select"""
+    cursor.execute(f'CREATE TABLE {table}_new ({columns})')
+    cursor.execute(f'INSERT INTO {table}_new SELECT {select} FROM {table}')
+    cursor.execute(f'DROP TABLE {table}')
+    cursor.execute(f'ALTER TABLE {table}_new RENAME TO {table}')
+
+
+def _integer_ids_and_timestamps(cursor: sqlite3.Cursor):
+    """Store Discord IDs as INTEGER snowflakes and timestamps as unix epoch seconds"""
+    for table, column in SNOWFLAKE_COLUMNS:
+        cursor.execute(f"SELECT {column} FROM {table} WHERE {column} = '' OR {column} GLOB '*[^0-9]*' LIMIT 1")
+        row = cursor.fetchone()
+        if row is not None:
+            raise ValueError(f'{table}.{column} holds a non-numeric ID: {row[0]!r}')
+
+    # users.user_id and guilds.guild_id become rowid aliases
+    _rebuild(cursor, 'users', '''
+        user_id INTEGER PRIMARY KEY,
+        username TEXT NOT NULL,
+        coins INTEGER DEFAULT 1000,
+        total_won INTEGER DEFAULT 0,
+        total_lost INTEGER DEFAULT 0,
+        games_played INTEGER DEFAULT 0,
+        games_won INTEGER DEFAULT 0,
+        created_at INTEGER DEFAULT (unixepoch()),
+        last_daily INTEGER,
+        streak INTEGER DEFAULT 0
+    ''', f'''
+        CAST(user_id AS INTEGER), username, coins, total_won, total_lost, games_played, games_won,
+        {_epoch('created_at')}, {_epoch('last_daily', localtime=True)}, streak
+    ''')
+    _rebuild(cursor, 'transactions', '''
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        amount INTEGER NOT NULL,
+        transaction_type TEXT NOT NULL,
+        description TEXT,
+        timestamp INTEGER DEFAULT (unixepoch()),
+        FOREIGN KEY (user_id) REFERENCES users(user_id)
+    ''', f'''
+        id, CAST(user_id AS INTEGER), amount, transaction_type, description, {_epoch('timestamp')}
+    ''')
+    _rebuild(cursor, 'game_history', '''
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        game_type TEXT NOT NULL,
+        bet_amount INTEGER NOT NULL,
+        result TEXT NOT NULL,
+        winnings INTEGER NOT NULL,
+        timestamp INTEGER DEFAULT (unixepoch()),
+        FOREIGN KEY (user_id) REFERENCES users(user_id)
+    ''', f'''
+        id, CAST(user_id AS INTEGER), game_type, bet_amount, result, winnings, {_epoch('timestamp')}
+    ''')
+    _rebuild(cursor, 'achievements', '''
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        achievement_name TEXT NOT NULL,
+        unlocked_at INTEGER DEFAULT (unixepoch()),
+        FOREIGN KEY (user_id) REFERENCES users(user_id),
+        UNIQUE(user_id, achievement_name)
+    ''', f'''
+        id, CAST(user_id AS INTEGER), achievement_name, {_epoch('unlocked_at')}
+    ''')
+    _rebuild(cursor, 'guilds', '''
+        guild_id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        member_count INTEGER DEFAULT 0,
+        icon_url TEXT,
+        joined_at INTEGER DEFAULT (unixepoch())
+    ''', f'''
+        CAST(guild_id AS INTEGER), name, member_count, icon_url, {_epoch('joined_at')}
+    ''')
+    _rebuild(cursor, 'guild_members', '''
+        guild_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        joined_at INTEGER DEFAULT (unixepoch()),
+        PRIMARY KEY (guild_id, user_id),
+        FOREIGN KEY (guild_id) REFERENCES guilds(guild_id),
+        FOREIGN KEY (user_id) REFERENCES users(user_id)
+    ''', f'''
+        CAST(guild_id AS INTEGER), CAST(user_id AS INTEGER), {_epoch('joined_at')}
+    ''')
+    _rebuild(cursor, 'guild_coins', '''
+        guild_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        coins INTEGER DEFAULT 1000,
+        total_won INTEGER DEFAULT 0,
+        total_lost INTEGER DEFAULT 0,
+        games_played INTEGER DEFAULT 0,
+        games_won INTEGER DEFAULT 0,
+        last_daily INTEGER,
+        streak INTEGER DEFAULT 0,
+        PRIMARY KEY (guild_id, user_id),
+        FOREIGN KEY (guild_id) REFERENCES guilds(guild_id),
+        FOREIGN KEY (user_id) REFERENCES users(user_id)
+    ''', f'''
+        CAST(guild_id AS INTEGER), CAST(user_id AS INTEGER), coins, total_won, total_lost,
+        games_played, games_won, {_epoch('last_daily', localtime=True)}, streak
+    ''')
+    # The global balance was guild_id '', it becomes 0
+    _rebuild(cursor, 'game_stats_daily', '''
+        guild_id INTEGER NOT NULL,
+        game_type TEXT NOT NULL,
+        day TEXT NOT NULL,
+        bets INTEGER NOT NULL DEFAULT 0,
+        wagered INTEGER NOT NULL DEFAULT 0,
+        paid_out INTEGER NOT NULL DEFAULT 0,
+        wins INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (guild_id, game_type, day)
+    ''', '''
+        CAST(guild_id AS INTEGER), game_type, day, bets, wagered, paid_out, wins
+    ''')
+    _rebuild(cursor, 'user_game_stats', '''
+        user_id INTEGER NOT NULL,
+        game_type TEXT NOT NULL,
+        bets INTEGER NOT NULL DEFAULT 0,
+        wagered INTEGER NOT NULL DEFAULT 0,
+        paid_out INTEGER NOT NULL DEFAULT 0,
+        wins INTEGER NOT NULL DEFAULT 0,
+        last_played INTEGER,
+        PRIMARY KEY (user_id, game_type)
+    ''', f'''
+        CAST(user_id AS INTEGER), game_type, bets, wagered, paid_out, wins, {_epoch('last_played')}
+    ''')
+    _rebuild(cursor, 'holds', '''
+        hold_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        amount INTEGER NOT NULL,
+        game_type TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        expires_at REAL NOT NULL
+    ''', '''
+        hold_id, CAST(user_id AS INTEGER), amount, game_type, created_at, expires_at
+    ''')
+
+    # Dropping the old tables dropped their indexes. Frozen copies of
+    # migrations 2 and 6 as of this version, minus transactions': migration
+    # 8 rebuilds that table (and its indexes) right after this one
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_game_history_user_time
+        ON game_history (user_id, timestamp)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_game_history_type_time
+        ON game_history (game_type, timestamp)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_game_history_user_game_time
+        ON game_history (user_id, game_type, timestamp)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_users_coins
+        ON users (coins DESC)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_guild_coins_guild_coins
+        ON guild_coins (guild_id, coins DESC)
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_holds_user ON holds (user_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_holds_expires ON holds (expires_at)')
+
+
+def _sql_literal(text: str) -> str:
+    return "'" + text.replace("'", "''") + "'"
+
+
+def _encode_transactions(cursor: sqlite3.Cursor):
+    """Replace transactions' free-text type and description with codes (see ledger)"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS transaction_types (
+            type_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS game_types (
+            game_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        )
+    ''')
+    cursor.executemany('INSERT OR IGNORE INTO transaction_types (type_id, name) VALUES (?, ?)',
+                       [(type_id, name) for name, type_id in TRANSACTION_TYPES.items()])
+    cursor.execute('INSERT OR IGNORE INTO transaction_types (name) SELECT DISTINCT transaction_type FROM transactions')
+    cursor.execute('INSERT OR IGNORE INTO game_types (name) SELECT DISTINCT game_type FROM game_history')
+
+    # A bet row's description is a template around its game's name
+    game_name = ' '.join(
+        f"WHEN t.transaction_type = {_sql_literal(type_name)} "
+        f"AND substr(t.description, -{len(suffix)}) = {_sql_literal(suffix)} "
+        f"THEN substr(t.description, 1, length(t.description) - {len(suffix)})"
+        for type_name, template in GAME_TEMPLATES.items()
+        for suffix in [template.replace('{game}', '')]
+    )
+    # Other templated descriptions keep only their variable part
+    detail = ' '.join(
+        f"WHEN t.transaction_type = {_sql_literal(type_name)} "
+        f"AND substr(t.description, 1, {len(prefix)}) = {_sql_literal(prefix)} "
+        f"AND length(t.description) >= {len(prefix) + len(suffix)} "
+        + (f"AND substr(t.description, -{len(suffix)}) = {_sql_literal(suffix)} " if suffix else '')
+        + f"THEN substr(t.description, {len(prefix) + 1}, length(t.description) - {len(prefix) + len(suffix)})"
+        for type_name, template in DETAIL_TEMPLATES.items()
+        for prefix, suffix in [template.split('{detail}')]
+    )
+
+    cursor.execute('''
+        CREATE TABLE transactions_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            amount INTEGER NOT NULL,
+            type_id INTEGER NOT NULL,
+            game_id INTEGER,
+            detail TEXT,
+            timestamp INTEGER DEFAULT (unixepoch()),
+            FOREIGN KEY (user_id) REFERENCES users(user_id),
+            FOREIGN KEY (type_id) REFERENCES transaction_types(type_id),
+            FOREIGN KEY (game_id) REFERENCES game_types(game_id)
+        )
+    ''')
+    cursor.execute(f'''
+        INSERT INTO transactions_new (id, user_id, amount, type_id, game_id, detail, timestamp)
+        SELECT t.id, t.user_id, t.amount, tt.type_id, g.game_id,
+               CASE WHEN g.game_id IS NOT NULL THEN NULL {detail} ELSE t.description END,
+               t.timestamp
+        FROM transactions t
+        JOIN transaction_types tt ON tt.name = t.transaction_type
+        LEFT JOIN game_types g ON g.name = CASE {game_name} END
+    ''')
+    cursor.execute('DROP TABLE transactions')
+    cursor.execute('ALTER TABLE transactions_new RENAME TO transactions')
+
+    # History pages, whole or filtered by type or game
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_transactions_user_time
+        ON transactions (user_id, timestamp)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_transactions_user_type_time
+        ON transactions (user_id, type_id, timestamp)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_transactions_user_game_time
+        ON transactions (user_id, game_id, timestamp)
+    ''')
+
+
+
+def _add_archived_months(cursor: sqlite3.Cursor):
+    """Which archive months hold each user's history (see archive.Archiver)"""
+    # History pages read only these months once the hot rows run out
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS archived_months (
+            user_id INTEGER NOT NULL,
+            month TEXT NOT NULL,
+            PRIMARY KEY (user_id, month)
+        ) WITHOUT ROWID
+    ''')
+
+
+def _add_fair_rounds(cursor: sqlite3.Cursor):
+    """Provably fair hash chains, players' client seeds and the rounds played on them"""
+    # first_round is the round_id of the chain's first link, rounds map onto chains by range
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS fair_chains (
+            chain_id INTEGER PRIMARY KEY,
+            file TEXT NOT NULL,
+            terminal_hash TEXT NOT NULL,
+            length INTEGER NOT NULL,
+            first_round INTEGER NOT NULL,
+            created_at INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS fair_seeds (
+            user_id INTEGER PRIMARY KEY,
+            client_seed TEXT NOT NULL,
+            nonce INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    # args is the command's arguments as JSON, enough to replay the round
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS fair_rounds (
+            round_id INTEGER PRIMARY KEY,
+            chain_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            game TEXT NOT NULL,
+            args TEXT NOT NULL,
+            client_seed TEXT NOT NULL,
+            nonce INTEGER NOT NULL,
+            bet_amount INTEGER NOT NULL,
+            won INTEGER NOT NULL,
+            multiplier REAL NOT NULL,
+            timestamp INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_fair_rounds_user ON fair_rounds (user_id, round_id)')
+
+
+# Ordered (version, description, step). Only ever append new steps,
+# never edit or reorder ones that may already be applied. A step never
+# calls another step: a later migration that needs the same DDL copies it
+# as it stood, so editing one step can't change what another one does.
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Cursor], None]]] = [
+    (1, 'Add users.games_won', _add_games_won),
+    (2, 'Add hot-path indexes', _add_hot_path_indexes),
+    (3, 'Add game stat rollups', _add_game_stat_rollups),
+    (4, 'Add game leases', _add_game_leases),
+    (5, 'Add escrow holds', _add_holds),
+    (6, 'Add history filter indexes', _add_history_filter_indexes),
+    (7, 'Integer snowflakes and epoch timestamps', _integer_ids_and_timestamps),
+    (8, 'Encode transaction types and descriptions', _encode_transactions),
+    (9, 'Add archived months', _add_archived_months),
+    (10, 'Add provably fair rounds', _add_fair_rounds),
+]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Get the highest applied migration version (0 if none)"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    row = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()
+    return row[0] or 0
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    Apply every pending migration, each in its own transaction
+
+    Args:
+        conn: Database connection
+
+    Returns:
+        int: Schema version after migrating
+    """
+    version = get_schema_version(conn)
+    conn.commit()
+
+    for step_version, description, step in MIGRATIONS:
+        if step_version <= version:
+            continue
+
+        cursor = conn.cursor()
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            # Another process may have migrated while we waited for the lock
+            if get_schema_version(conn) >= step_version:
+                conn.rollback()
+                version = step_version
+                continue
+
+            step(cursor)
+            cursor.execute(
+                'INSERT INTO schema_version (version, description) VALUES (?, ?)',
+                (step_version, description)
+            )
+            conn.commit()
+            version = step_version
+        except Exception:
+            conn.rollback()
+            raise
+
+    return version
@@ -1,21 +1,20 @@
 """Data models for the database"""
 
 from dataclasses import dataclass
-from datetime import datetime
 from typing import Optional
 
 
 @dataclass
 class User:
     """User model"""
-    user_id: str
+    user_id: int
     username: str
     coins: int = 1000
     total_won: int = 0
     total_lost: int = 0
     games_played: int = 0
-    created_at: datetime = None
-    last_daily: Optional[datetime] = None
+    created_at: int = None
+    last_daily: Optional[int] = None
     streak: int = 0
 
 
@@ -23,29 +22,30 @@ class User:
 class Transaction:
     """Transaction model"""
     id: int
-    user_id: str
+    user_id: int
     amount: int
     transaction_type: str
-    description: Optional[str]
-    timestamp: datetime
+    game_type: Optional[str]
+    detail: Optional[str]
+    timestamp: int
 
 
 @dataclass
 class Achievement:
     """Achievement model"""
     id: int
-    user_id: str
+    user_id: int
     achievement_name: str
-    unlocked_at: datetime
+    unlocked_at: int
 
 
 @dataclass
 class GameHistory:
     """Game history model"""
     id: int
-    user_id: str
+    user_id: int
     game_type: str
     bet_amount: int
     result: str
     winnings: int
-    timestamp: datetime
+    timestamp: int
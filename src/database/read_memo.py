@@ -0,0 +1,62 @@
+"""Request-scoped memo of database reads"""
+
+import functools
+from contextvars import ContextVar, Token
+from typing import Callable, Optional
+
+# Active memo of the current command invocation, None outside one
+_memo: ContextVar[Optional[dict]] = ContextVar('db_read_memo', default=None)
+MISSING = object()
+
+
+def begin() -> Token:
+    """Start memoizing reads for the current context (e.g. one bot command)"""
+    return _memo.set({})
+
+
+def end(token: Token):
+    """Stop memoizing, dropping everything read since begin()"""
+    _memo.reset(token)
+
+
+def invalidate():
+    """Forget memoized reads, called whenever this context writes"""
+    memo = _memo.get()
+    if memo:
+        memo.clear()
+
+
+def key(name: str, args: tuple, kwargs: dict) -> tuple:
+    return (name, args, tuple(sorted(kwargs.items())))
+
+
+def lookup(name: str, args: tuple, kwargs: dict):
+    """Memoized result of a read, or MISSING if there is none"""
+    memo = _memo.get()
+    if memo is None:
+        return MISSING
+    return memo.get(key(name, args, kwargs), MISSING)
+
+
+def memoized(method: Callable) -> Callable:
+    """
+    Mark a read as memoizable within a request
+
+    Outside begin()/end() the method runs as usual. Inside, the first
+    result for a set of arguments is reused until the context writes.
+    AsyncDatabaseManager serves hits without leaving the event loop.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        memo = _memo.get()
+        if memo is None:
+            return method(self, *args, **kwargs)
+
+        memo_key = key(method.__name__, args, kwargs)
+        result = memo.get(memo_key, MISSING)
+        if result is MISSING:
+            result = memo[memo_key] = method(self, *args, **kwargs)
+        return result
+
+    wrapper.db_memoized = True
+    return wrapper
@@ -0,0 +1,149 @@
+"""Incrementally maintained game stat rollups"""
+
+import argparse
+import sqlite3
+from typing import Iterable, Tuple
+from .ids import snowflake
+
+# guild_id of game_stats_daily rows settled against the global balance
+GLOBAL = 0
+
+# Day of a game_history row, timestamp is unix time
+HISTORY_DAY = "date(timestamp, 'unixepoch')"
+
+# Aggregates of a game_history table, in the rollup tables' column order
+DAILY_SELECT = f'''
+    SELECT ?, game_type, {HISTORY_DAY}, COUNT(*),
+           SUM(bet_amount), SUM(bet_amount + winnings), SUM(result = 'win')
+    FROM game_history
+    GROUP BY game_type, {HISTORY_DAY}
+'''
+USER_SELECT = '''
+    SELECT user_id, game_type, COUNT(*),
+           SUM(bet_amount), SUM(bet_amount + winnings), SUM(result = 'win'), MAX(timestamp)
+    FROM game_history
+    GROUP BY user_id, game_type
+'''
+
+
+def record_bet(cursor: sqlite3.Cursor, user_id: int, game_type: str, bet_amount: int,
+               net_change: int, won: bool, guild_id: int = None):
+    """
+    Add one settled bet to game_stats_daily and user_game_stats
+
+    Runs inside the caller's transaction, so the rollups commit (or roll
+    back) together with the balance change. paid_out is what went back to
+    the player, bet_amount + net_change.
+    """
+    paid_out = bet_amount + net_change
+    wins = 1 if won else 0
+
+    cursor.execute('''
+        INSERT INTO game_stats_daily (guild_id, game_type, day, bets, wagered, paid_out, wins)
+        VALUES (?, ?, date('now'), 1, ?, ?, ?)
+        ON CONFLICT(guild_id, game_type, day) DO UPDATE SET
+            bets = bets + 1,
+            wagered = wagered + excluded.wagered,
+            paid_out = paid_out + excluded.paid_out,
+            wins = wins + excluded.wins
+    ''', (snowflake(guild_id) or GLOBAL, game_type, bet_amount, paid_out, wins))
+
+    cursor.execute('''
+        INSERT INTO user_game_stats (user_id, game_type, bets, wagered, paid_out, wins, last_played)
+        VALUES (?, ?, 1, ?, ?, ?, unixepoch())
+        ON CONFLICT(user_id, game_type) DO UPDATE SET
+            bets = bets + 1,
+            wagered = wagered + excluded.wagered,
+            paid_out = paid_out + excluded.paid_out,
+            wins = wins + excluded.wins,
+            last_played = excluded.last_played
+    ''', (user_id, game_type, bet_amount, paid_out, wins))
+
+
+def backfill(cursor: sqlite3.Cursor, archived: Iterable[sqlite3.Connection] = ()) -> Tuple[int, int]:
+    """
+    Rebuild the global daily rows and user_game_stats from game_history
+
+    game_history has no guild column, so per-guild daily rows can't be
+    rebuilt and are left as they are. The global rows are every bet in
+    history minus what the guild rows already count for the same game and
+    day. Rows moved to cold storage are added from the archived months'
+    connections. Runs inside the caller's transaction.
+
+    Returns:
+        tuple: (game_stats_daily rows, user_game_stats rows)
+    """
+    cursor.execute('DELETE FROM game_stats_daily WHERE guild_id = ?', (GLOBAL,))
+    cursor.execute('DELETE FROM user_game_stats')
+
+    cursor.execute(f'''
+        INSERT INTO game_stats_daily (guild_id, game_type, day, bets, wagered, paid_out, wins)
+        {DAILY_SELECT}
+    ''', (GLOBAL,))
+    cursor.execute(f'''
+        INSERT INTO user_game_stats (user_id, game_type, bets, wagered, paid_out, wins, last_played)
+        {USER_SELECT}
+    ''')
+
+    for conn in archived:
+        cursor.executemany('''
+            INSERT INTO game_stats_daily (guild_id, game_type, day, bets, wagered, paid_out, wins)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(guild_id, game_type, day) DO UPDATE SET
+                bets = bets + excluded.bets,
+                wagered = wagered + excluded.wagered,
+                paid_out = paid_out + excluded.paid_out,
+                wins = wins + excluded.wins
+        ''', conn.execute(DAILY_SELECT, (GLOBAL,)).fetchall())
+        cursor.executemany('''
+            INSERT INTO user_game_stats (user_id, game_type, bets, wagered, paid_out, wins, last_played)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(user_id, game_type) DO UPDATE SET
+                bets = bets + excluded.bets,
+                wagered = wagered + excluded.wagered,
+                paid_out = paid_out + excluded.paid_out,
+                wins = wins + excluded.wins,
+                last_played = MAX(last_played, excluded.last_played)
+        ''', conn.execute(USER_SELECT).fetchall())
+
+    cursor.execute('''
+        UPDATE game_stats_daily AS total SET
+            bets = total.bets - guilds.bets,
+            wagered = total.wagered - guilds.wagered,
+            paid_out = total.paid_out - guilds.paid_out,
+            wins = total.wins - guilds.wins
+        FROM (
+            SELECT game_type, day, SUM(bets) AS bets, SUM(wagered) AS wagered,
+                   SUM(paid_out) AS paid_out, SUM(wins) AS wins
+            FROM game_stats_daily
+            WHERE guild_id != ?
+            GROUP BY game_type, day
+        ) AS guilds
+        WHERE total.guild_id = ? AND total.game_type = guilds.game_type AND total.day = guilds.day
+    ''', (GLOBAL, GLOBAL))
+    # Days where every bet was a guild bet (or a guild row straddles midnight)
+    cursor.execute('DELETE FROM game_stats_daily WHERE guild_id = ? AND bets <= 0', (GLOBAL,))
+
+    daily = cursor.execute('SELECT COUNT(*) FROM game_stats_daily WHERE guild_id = ?', (GLOBAL,)).fetchone()[0]
+    per_user = cursor.execute('SELECT COUNT(*) FROM user_game_stats').fetchone()[0]
+    return daily, per_user
+
+
+def main():
+    """Rebuild the rollups from the command line (stop the bot first)"""
+    from .db_manager import DatabaseManager
+
+    parser = argparse.ArgumentParser(description='Rebuild game stat rollups from game_history and its archive')
+    parser.add_argument('--db', default='data/macacolandia.db', help='Path to the SQLite database')
+    args = parser.parse_args()
+
+    db = DatabaseManager(args.db)
+    try:
+        daily, per_user = db.rebuild_game_stats()
+        print(f'✅ Rebuilt global game_stats_daily ({daily} rows) and user_game_stats ({per_user} rows)')
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
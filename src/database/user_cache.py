@@ -0,0 +1,96 @@
+"""In-memory cache of user rows"""
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from .ids import snowflake
+
+
+class UserCache:
+    """
+    Bounded LRU cache of user rows keyed by (user_id, guild_id)
+
+    guild_id None holds the global users row, anything else holds the
+    guild_coins row. Entries expire after ttl seconds so writes made
+    outside the bot (e.g. the webapp) are picked up eventually.
+    """
+
+    def __init__(self, max_size: int = 2048, ttl: float = 30.0):
+        """Initialize an empty cache"""
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._rows: 'OrderedDict[tuple, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(user_id: int, guild_id: int = None) -> tuple:
+        return (snowflake(user_id), snowflake(guild_id))
+
+    def get(self, user_id: int, guild_id: int = None) -> Optional[sqlite3.Row]:
+        """Get a cached row, or None on a miss"""
+        key = self._key(user_id, guild_id)
+        with self._lock:
+            entry = self._rows.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    del self._rows[key]
+                self.misses += 1
+                return None
+            self._rows.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, row: Optional[sqlite3.Row], guild_id: int = None):
+        """Store the latest version of a row (ignores None)"""
+        if row is None:
+            return
+        key = self._key(row['user_id'], guild_id)
+        with self._lock:
+            self._rows[key] = (row, time.monotonic() + self.ttl)
+            self._rows.move_to_end(key)
+            while len(self._rows) > self.max_size:
+                self._rows.popitem(last=False)
+
+    def fill(self, row: Optional[sqlite3.Row], guild_id: int = None):
+        """
+        Store a row read outside the writer, only into an empty or expired slot
+
+        A reader's snapshot may predate a write that already put a newer
+        version, so it never replaces a live entry.
+        """
+        if row is None:
+            return
+        key = self._key(row['user_id'], guild_id)
+        with self._lock:
+            entry = self._rows.get(key)
+            if entry is not None and entry[1] >= time.monotonic():
+                return
+            self._rows[key] = (row, time.monotonic() + self.ttl)
+            self._rows.move_to_end(key)
+            while len(self._rows) > self.max_size:
+                self._rows.popitem(last=False)
+
+    def invalidate(self, user_id: int, guild_id: int = None):
+        """Drop a single entry"""
+        with self._lock:
+            self._rows.pop(self._key(user_id, guild_id), None)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._rows.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._rows),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0
+            }
@@ -0,0 +1,135 @@
+"""Single-writer queue for database writes"""
+
+import functools
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable
+
+
+class Rollback(Exception):
+    """Raise inside DatabaseManager.transaction() to undo it without an error"""
+
+
+def writes(method: Callable) -> Callable:
+    """
+    Mark a method as a database write
+
+    Calls are executed on the owner's writer thread (self.writer), batched
+    with whatever else is queued. Calls made from the writer thread itself
+    run inline, so write methods can call each other.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return self.writer.call(method, self, *args, **kwargs)
+
+    wrapper.db_write = True
+    return wrapper
+
+
+class DatabaseWriter:
+    """
+    Owns the bot's only writing connection
+
+    Queued operations are drained in batches of up to max_batch and run in
+    one BEGIN IMMEDIATE transaction, each inside its own SAVEPOINT so a
+    failing operation only rolls back itself. Every caller's future is
+    resolved once the batch has committed.
+    """
+
+    def __init__(self, db, max_batch: int = 256, begin_retries: int = 5):
+        """Initialize the writer and start its thread"""
+        self.db = db
+        self.max_batch = max_batch
+        self.begin_retries = begin_retries
+        self.stats = {'batches': 0, 'operations': 0, 'largest_batch': 0, 'lock_retries': 0}
+        self._queue: 'queue.Queue' = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+        self._thread.start()
+
+    def in_writer(self) -> bool:
+        """Whether the calling thread is the writer thread"""
+        return threading.current_thread() is self._thread
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """Queue a write, returns a future with its result"""
+        if self._closed:
+            raise RuntimeError('Database writer is closed')
+        future = Future()
+        self._queue.put((future, func, args, kwargs))
+        return future
+
+    def call(self, func: Callable, *args, **kwargs):
+        """Run a write and wait for its result"""
+        if self.in_writer():
+            return func(*args, **kwargs)
+        return self.submit(func, *args, **kwargs).result()
+
+    def _begin(self, conn: sqlite3.Connection):
+        # busy_timeout already waits, this only covers the webapp holding the lock longer
+        for attempt in range(self.begin_retries):
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                return
+            except sqlite3.OperationalError as e:
+                if 'locked' not in str(e) or attempt == self.begin_retries - 1:
+                    raise
+                self.stats['lock_retries'] += 1
+                time.sleep(0.05 * (attempt + 1))
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(item is None for item in batch)
+            batch = [item for item in batch if item is not None]
+            if batch:
+                self._run_batch(batch)
+            if stop:
+                return
+
+    def _run_batch(self, batch: list):
+        results = []
+        try:
+            with self.db.transaction(begin=self._begin):
+                for future, func, args, kwargs in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    result = None
+                    try:
+                        with self.db.transaction():
+                            result = func(*args, **kwargs)
+                        results.append((future, result, None))
+                    except Exception as e:
+                        results.append((future, None, e))
+        except Exception as e:
+            # The batch itself failed (BEGIN or COMMIT), fail everyone in it
+            print(f"Error committing write batch: {e}")
+            for future, _, _, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.stats['batches'] += 1
+        self.stats['operations'] += len(results)
+        self.stats['largest_batch'] = max(self.stats['largest_batch'], len(results))
+        for future, result, error in results:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def close(self):
+        """Finish everything already queued, then stop the writer thread"""
+        self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
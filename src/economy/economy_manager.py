@@ -1,52 +1,64 @@
 """Economy management system"""
 
-from typing import Tuple
+import sqlite3
+from typing import Optional, Tuple
 from src.database.db_manager import DatabaseManager
+from src.database.writer import Rollback, writes
 
 
 class EconomyManager:
     """Manages the bot's economy system"""
     
+    # Seconds before an unsettled hold is swept (same as a game lease)
+    HOLD_TTL = 600.0
+    
     def __init__(self, db: DatabaseManager):
         self.db = db
+        # Methods marked @writes run on the database writer thread
+        self.writer = db.writer
     
-    def get_balance(self, user_id: str, username: str) -> int:
+    def get_balance(self, user_id: int, username: str) -> int:
         """Get user's coin balance"""
         user = self.db.get_user(user_id, username)
         return user['coins']
     
-    def add_coins(self, user_id: str, amount: int, reason: str = None) -> bool:
+    @writes
+    def add_coins(self, user_id: int, amount: int, reason: str = None) -> bool:
         """Add coins to user account"""
         if self.db.update_coins(user_id, amount):
             self.db.add_transaction(user_id, amount, 'earn', reason)
             return True
         return False
     
-    def remove_coins(self, user_id: str, amount: int, reason: str = None) -> bool:
+    @writes
+    def remove_coins(self, user_id: int, amount: int, reason: str = None) -> bool:
         """Remove coins from user account"""
         if self.db.update_coins(user_id, -amount):
             self.db.add_transaction(user_id, -amount, 'spend', reason)
             return True
         return False
     
-    def transfer_coins(self, from_user: str, to_user: str, amount: int) -> Tuple[bool, str]:
+    @writes
+    def transfer_coins(self, from_user: int, to_user: int, amount: int) -> Tuple[bool, str]:
         """Transfer coins between users"""
         return self.db.transfer_coins(from_user, to_user, amount)
     
-    def can_afford(self, user_id: str, username: str, amount: int) -> bool:
+    def get_available(self, user_id: int, username: str) -> int:
+        """Get user's balance minus coins held by running games"""
+        return self.get_balance(user_id, username) - self.db.get_held_coins(user_id)
+    
+    def can_afford(self, user_id: int, username: str, amount: int) -> bool:
         """Check if user can afford an amount"""
-        balance = self.get_balance(user_id, username)
+        balance = self.get_available(user_id, username)
         return balance >= amount
     
-    def process_bet(self, user_id: str, username: str, bet_amount: int, 
-                   game_type: str, won: bool, multiplier: float = 1.0) -> Tuple[bool, int]:
+    @writes
+    def process_bet(self, user_id: int, username: str, bet_amount: int, 
+                   game_type: str, won: bool, multiplier: float = 1.0) -> Tuple[bool, int, Optional[sqlite3.Row]]:
         """
         Process a bet outcome atomically
-        Returns: (success, net_change)
+        Returns: (success, net_change, user row after settlement)
         """
-        # Ensure user exists first
-        self.db.get_user(user_id, username)
-        
         # Calculate the net change
         if won:
             winnings = int(bet_amount * multiplier)
@@ -54,10 +66,72 @@ class EconomyManager:
         else:
             net_change = -bet_amount
         
-        # Process bet atomically in database
-        success = self.db.process_bet_atomic(user_id, bet_amount, net_change, game_type, won)
+        # Process bet atomically in database (creates the user if needed)
+        user = self.db.process_bet_atomic(user_id, bet_amount, net_change, game_type, won,
+                                          username=username)
+        
+        if user is None:
+            return False, 0, None
         
-        if not success:
-            return False, 0
+        return True, net_change, user
+    
+    @writes
+    def hold(self, user_id: int, username: str, amount: int, game_type: str,
+             ttl: float = None) -> Optional[int]:
+        """
+        Reserve a stake for an interactive game
         
-        return True, net_change
+        The coins stay in the balance but can't be spent elsewhere until the
+        hold is settled, released or swept after ttl seconds.
+        Returns: hold id, or None if the available balance is too low
+        """
+        self.db.get_user(user_id, username)
+        return self.db.place_hold(user_id, amount, game_type, ttl or self.HOLD_TTL)
+    
+    @writes
+    def settle_hold(self, hold_id: int, username: str, won: bool,
+                    multiplier: float = 1.0) -> Tuple[bool, int, Optional[sqlite3.Row]]:
+        """
+        Close a hold and settle its stake as a bet, in one transaction
+        Returns: (success, net_change, user row after settlement)
+        """
+        with self.db.transaction():
+            hold = self.db.take_hold(hold_id)
+            if hold is None:
+                # Already settled, released or swept
+                return False, 0, None
+            
+            success, net_change, user = self.process_bet(hold['user_id'], username, hold['amount'],
+                                                         hold['game_type'], won, multiplier)
+            if not success:
+                raise Rollback()
+            return success, net_change, user
+        
+        return False, 0, None
+    
+    @writes
+    def release_hold(self, hold_id: int) -> bool:
+        """Give a held stake back untouched (no-op if already closed)"""
+        return self.db.take_hold(hold_id) is not None
+    
+    @writes
+    def transfer_hold(self, hold_id: int, to_user: int, from_reason: str = None,
+                      to_reason: str = None) -> bool:
+        """Move a held amount to another user, in one transaction"""
+        with self.db.transaction():
+            hold = self.db.take_hold(hold_id)
+            if hold is None:
+                return False
+            
+            if not self.remove_coins(hold['user_id'], hold['amount'], from_reason):
+                raise Rollback()
+            if not self.add_coins(to_user, hold['amount'], to_reason):
+                raise Rollback()
+            return True
+        
+        return False
+    
+    @writes
+    def sweep_holds(self) -> int:
+        """Release every expired hold"""
+        return self.db.sweep_holds()
@@ -0,0 +1,56 @@
+"""Background release of expired escrow holds"""
+
+import asyncio
+from typing import Optional
+
+
+class HoldSweeper:
+    """
+    Periodically releases holds whose game never settled them
+
+    A game that crashes or is cancelled mid-way leaves its hold open, so
+    the stake would stay unspendable. Holds past their expiry are deleted
+    every interval seconds, which makes the coins available again.
+    """
+
+    def __init__(self, economy, interval: float = 60.0):
+        """
+        Initialize the sweeper
+
+        Args:
+            economy: Async-wrapped EconomyManager
+            interval: Seconds between sweeps
+        """
+        self.economy = economy
+        self.interval = interval
+        self.stats = {'sweeps': 0, 'released': 0}
+        self._task: Optional[asyncio.Task] = None
+
+    async def sweep(self) -> int:
+        """Release expired holds once"""
+        released = await self.economy.sweep_holds()
+        self.stats['sweeps'] += 1
+        self.stats['released'] += released
+        if released:
+            print(f'🧹 Released {released} expired hold(s)')
+        return released
+
+    async def _run(self):
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                print(f'Error sweeping holds: {e}')
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> asyncio.Task:
+        """Start sweeping in the background (no-op if already running)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    def stop(self):
+        """Stop the background sweep"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
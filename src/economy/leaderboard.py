@@ -0,0 +1,260 @@
+"""In-memory ranked leaderboards"""
+
+import random
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from src.database.db_manager import DatabaseManager
+from src.database.ids import snowflake
+from src.database.writer import writes
+
+
+class _Node:
+    __slots__ = ('key', 'next', 'width')
+
+    def __init__(self, key: Any, levels: int):
+        self.key = key
+        self.next: List[Optional['_Node']] = [None] * levels
+        self.width: List[int] = [1] * levels
+
+
+class IndexableSkipList:
+    """
+    Sorted list with O(log n) insert, remove, rank and index lookups
+
+    Each forward link also stores how many items it skips, so positions
+    can be computed on the way down instead of by walking the list.
+    """
+
+    MAX_LEVELS = 32
+
+    def __init__(self):
+        """Initialize an empty list"""
+        self._head = _Node(None, self.MAX_LEVELS)
+        self._size = 0
+        self._random = random.Random()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < self.MAX_LEVELS and self._random.random() < 0.5:
+            level += 1
+        return level
+
+    def insert(self, key: Any):
+        """Insert a key (keys must be unique and comparable)"""
+        chain = [None] * self.MAX_LEVELS
+        steps_at_level = [0] * self.MAX_LEVELS
+        node = self._head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level] is not None and node.next[level].key < key:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+
+        levels = self._random_level()
+        new = _Node(key, levels)
+        steps = 0
+        for level in range(levels):
+            prev = chain[level]
+            new.next[level] = prev.next[level]
+            prev.next[level] = new
+            new.width[level] = prev.width[level] - steps
+            prev.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(levels, self.MAX_LEVELS):
+            chain[level].width[level] += 1
+        self._size += 1
+
+    def remove(self, key: Any):
+        """Remove a key, raises KeyError if it is missing"""
+        chain = [None] * self.MAX_LEVELS
+        node = self._head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level] is not None and node.next[level].key < key:
+                node = node.next[level]
+            chain[level] = node
+
+        target = chain[0].next[0]
+        if target is None or target.key != key:
+            raise KeyError(key)
+
+        for level in range(len(target.next)):
+            prev = chain[level]
+            prev.width[level] += target.width[level] - 1
+            prev.next[level] = target.next[level]
+        for level in range(len(target.next), self.MAX_LEVELS):
+            chain[level].width[level] -= 1
+        self._size -= 1
+
+    def index(self, key: Any) -> int:
+        """0-based position of a key, raises KeyError if it is missing"""
+        position = 0
+        node = self._head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level] is not None and node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+
+        target = node.next[0]
+        if target is None or target.key != key:
+            raise KeyError(key)
+        return position
+
+    def slice(self, start: int, count: int) -> List[Any]:
+        """Up to count keys starting at 0-based position start"""
+        if start < 0 or start >= self._size or count <= 0:
+            return []
+
+        # Walk down to the node at position start, then along the bottom level
+        remaining = start + 1
+        node = self._head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level] is not None and node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+
+        keys = []
+        while node is not None and len(keys) < count:
+            keys.append(node.key)
+            node = node.next[0]
+        return keys
+
+
+class Leaderboard:
+    """One ranking (a scope and a metric), highest score first"""
+
+    def __init__(self):
+        """Initialize an empty ranking"""
+        self._scores: Dict[int, int] = {}
+        self._list = IndexableSkipList()
+
+    def __len__(self) -> int:
+        return len(self._list)
+
+    def update(self, user_id: int, score: int):
+        """Set a user's score, moving them if it changed"""
+        old = self._scores.get(user_id)
+        if old == score:
+            return
+        if old is not None:
+            self._list.remove((-old, user_id))
+        self._scores[user_id] = score
+        self._list.insert((-score, user_id))
+
+    def remove(self, user_id: int):
+        """Drop a user from the ranking"""
+        old = self._scores.pop(user_id, None)
+        if old is not None:
+            self._list.remove((-old, user_id))
+
+    def rank(self, user_id: int) -> Optional[int]:
+        """1-based rank, or None if the user isn't ranked"""
+        score = self._scores.get(user_id)
+        if score is None:
+            return None
+        return self._list.index((-score, user_id)) + 1
+
+    def top(self, n: int = 10, start: int = 1) -> List[Tuple[int, int, int]]:
+        """(rank, user_id, score) for n entries starting at rank start"""
+        keys = self._list.slice(start - 1, n)
+        return [(start + i, user_id, -neg_score) for i, (neg_score, user_id) in enumerate(keys)]
+
+    def around(self, user_id: int, k: int = 2) -> List[Tuple[int, int, int]]:
+        """The user plus up to k entries above and below"""
+        rank = self.rank(user_id)
+        if rank is None:
+            return []
+        start = max(1, rank - k)
+        return self.top(rank + k - start + 1, start)
+
+
+class LeaderboardService:
+    """
+    Leaderboards for every scope (global and per guild) and metric
+
+    Loaded once from the database, then kept current through the
+    DatabaseManager row listener: every settled bet, transfer or daily
+    reward re-ranks the user in O(log n). Only committed writes reach the
+    listener and the load runs on the writer thread, so no read snapshot
+    older than a row already applied can replace it.
+    """
+
+    METRICS = ('coins', 'total_won', 'games_won', 'streak')
+
+    def __init__(self, db: DatabaseManager):
+        """Initialize and load every leaderboard"""
+        self.db = db
+        self.writer = db.writer
+        self._lock = threading.Lock()
+        self._boards: Dict[Tuple[Optional[int], str], Leaderboard] = {}
+        self._rows: Dict[Tuple[Optional[int], int], sqlite3.Row] = {}
+        db.add_row_listener(self.on_row)
+        self.load()
+
+    @writes
+    def load(self):
+        """
+        (Re)build every leaderboard from the users and guild_coins tables
+
+        Runs between writes, so every row a listener call applied before it
+        is in the snapshot and every write after it is applied on top.
+        """
+        conn = self.db.get_connection()
+        users = conn.execute('SELECT * FROM users').fetchall()
+        guild_rows = conn.execute('SELECT * FROM guild_coins').fetchall()
+
+        with self._lock:
+            self._boards.clear()
+            self._rows.clear()
+            for row in users:
+                self._apply(row, None)
+            for row in guild_rows:
+                self._apply(row, row['guild_id'])
+
+    def _board(self, scope: Optional[int], metric: str) -> Leaderboard:
+        board = self._boards.get((scope, metric))
+        if board is None:
+            board = self._boards[(scope, metric)] = Leaderboard()
+        return board
+
+    def _apply(self, row: sqlite3.Row, scope: Optional[int]):
+        user_id = row['user_id']
+        self._rows[(scope, user_id)] = row
+        for metric in self.METRICS:
+            self._board(scope, metric).update(user_id, row[metric] or 0)
+
+    def on_row(self, row: sqlite3.Row, guild_id: int = None):
+        """Row listener: re-rank the user whose row a committed write changed"""
+        with self._lock:
+            self._apply(row, snowflake(guild_id))
+
+    def _entries(self, scope: Optional[int], ranked: List[Tuple[int, int, int]]) -> List[Tuple[int, sqlite3.Row]]:
+        return [(rank, self._rows[(scope, user_id)]) for rank, user_id, _ in ranked]
+
+    def top(self, n: int = 10, metric: str = 'coins', guild_id: int = None) -> List[Tuple[int, sqlite3.Row]]:
+        """(rank, row) for the top n users"""
+        scope = snowflake(guild_id)
+        with self._lock:
+            return self._entries(scope, self._board(scope, metric).top(n))
+
+    def rank(self, user_id: int, metric: str = 'coins', guild_id: int = None) -> Tuple[Optional[int], int]:
+        """
+        Get a user's rank
+
+        Returns:
+            tuple: (1-based rank or None if unranked, number of ranked users)
+        """
+        scope = snowflake(guild_id)
+        with self._lock:
+            board = self._board(scope, metric)
+            return board.rank(snowflake(user_id)), len(board)
+
+    def around(self, user_id: int, k: int = 2, metric: str = 'coins',
+               guild_id: int = None) -> List[Tuple[int, sqlite3.Row]]:
+        """(rank, row) for the user and up to k neighbours on each side"""
+        scope = snowflake(guild_id)
+        with self._lock:
+            return self._entries(scope, self._board(scope, metric).around(snowflake(user_id), k))
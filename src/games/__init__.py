@@ -1,5 +1,6 @@
 """Casino games module"""
 
+from .plugin import PLUGINS, GamePlugin, Outcome, Round, register
 from .roulette import RouletteGame
 from .slots import SlotsGame
 from .dice import DiceGame
@@ -20,6 +21,11 @@ from .scratch import ScratchCardGame
 from .videopoker import VideoPokerGame
 
 __all__ = [
+    'PLUGINS',
+    'GamePlugin',
+    'Outcome',
+    'Round',
+    'register',
     'RouletteGame',
     'SlotsGame',
     'DiceGame',
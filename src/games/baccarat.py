@@ -2,11 +2,17 @@
 
 import random
 from typing import Tuple, List
+from .plugin import GamePlugin, Outcome, Round, register
 
 
-class BaccaratGame:
+@register
+class BaccaratGame(GamePlugin):
     """Simplified Baccarat casino game"""
     
+    name = 'baccarat'
+    title = '🎴 Baccarat'
+    signed_result = True
+    
     # Card values in Baccarat
     CARD_VALUES = {
         'A': 1, '2': 2, '3': 3, '4': 4, '5': 5,
@@ -129,3 +135,28 @@ class BaccaratGame:
         """Format hand for display"""
         cards_str = ' '.join(hand)
         return f"🃏 {cards_str} = **{value}**"
+    
+    # GamePlugin
+    
+    @classmethod
+    def validate(cls, bet_type: str):
+        if not cls.validate_bet(bet_type):
+            return '❌ Aposta inválida! Use: jogador, banca ou empate'
+        return None
+    
+    @classmethod
+    def play(cls, bet_type: str) -> Outcome:
+        winner, player_hand, banker_hand, player_value, banker_value = cls.play_game()
+        won, multiplier = cls.calculate_win(winner, bet_type)
+        return Outcome(won, multiplier, winner=winner, player_hand=player_hand, banker_hand=banker_hand,
+                       player_value=player_value, banker_value=banker_value)
+    
+    @classmethod
+    def render(cls, round: Round):
+        outcome = round.outcome
+        return None, [
+            ('Jogador', cls.format_hand(outcome.player_hand, outcome.player_value), False),
+            ('Banca', cls.format_hand(outcome.banker_hand, outcome.banker_value), False),
+            ('Vencedor', outcome.winner.title(), True),
+            ('Your Bet', round.args[0].title(), True),
+        ]
@@ -0,0 +1,62 @@
+"""Spins per second of the weighted games' draws: python -m src.games.bench"""
+
+import random
+import time
+from typing import Any, Callable, Dict
+from .slots import SlotsGame
+from .tigrinho import TigrinhoGame
+from .double import DoubleGame
+from .wheel import WheelGame
+from .scratch import ScratchCardGame
+
+
+def benchmark(seconds: float = 0.5) -> Dict[str, Dict[str, float]]:
+    """
+    Spins per second of every weighted game, random.choices vs alias tables
+
+    Each entry draws as many outcomes as one round needs, the choices
+    side the way the games did before (tigrinho by row, scratch by cell).
+    """
+    def choices(items, calls: int, k: int) -> Callable[[], Any]:
+        # Weights gathered per spin, cumulative weights rebuilt per call
+        population = list(items)
+        values = list(items.values()) if isinstance(items, dict) else population
+
+        def spin():
+            weights = [v['weight'] for v in values]
+            return [random.choices(population, weights=weights, k=k) for _ in range(calls)]
+        return spin
+
+    cases = {
+        'slots': (SlotsGame.SYMBOLS, SlotsGame.REEL, 1, 3),
+        'tigrinho': (TigrinhoGame.SYMBOLS, TigrinhoGame.REEL, 3, 3),
+        'double': (DoubleGame.COLORS, DoubleGame.WHEEL, 1, 1),
+        'wheel': (WheelGame.SEGMENTS, WheelGame.WHEEL, 1, 1),
+        'scratch': (ScratchCardGame.PRIZES, ScratchCardGame.CELL, ScratchCardGame.CARD_SIZE, 1),
+    }
+    results = {}
+    for name, (items, table, calls, k) in cases.items():
+        draws = calls * k
+        spins = {
+            'choices': choices(items, calls, k),
+            'alias': table.draw if draws == 1 else (lambda table=table, draws=draws: table.draws(draws)),
+        }
+        results[name] = {}
+        for label, spin in spins.items():
+            count, start = 0, time.perf_counter()
+            while time.perf_counter() - start < seconds:
+                for _ in range(1000):
+                    spin()
+                count += 1000
+            results[name][label] = count / (time.perf_counter() - start)
+    return results
+
+
+def main():
+    print(f'{"game":<10}{"choices/s":>12}{"alias/s":>12}{"speedup":>9}')
+    for game, rates in benchmark().items():
+        print(f'{game:<10}{rates["choices"]:>12,.0f}{rates["alias"]:>12,.0f}{rates["alias"] / rates["choices"]:>8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -2,11 +2,16 @@
 
 import random
 from typing import Tuple
+from .plugin import GamePlugin, Outcome, Round, register
 
 
-class CoinFlipGame:
+@register
+class CoinFlipGame(GamePlugin):
     """Simple coin flip betting game"""
     
+    name = 'coinflip'
+    title = '🪙 Cara ou Coroa'
+    
     SIDES = {
         'cara': '👤',
         'coroa': '👑',
@@ -56,3 +61,25 @@ class CoinFlipGame:
     def get_animation_frames() -> list:
         """Get animation frames for coin flipping"""
         return ['🪙', '💫', '✨', '⭐']
+    
+    # GamePlugin
+    
+    @classmethod
+    def validate(cls, choice: str):
+        if not cls.validate_choice(choice):
+            return '❌ Escolha inválida! Use: cara, coroa, heads ou tails'
+        return None
+    
+    @classmethod
+    def play(cls, choice: str) -> Outcome:
+        result = cls.flip()
+        won, multiplier = cls.check_win(result, choice)
+        return Outcome(won, multiplier, result=result)
+    
+    @classmethod
+    def render(cls, round: Round):
+        return None, [
+            ('Result', cls.format_result(round.outcome.result), False),
+            ('Sua Escolha', round.args[0].title(), True),
+            ('Bet', f'{round.bet_amount:,} 🪙', True),
+        ]
@@ -2,16 +2,22 @@
 
 import random
 from typing import Tuple
+from .plugin import GamePlugin, Outcome, RESULT, Round, register
 
 
-class CrashGame:
+@register
+class CrashGame(GamePlugin):
     """
     Crash game - Multiplier starts at 1.0x and increases until it crashes
     Player must cash out before the crash to win
     """
     
+    name = 'crash'
+    title = '🚀 Crash'
+    provably_fair = True
+    
     @staticmethod
-    def generate_crash_point() -> float:
+    def generate_crash_point(rng: random.Random = None) -> float:
         """
         Generate a crash point using house edge
         Uses exponential distribution for realistic crash behavior
@@ -20,7 +26,7 @@ class CrashGame:
         # Use inverse exponential distribution
         # This creates realistic crash behavior with occasional high multipliers
         house_edge = 0.01
-        random_value = random.random()
+        random_value = (rng or random).random()
         
         # Ensure we don't get zero or negative
         if random_value <= 0.0001:
@@ -132,3 +138,33 @@ class CrashGame:
             return '🟠 Alto Risco'
         else:
             return '🔴 Risco Extremo'
+    
+    # GamePlugin
+    
+    @classmethod
+    def validate(cls, target_multiplier: float):
+        if target_multiplier < 1.1 or target_multiplier > 100:
+            return '❌ O multiplicador deve estar entre 1.1x e 100x!'
+        return None
+    
+    @classmethod
+    def play(cls, target_multiplier: float, rng: random.Random = None) -> Outcome:
+        crash_point = cls.generate_crash_point(rng)
+        won, _ = cls.simulate_crash(crash_point, target_multiplier)
+        return Outcome(won, target_multiplier if won else 0, crash_point=crash_point, target=target_multiplier)
+    
+    @classmethod
+    def render(cls, round: Round):
+        outcome = round.outcome
+        bet = ('Bet', f'{round.bet_amount:,} 🪙', True)
+        if outcome.won:
+            crash_point = ('Crash Point', f'The game crashed at {outcome.crash_point:.2f}x', False)
+            return f'✅ You cashed out at **{outcome.target:.2f}x**!', [RESULT, crash_point, bet]
+        return cls.format_crash(outcome.crash_point), [RESULT, bet]
+    
+    @classmethod
+    def result_field(cls, round: Round):
+        target = round.outcome.target
+        if round.outcome.won:
+            return '🎉 WON!', f'+{round.net_change:,} 🪙 ({target:.2f}x)'
+        return '❌ Lost', f'{round.net_change:,} 🪙\nCrash antes do alvo {target:.2f}x'
@@ -2,11 +2,16 @@
 
 import random
 from typing import Tuple
+from .plugin import GamePlugin, Outcome, Round, register
 
 
-class DiceGame:
+@register
+class DiceGame(GamePlugin):
     """Simple dice betting game"""
     
+    name = 'dados'
+    title = '🎲 Dados'
+    
     @staticmethod
     def roll_dice(num_dice: int = 2) -> list:
         """Roll dice"""
@@ -20,7 +25,15 @@ class DiceGame:
         """
         dice = DiceGame.roll_dice(2)
         total = sum(dice)
-        
+        won, multiplier = DiceGame.check_over_under(bet_type, total, threshold)
+        return won, dice, total, multiplier
+    
+    @staticmethod
+    def check_over_under(bet_type: str, total: int, threshold: int = 7) -> Tuple[bool, float]:
+        """
+        Check an over/under bet against the total of 2 dice
+        Returns: (won, multiplier)
+        """
         bet_type = bet_type.lower()
         
         won = False
@@ -30,11 +43,11 @@ class DiceGame:
             won = True
         elif bet_type in ['under', 'abaixo'] and total < threshold:
             won = True
-        elif bet_type == 'seven' or bet_type == 'sete' and total == threshold:
+        elif bet_type in ['seven', 'sete'] and total == threshold:
             won = True
             multiplier = 5.0  # Higher payout for exact 7
         
-        return won, dice, total, multiplier
+        return won, multiplier
     
     @staticmethod
     def play_high_low(prediction: str) -> Tuple[bool, int, float]:
@@ -43,6 +56,15 @@ class DiceGame:
         Returns: (won, roll, multiplier)
         """
         roll = random.randint(1, 6)
+        won, multiplier = DiceGame.check_high_low(prediction, roll)
+        return won, roll, multiplier
+    
+    @staticmethod
+    def check_high_low(prediction: str, roll: int) -> Tuple[bool, float]:
+        """
+        Check a high/low bet against a roll of 1 die
+        Returns: (won, multiplier)
+        """
         prediction = prediction.lower()
         
         won = False
@@ -54,7 +76,7 @@ class DiceGame:
         elif prediction in ['low', 'baixo'] and roll <= 3:
             won = True
         
-        return won, roll, multiplier
+        return won, multiplier
     
     @staticmethod
     def play_specific_number(bet_number: int) -> Tuple[bool, int, float]:
@@ -80,3 +102,37 @@ class DiceGame:
             6: '⚅'
         }
         return ' '.join([dice_emoji.get(d, '?') for d in dice])
+    
+    # GamePlugin
+    
+    @classmethod
+    def validate(cls, bet_type: str):
+        bet_type = bet_type.lower()
+        if bet_type in ['acima', 'abaixo', 'sete', 'seven', 'alto', 'baixo', 'high', 'low']:
+            return None
+        if bet_type.isdigit() and 1 <= int(bet_type) <= 6:
+            return None
+        return '❌ Invalid bet type!'
+    
+    @classmethod
+    def play(cls, bet_type: str) -> Outcome:
+        bet_type_lower = bet_type.lower()
+        dice_emoji = ['⚀', '⚁', '⚂', '⚃', '⚄', '⚅']
+        if bet_type_lower in ['acima', 'abaixo', 'sete', 'seven']:
+            won, dice, total, multiplier = cls.play_over_under(bet_type_lower)
+            result_text = f'{cls.format_dice(dice)}\nTotal: **{total}**'
+        elif bet_type_lower in ['alto', 'baixo', 'high', 'low']:
+            won, roll, multiplier = cls.play_high_low(bet_type_lower)
+            result_text = f'{dice_emoji[roll-1]} **{roll}**'
+        else:
+            won, roll, multiplier = cls.play_specific_number(int(bet_type))
+            result_text = f'{dice_emoji[roll-1]} **{roll}**'
+        return Outcome(won, multiplier, result_text=result_text)
+    
+    @classmethod
+    def render(cls, round: Round):
+        return None, [
+            ('Result', round.outcome.result_text, False),
+            ('Your Bet', round.args[0], True),
+            ('Amount', f'{round.bet_amount:,} 🪙', True),
+        ]
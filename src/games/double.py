@@ -2,47 +2,48 @@
 
 import random
 from typing import Tuple
+from .plugin import GamePlugin, Outcome, RESULT, Round, register
+from .rng import AliasTable
 
 
-class DoubleGame:
+@register
+class DoubleGame(GamePlugin):
     """
     Double game - A simple color betting game
     Bet on Red, Black, or White
     Red/Black pays 2x, White pays 14x
     """
     
+    name = 'double'
+    title = '🎡 Double'
+    provably_fair = True
+    
     # Color definitions with their probabilities
     COLORS = {
         'vermelho': {'emoji': '🔴', 'weight': 7, 'multiplier': 2.0, 'name': 'Vermelho'},
         'preto': {'emoji': '⚫', 'weight': 7, 'multiplier': 2.0, 'name': 'Preto'},
         'branco': {'emoji': '⚪', 'weight': 1, 'multiplier': 14.0, 'name': 'Branco'},
     }
+    WHEEL = AliasTable.from_items(COLORS)
     
     # Recent results history (for display)
     history = []
     MAX_HISTORY = 10
     
     @staticmethod
-    def spin() -> str:
+    def spin(rng: random.Random = None) -> str:
         """
         Spin the color wheel
         Returns the color that landed (as key name)
         """
-        colors = []
-        weights = []
-        
-        for color_key, data in DoubleGame.COLORS.items():
-            colors.append(color_key)
-            weights.append(data['weight'])
-        
-        result = random.choices(colors, weights=weights, k=1)[0]
-        
-        # Add to history
+        return DoubleGame.WHEEL.draw(rng)
+    
+    @staticmethod
+    def remember(result: str):
+        """Add an announced result to the history"""
         DoubleGame.history.append(result)
         if len(DoubleGame.history) > DoubleGame.MAX_HISTORY:
             DoubleGame.history.pop(0)
-        
-        return result
     
     @staticmethod
     def check_win(result: str, bet_color: str) -> Tuple[bool, float]:
@@ -136,3 +137,35 @@ class DoubleGame:
         }
         
         return color_lower in color_aliases
+    
+    # GamePlugin
+    
+    @classmethod
+    def validate(cls, bet_color: str):
+        if not cls.validate_color(bet_color):
+            return f'❌ Cor inválida! Use: vermelho, preto ou branco\n\n{cls.get_color_info()}'
+        return None
+    
+    @classmethod
+    def play(cls, bet_color: str, rng: random.Random = None) -> Outcome:
+        result = cls.spin(rng)
+        won, multiplier = cls.check_win(result, bet_color)
+        return Outcome(won, multiplier, result=result)
+    
+    @classmethod
+    def render(cls, round: Round):
+        # Only announced rounds, not replays (/verify) or refused bets
+        cls.remember(round.outcome.result)
+        return None, [
+            ('Result', cls.format_result(round.outcome.result), False),
+            ('Your Bet', round.args[0].title(), True),
+            ('Amount', f'{round.bet_amount:,} 🪙', True),
+            RESULT,
+            ('Histórico Recente', cls.format_history(), False),
+        ]
+    
+    @classmethod
+    def result_field(cls, round: Round):
+        if round.outcome.won:
+            return '🎉 WON!', f'+{round.net_change:,} 🪙 ({round.outcome.multiplier:.0f}x)'
+        return super().result_field(round)
@@ -0,0 +1,135 @@
+"""
+Provably fair randomness: server seed hash chains and HMAC outcome streams
+
+Chain: h0 is 32 random bytes and h(i+1) = SHA256(h(i)), up to h(N). Only
+the terminal hash h(N) is published. Rounds use the links backwards, the
+round at position p of a chain gets server seed h(N-1-p), so SHA256 of a
+revealed seed is the seed of the round before it (the published hash
+for p = 0) and no revealed seed says anything about the rounds after it.
+
+Outcome: the bytes of HMAC-SHA256(key=server seed,
+msg='<client seed>:<nonce>:<cursor>') for cursor = 0, 1, ... are read in
+order. random() takes the next 8 bytes, big-endian, keeps the top 53
+bits and divides by 2^53. getrandbits(k) takes the next ceil(k/8) bytes,
+big-endian, minus the extra low bits. Games draw from FairRandom exactly
+as they draw from random.Random.
+"""
+
+import argparse
+import hashlib
+import hmac
+import mmap
+import os
+import random
+
+LINK_SIZE = hashlib.sha256().digest_size
+
+# Links per chain, 32 bytes each on disk
+CHAIN_LENGTH = 1_000_000
+
+
+def next_link(seed: bytes) -> bytes:
+    """The hash a seed commits to: the previous round's seed, or the published hash"""
+    return hashlib.sha256(seed).digest()
+
+
+def generate_chain(path: str, length: int = CHAIN_LENGTH, secret: bytes = None) -> str:
+    """
+    Write a new chain of length usable links to path
+
+    The file is the raw links h0 ... h(length), written to a temporary
+    file and moved into place once complete.
+
+    Returns:
+        str: The terminal (published) hash, hex
+    """
+    link = secret or os.urandom(LINK_SIZE)
+    sha256 = hashlib.sha256
+    tmp = f'{path}.tmp'
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(tmp, 'wb') as f:
+        remaining = length + 1
+        while remaining:
+            chunk = []
+            for _ in range(min(remaining, 65536)):
+                chunk.append(link)
+                link = sha256(link).digest()
+            f.write(b''.join(chunk))
+            remaining -= len(chunk)
+    os.replace(tmp, path)
+    return chunk[-1].hex()
+
+
+class HashChain:
+    """A generated chain on disk, its links read by position in O(1)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        # h0 ... h(length), the last one is only ever published
+        self.length = len(self._map) // LINK_SIZE - 1
+        self.terminal = self._link(self.length).hex()
+
+    def _link(self, index: int) -> bytes:
+        offset = index * LINK_SIZE
+        return self._map[offset:offset + LINK_SIZE]
+
+    def seed(self, position: int) -> bytes:
+        """Server seed of the round at position (0 = first round played on this chain)"""
+        if not 0 <= position < self.length:
+            raise IndexError(f'Chain position {position} out of range (0-{self.length - 1})')
+        return self._link(self.length - 1 - position)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+class FairRandom(random.Random):
+    """The deterministic random stream of one round"""
+
+    def __init__(self, server_seed: bytes, client_seed: str, nonce: int):
+        self.server_seed = server_seed
+        self.client_seed = client_seed
+        self.nonce = nonce
+        self._cursor = 0
+        self._buffer = b''
+        super().__init__()
+
+    def seed(self, *args, **kwargs):
+        # Fully determined by the seeds and nonce, random.Random.__init__ calls this
+        pass
+
+    def _take(self, n: int) -> bytes:
+        while len(self._buffer) < n:
+            message = f'{self.client_seed}:{self.nonce}:{self._cursor}'.encode()
+            self._buffer += hmac.new(self.server_seed, message, hashlib.sha256).digest()
+            self._cursor += 1
+        taken, self._buffer = self._buffer[:n], self._buffer[n:]
+        return taken
+
+    def random(self) -> float:
+        return (int.from_bytes(self._take(8), 'big') >> 11) / (1 << 53)
+
+    def getrandbits(self, k: int) -> int:
+        if k < 0:
+            raise ValueError('number of bits must be non-negative')
+        size = (k + 7) // 8
+        return int.from_bytes(self._take(size), 'big') >> (size * 8 - k)
+
+    def randbytes(self, n: int) -> bytes:
+        return self._take(n)
+
+
+def main():
+    """Generate a chain from the command line (the bot runs this in a background process)"""
+    parser = argparse.ArgumentParser(description='Generate a provably fair server seed hash chain')
+    parser.add_argument('path', help='Chain file to write')
+    parser.add_argument('--links', type=int, default=CHAIN_LENGTH, help='Usable links (rounds) in the chain')
+    args = parser.parse_args()
+    print(generate_chain(args.path, args.links))
+
+
+if __name__ == '__main__':
+    main()
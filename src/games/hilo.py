@@ -2,11 +2,17 @@
 
 import random
 from typing import Tuple
+from .plugin import GamePlugin, Outcome, Round, register
 
 
-class HiLoGame:
+@register
+class HiLoGame(GamePlugin):
     """Hi-Lo card guessing game"""
     
+    name = 'hilo'
+    title = '🎴 Hi-Lo'
+    signed_result = True
+    
     CARDS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
     CARD_VALUES = {
         '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7,
@@ -73,20 +79,25 @@ class HiLoGame:
         emoji = HiLoGame.CARD_EMOJIS.get(card, '🎴')
         return f"{emoji} **{card}**"
     
-    @staticmethod
-    def get_odds(current: str) -> str:
-        """Get odds description for current card"""
-        value = HiLoGame.CARD_VALUES[current]
-        
-        higher = sum(1 for v in HiLoGame.CARD_VALUES.values() if v > value)
-        lower = sum(1 for v in HiLoGame.CARD_VALUES.values() if v < value)
-        same = sum(1 for v in HiLoGame.CARD_VALUES.values() if v == value) - 1  # -1 for current card
-        
-        total = len(HiLoGame.CARDS) - 1
-        
-        return (
-            f"📊 **Probabilidades:**\n"
-            f"🔺 Alto: {higher}/{total} ({higher/total*100:.1f}%)\n"
-            f"🔻 Baixo: {lower}/{total} ({lower/total*100:.1f}%)\n"
-            f"➖ Igual: {same}/{total} ({same/total*100:.1f}%) - 14x"
-        )
+    # GamePlugin
+    
+    @classmethod
+    def validate(cls, guess: str):
+        if not cls.validate_guess(guess):
+            return '❌ Escolha inválida! Use: alto, baixo ou igual'
+        return None
+    
+    @classmethod
+    def play(cls, guess: str) -> Outcome:
+        current = cls.draw_card()
+        next_card = cls.draw_card()
+        won, multiplier = cls.compare_cards(current, next_card, guess)
+        return Outcome(won, multiplier, current=current, next_card=next_card)
+    
+    @classmethod
+    def render(cls, round: Round):
+        return None, [
+            ('Carta Anterior', cls.format_card(round.outcome.current), True),
+            ('Nova Carta', cls.format_card(round.outcome.next_card), True),
+            ('Sua Escolha', round.args[0].title(), True),
+        ]
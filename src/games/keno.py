@@ -2,11 +2,17 @@
 
 import random
 from typing import Tuple, List
+from .plugin import GamePlugin, Outcome, Round, register
 
 
-class KenoGame:
+@register
+class KenoGame(GamePlugin):
     """Keno number lottery game"""
     
+    name = 'keno'
+    title = '🎱 Keno'
+    signed_result = True
+    
     MIN_NUMBERS = 1
     MAX_NUMBERS = 10
     NUMBER_RANGE = 40  # Numbers 1-40
@@ -91,3 +97,28 @@ class KenoGame:
             "• Escolhendo 5 números: 3 acertos = 2x, 4 acertos = 8x, 5 acertos = 40x\n"
             "• Escolhendo 10 números: 10 acertos = 500x jackpot!"
         )
+    
+    # GamePlugin
+    
+    @classmethod
+    def validate(cls, *numbers: int):
+        if not cls.validate_numbers(list(numbers), len(numbers)):
+            return f'❌ Escolha de {cls.MIN_NUMBERS} a {cls.MAX_NUMBERS} números únicos entre 1 e {cls.NUMBER_RANGE}!'
+        return None
+    
+    @classmethod
+    def play(cls, *numbers: int) -> Outcome:
+        drawn = cls.draw_numbers()
+        matches = cls.check_matches(list(numbers), drawn)
+        won, multiplier = cls.calculate_win(len(numbers), matches)
+        return Outcome(won, multiplier, drawn=drawn, matches=matches)
+    
+    @classmethod
+    def render(cls, round: Round):
+        numbers, outcome = list(round.args), round.outcome
+        return None, [
+            ('Seus Números', cls.format_numbers(numbers, outcome.drawn), False),
+            ('Sorteados', cls.format_numbers(outcome.drawn), False),
+            ('Acertos', f'**{outcome.matches}/{len(numbers)}**', True),
+            ('Bet', f'{round.bet_amount:,} 🪙', True),
+        ]
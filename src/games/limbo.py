@@ -2,11 +2,18 @@
 
 import random
 from typing import Tuple
+from .plugin import GamePlugin, Outcome, Round, register
 
 
-class LimboGame:
+@register
+class LimboGame(GamePlugin):
     """Limbo multiplier bar game"""
     
+    name = 'limbo'
+    title = '🎲 Limbo'
+    signed_result = True
+    provably_fair = True
+    
     MIN_TARGET = 1.01
     MAX_TARGET = 1000.0
     
@@ -16,13 +23,13 @@ class LimboGame:
         return LimboGame.MIN_TARGET <= target <= LimboGame.MAX_TARGET
     
     @staticmethod
-    def generate_result() -> float:
+    def generate_result(rng: random.Random = None) -> float:
         """Generate a random limbo result"""
         # Generate with exponential distribution for realistic results
         # Most results will be low, with occasional high values
         
         # Use inverse transform sampling for exponential-like distribution
-        r = random.random()
+        r = (rng or random).random()
         
         # Adjust to favor lower multipliers
         if r < 0.5:
@@ -72,18 +79,6 @@ class LimboGame:
         else:
             return "💀 Extreme Risk"
     
-    @staticmethod
-    def calculate_win_chance(target: float) -> float:
-        """Calculate approximate win chance percentage"""
-        # Simplified calculation based on house edge
-        # Higher target = lower chance
-        if target <= 1.0:
-            return 99.0
-        
-        # Approximate: 99% / target (with house edge adjustment)
-        chance = (99.0 / target)
-        return min(99.0, max(0.1, chance))
-    
     @staticmethod
     def format_bar(result: float, max_display: float = 20.0) -> str:
         """Format limbo bar animation"""
@@ -109,3 +104,25 @@ class LimboGame:
             "• Target 10.0x: ~10% chance\n"
             "• Target 100.0x: ~1% chance"
         )
+    
+    # GamePlugin
+    
+    @classmethod
+    def validate(cls, target: float):
+        if not cls.validate_target(target):
+            return f'❌ Multiplicador entre {cls.MIN_TARGET}x e {cls.MAX_TARGET}x!'
+        return None
+    
+    @classmethod
+    def play(cls, target: float, rng: random.Random = None) -> Outcome:
+        result = cls.generate_result(rng)
+        won, multiplier = cls.check_win(result, target)
+        return Outcome(won, multiplier, result=result)
+    
+    @classmethod
+    def render(cls, round: Round):
+        target = round.args[0]
+        return cls.format_result(round.outcome.result, target, round.outcome.won), [
+            ('Bet', f'{round.bet_amount:,} 🪙', True),
+            ('Alvo', f'{target}x', True),
+        ]
@@ -0,0 +1,372 @@
+"""Exact odds and expected value of the casino games"""
+
+import hashlib
+import json
+import os
+from fractions import Fraction
+from itertools import product
+from math import comb
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from .roulette import RouletteGame
+from .slots import SlotsGame
+from .dice import DiceGame
+from .plinko import PlinkoGame
+from .keno import KenoGame
+from .hilo import HiLoGame
+from .scratch import ScratchCardGame
+from .wheel import WheelGame
+from .double import DoubleGame
+from .coinflip import CoinFlipGame
+from .limbo import LimboGame
+from .crash import CrashGame
+
+# Targets tabulated for the games with a free multiplier target
+TARGETS = {
+    'limbo': (1.5, 2.0, 5.0, 10.0, 100.0, 1000.0),
+    'crash': (1.1, 1.5, 2.0, 5.0, 10.0, 100.0),
+}
+
+# The games' results are rounded to 2 decimals, a target is reached from half a cent below it
+HALF_CENT = Fraction(1, 200)
+
+
+class Line:
+    """One outcome of a bet: its chance and what it pays (multiplier x bet, 0 if lost)"""
+
+    def __init__(self, label: str, probability: float, multiplier: float):
+        self.label = label
+        self.probability = probability
+        self.multiplier = multiplier
+
+    def to_dict(self) -> dict:
+        return {'label': self.label, 'probability': self.probability, 'multiplier': self.multiplier}
+
+
+class OddsTable:
+    """Every outcome of one bet"""
+
+    def __init__(self, bet: str, lines: List[Line]):
+        self.bet = bet
+        self.lines = lines
+
+    @property
+    def win_chance(self) -> float:
+        """Probability the bet pays anything"""
+        return sum(line.probability for line in self.lines if line.multiplier > 0)
+
+    @property
+    def rtp(self) -> float:
+        """Expected return per unit bet (1 - house edge)"""
+        return sum(line.probability * line.multiplier for line in self.lines)
+
+    def to_dict(self) -> dict:
+        return {'bet': self.bet, 'win_chance': self.win_chance, 'rtp': self.rtp,
+                'lines': [line.to_dict() for line in self.lines]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'OddsTable':
+        return cls(data['bet'], [Line(**line) for line in data['lines']])
+
+
+# Game name -> builder of its tables
+BUILDERS: Dict[str, Callable[[], List[OddsTable]]] = {}
+
+
+def builds(game):
+    """Decorator registering the table builder of a game (keyed by its plugin name)"""
+    def decorator(builder):
+        BUILDERS[game.name] = builder
+        return builder
+    return decorator
+
+
+def _table(bet: str, outcomes: Iterable[Tuple[Fraction, str, bool, float]]) -> OddsTable:
+    """
+    Sum equally labelled outcomes into lines
+
+    Outcomes are (probability, label, won, multiplier) as the game's own
+    rule returns them. A lost outcome pays nothing whatever its multiplier,
+    like process_bet.
+    """
+    lines: Dict[Tuple[str, float], Fraction] = {}
+    for probability, label, won, multiplier in outcomes:
+        key = (label, float(multiplier) if won else 0.0)
+        lines[key] = lines.get(key, Fraction(0)) + probability
+    return OddsTable(bet, [Line(label, float(probability), paid)
+                           for (label, paid), probability in lines.items() if probability])
+
+
+def _won(won: bool) -> str:
+    return 'Win' if won else 'Lose'
+
+
+def _weights(items) -> List[Fraction]:
+    # From the decimal text, so weights like 0.08 stay exact
+    weights = [Fraction(str(item['weight'])) for item in items]
+    total = sum(weights)
+    return [weight / total for weight in weights]
+
+
+@builds(RouletteGame)
+def roulette() -> List[OddsTable]:
+    bets = [('numero', '17', 'numero <0-36>'), ('cor', 'vermelho', None), ('cor', 'preto', None),
+            ('paridade', 'par', None), ('paridade', 'impar', None),
+            ('altura', 'baixo', None), ('altura', 'alto', None)]
+    tables = []
+    for bet_type, bet_value, label in bets:
+        outcomes = []
+        for number in range(37):
+            won, multiplier = RouletteGame.check_bet(number, bet_type, bet_value)
+            outcomes.append((Fraction(1, 37), _won(won), won, multiplier))
+        tables.append(_table(label or f'{bet_type} {bet_value}', outcomes))
+    return tables
+
+
+@builds(DiceGame)
+def dice() -> List[OddsTable]:
+    pairs = list(product(range(1, 7), repeat=2))
+    tables = []
+    for bet_type in ('acima', 'abaixo', 'sete'):
+        outcomes = []
+        for dice_pair in pairs:
+            won, multiplier = DiceGame.check_over_under(bet_type, sum(dice_pair))
+            outcomes.append((Fraction(1, 36), _won(won), won, multiplier))
+        tables.append(_table(bet_type, outcomes))
+    for prediction in ('alto', 'baixo'):
+        outcomes = []
+        for roll in range(1, 7):
+            won, multiplier = DiceGame.check_high_low(prediction, roll)
+            outcomes.append((Fraction(1, 6), _won(won), won, multiplier))
+        tables.append(_table(prediction, outcomes))
+    # Every number 1-6 has the same odds
+    outcomes = [(Fraction(1, 6), _won(roll == 1), roll == 1, 6.0) for roll in range(1, 7)]
+    tables.append(_table('1-6', outcomes))
+    return tables
+
+
+@builds(SlotsGame)
+def slots() -> List[OddsTable]:
+    symbols = list(SlotsGame.SYMBOLS)
+    weights = dict(zip(symbols, _weights(SlotsGame.SYMBOLS.values())))
+    outcomes = []
+    for reels in product(symbols, repeat=3):
+        won, multiplier, description = SlotsGame.calculate_win(list(reels))
+        probability = weights[reels[0]] * weights[reels[1]] * weights[reels[2]]
+        outcomes.append((probability, description, won, multiplier))
+    table = _table('spin', outcomes)
+    table.lines.sort(key=lambda line: -line.multiplier)
+    return [table]
+
+
+@builds(PlinkoGame)
+def plinko() -> List[OddsTable]:
+    rows = PlinkoGame.ROWS
+    # The ball moves right on each row with probability 1/2
+    positions = [(Fraction(comb(rows, k), 2 ** rows), k) for k in range(rows + 1)]
+    tables = []
+    for risk in PlinkoGame.RISK_LEVELS:
+        outcomes = []
+        for probability, position in positions:
+            slot = PlinkoGame.slot_for(position, rows)
+            won, multiplier = PlinkoGame.calculate_win(slot, risk)
+            outcomes.append((probability, f'Slot {slot} ({multiplier}x)', won, multiplier))
+        table = _table(risk, outcomes)
+        table.lines.sort(key=lambda line: int(line.label.split()[1]))
+        tables.append(table)
+    return tables
+
+
+@builds(KenoGame)
+def keno() -> List[OddsTable]:
+    total, drawn = KenoGame.NUMBER_RANGE, KenoGame.DRAW_COUNT
+    tables = []
+    for picks in KenoGame.MULTIPLIERS:
+        outcomes = []
+        for matches in range(picks + 1):
+            # Hypergeometric: matches of the picks among the drawn numbers
+            probability = Fraction(comb(picks, matches) * comb(total - picks, drawn - matches), comb(total, drawn))
+            won, multiplier = KenoGame.calculate_win(picks, matches)
+            outcomes.append((probability, f'{matches} acertos', won, multiplier))
+        tables.append(_table(f'{picks} números', outcomes))
+    return tables
+
+
+@builds(HiLoGame)
+def hilo() -> List[OddsTable]:
+    # Both cards are drawn (with replacement) after the guess
+    cards = HiLoGame.CARDS
+    probability = Fraction(1, len(cards) ** 2)
+    tables = []
+    for guess in ('alto', 'baixo', 'igual'):
+        outcomes = []
+        for current, next_card in product(cards, repeat=2):
+            won, multiplier = HiLoGame.compare_cards(current, next_card, guess)
+            outcomes.append((probability, _won(won), won, multiplier))
+        tables.append(_table(guess, outcomes))
+    return tables
+
+
+@builds(ScratchCardGame)
+def scratch() -> List[OddsTable]:
+    prizes = sorted(ScratchCardGame.PRIZES, key=lambda p: p['multiplier'])
+    cells = ScratchCardGame.CARD_SIZE
+    # The card pays its best cell: P(best <= prize i) = F(i)^cells
+    outcomes, cdf, below = [], Fraction(0), Fraction(0)
+    for prize, weight in zip(prizes, _weights(prizes)):
+        cdf += weight
+        outcomes.append((cdf ** cells - below, f"{prize['emoji']} {prize['label']}",
+                         prize['multiplier'] > 0, prize['multiplier']))
+        below = cdf ** cells
+    table = _table('card', outcomes)
+    table.lines.reverse()
+    return [table]
+
+
+@builds(WheelGame)
+def wheel() -> List[OddsTable]:
+    outcomes = []
+    for segment, probability in zip(WheelGame.SEGMENTS, _weights(WheelGame.SEGMENTS)):
+        won, multiplier, description = WheelGame.calculate_win(segment)
+        outcomes.append((probability, description, won, multiplier))
+    return [_table('spin', outcomes)]
+
+
+@builds(DoubleGame)
+def double() -> List[OddsTable]:
+    colors = list(DoubleGame.COLORS)
+    weights = _weights(DoubleGame.COLORS.values())
+    tables = []
+    for color in colors:
+        outcomes = []
+        for result, probability in zip(colors, weights):
+            won, multiplier = DoubleGame.check_win(result, color)
+            outcomes.append((probability, _won(won), won, multiplier))
+        tables.append(_table(color, outcomes))
+    return tables
+
+
+@builds(CoinFlipGame)
+def coinflip() -> List[OddsTable]:
+    tables = []
+    for choice in ('cara', 'coroa'):
+        outcomes = []
+        for result in ('cara', 'coroa'):
+            won, multiplier = CoinFlipGame.check_win(result, choice)
+            outcomes.append((Fraction(1, 2), _won(won), won, multiplier))
+        tables.append(_table(choice, outcomes))
+    return tables
+
+
+def limbo_win_chance(target: float) -> float:
+    """
+    Exact probability a limbo round reaches a target
+
+    LimboGame.generate_result maps a uniform r onto four increasing linear
+    pieces, so the chance is 1 - r at the point the rounded result reaches
+    the target.
+    """
+    x = Fraction(str(target)) - HALF_CENT
+    pieces = [  # (result from, result to, r from, r to)
+        (1, 2, Fraction(0), Fraction(1, 2)),
+        (2, 10, Fraction(1, 2), Fraction(4, 5)),
+        (10, 100, Fraction(4, 5), Fraction(19, 20)),
+        (100, 1000, Fraction(19, 20), Fraction(1)),
+    ]
+    if x <= 1:
+        return 1.0
+    for low, high, r_low, r_high in pieces:
+        if x < high:
+            return float(1 - (r_low + (x - low) / (high - low) * (r_high - r_low)))
+    return 0.0
+
+
+def crash_win_chance(target: float) -> float:
+    """
+    Exact probability a crash round reaches a target
+
+    The crash point is 0.99 / r for a uniform r (capped at 100x), so a
+    target is reached when r <= 0.99 / target.
+    """
+    x = Fraction(str(target)) - HALF_CENT
+    if x <= Fraction(99, 100):
+        return 1.0
+    return float(min(Fraction(1), Fraction(99, 100) / x))
+
+
+@builds(LimboGame)
+def limbo() -> List[OddsTable]:
+    return [_target_table(target, limbo_win_chance(target)) for target in TARGETS['limbo']]
+
+
+@builds(CrashGame)
+def crash() -> List[OddsTable]:
+    return [_target_table(target, crash_win_chance(target)) for target in TARGETS['crash']]
+
+
+def _target_table(target: float, chance: float) -> OddsTable:
+    return OddsTable(f'{target}x', [Line('Win', chance, target), Line('Lose', 1 - chance, 0.0)])
+
+
+class GameOdds:
+    """The odds tables of one game"""
+
+    def __init__(self, game: str, tables: List[OddsTable]):
+        self.game = game
+        self.tables = tables
+
+    def to_dict(self) -> dict:
+        return {'game': self.game, 'tables': [table.to_dict() for table in self.tables]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'GameOdds':
+        return cls(data['game'], [OddsTable.from_dict(table) for table in data['tables']])
+
+
+def fingerprint() -> str:
+    """Hash of the game modules and this one, a cache is stale once any of them changes"""
+    digest = hashlib.sha1()
+    games_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(games_dir)):
+        if name.endswith('.py'):
+            with open(os.path.join(games_dir, name), 'rb') as f:
+                digest.update(name.encode() + f.read())
+    return digest.hexdigest()
+
+
+def compute() -> Dict[str, GameOdds]:
+    """Build every game's tables"""
+    return {name: GameOdds(name, builder()) for name, builder in BUILDERS.items()}
+
+
+def load(path: Optional[str] = None) -> Dict[str, GameOdds]:
+    """
+    The odds of every game, from a cache file if it is current
+
+    A missing or stale cache is recomputed and rewritten, so the file
+    always matches the running code. The webapp serves the same file.
+
+    Args:
+        path: JSON cache file, nothing is cached if None
+    """
+    current = fingerprint()
+    if path and os.path.exists(path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('fingerprint') == current:
+                return {name: GameOdds.from_dict(data) for name, data in cached['games'].items()}
+        except (OSError, ValueError, KeyError) as e:
+            print(f'Ignoring odds cache {path}: {e}')
+
+    odds = compute()
+    if path:
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            tmp = f'{path}.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'fingerprint': current, 'games': {name: game.to_dict() for name, game in odds.items()}},
+                          f, ensure_ascii=False, indent=1)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f'Could not write odds cache {path}: {e}')
+    return odds
@@ -2,11 +2,18 @@
 
 import random
 from typing import Tuple
+from .plugin import GamePlugin, Outcome, Round, register
 
 
-class PlinkoGame:
+@register
+class PlinkoGame(GamePlugin):
     """Plinko ball drop game"""
     
+    name = 'plinko'
+    title = '🎯 Plinko'
+    signed_result = True
+    provably_fair = True
+    
     # Rows of pegs
     ROWS = 12
     
@@ -25,25 +32,28 @@ class PlinkoGame:
         return risk.lower() in PlinkoGame.RISK_LEVELS
     
     @staticmethod
-    def drop_ball(rows: int = ROWS) -> int:
+    def drop_ball(rows: int = ROWS, rng: random.Random = None) -> int:
         """
         Simulate ball drop through pegs
         Returns: final slot position (0 to rows)
         """
         position = 0
+        rng = rng or random
         
         # Each row, ball goes left or right
         for _ in range(rows):
-            if random.random() < 0.5:
+            if rng.random() < 0.5:
                 position += 0
             else:
                 position += 1
         
-        # Normalize to slot index (0 to 10)
+        return PlinkoGame.slot_for(position, rows)
+    
+    @staticmethod
+    def slot_for(position: int, rows: int = ROWS) -> int:
+        """Slot index (0 to 10) a ball ends in after moving right position times"""
         slots = 11
-        slot = min(int((position / rows) * slots), slots - 1)
-        
-        return slot
+        return min(int((position / rows) * slots), slots - 1)
     
     @staticmethod
     def calculate_win(slot: int, risk_level: str) -> Tuple[bool, float]:
@@ -115,3 +125,30 @@ class PlinkoGame:
             'alto': '🔴 Alto Risco - Grandes prêmios ou perdas!'
         }
         return descriptions.get(risk_level.lower(), '')
+    
+    # GamePlugin
+    
+    @classmethod
+    def validate(cls, risk: str):
+        if not cls.validate_risk(risk):
+            return '❌ Escolha inválida! Use: baixo, medio ou alto'
+        return None
+    
+    @classmethod
+    def play(cls, risk: str, rng: random.Random = None) -> Outcome:
+        slot = cls.drop_ball(rng=rng)
+        won, multiplier = cls.calculate_win(slot, risk)
+        return Outcome(won, multiplier, slot=slot)
+    
+    @classmethod
+    def render(cls, round: Round):
+        outcome = round.outcome
+        return cls.format_board(outcome.slot, round.args[0]), [
+            ('Bet', f'{round.bet_amount:,} 🪙', True),
+            ('Slot', f'**{outcome.slot}** ({outcome.multiplier}x)', True),
+        ]
+    
+    @classmethod
+    def result_field(cls, round: Round):
+        # The multiplier is already in the Slot field
+        return ('🎉 WON!' if round.outcome.won else '❌ Lost'), f'{round.net_change:+,} 🪙'
@@ -0,0 +1,91 @@
+"""Plugin interface of the one-shot games run by GameEngine"""
+
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+# (name, value, inline) of an embed field
+Field = Tuple[str, str, bool]
+
+# Marks where render() wants the win/loss field, appended last if absent
+RESULT: Field = ('', '', False)
+
+# Registered plugins by name (the game_type their bets are recorded as)
+PLUGINS: Dict[str, Type['GamePlugin']] = {}
+
+
+def register(plugin: Type['GamePlugin']) -> Type['GamePlugin']:
+    """Class decorator adding a game to PLUGINS"""
+    PLUGINS[plugin.name] = plugin
+    return plugin
+
+
+class Outcome:
+    """What a round produced, decided before any coins move"""
+
+    def __init__(self, won: bool, multiplier: float, **details: Any):
+        """Whether it won, its payout multiplier, and whatever render() needs as attributes"""
+        self.won = won
+        self.multiplier = multiplier
+        self.__dict__.update(details)
+
+
+class Round:
+    """One play of a plugin, filled in as it moves through the pipeline"""
+
+    def __init__(self, plugin: Type['GamePlugin'], bet_amount: int, args: tuple):
+        self.plugin = plugin
+        self.bet_amount = bet_amount
+        self.args = args
+        self.outcome: Optional[Outcome] = None
+        self.net_change = 0
+        self.user = None
+        self.achievements: list = []
+        # FairRound of a provably fair round (see core.fairness)
+        self.fair = None
+        self.timings: Dict[str, float] = {}
+
+
+class GamePlugin:
+    """
+    A game whose round needs no input once the bet is placed
+
+    Subclasses set name and title and implement play(). validate(),
+    render() and result_field() have defaults. Plugins only decide and
+    describe a round: GameEngine does the locking, coins and messages.
+
+    A provably_fair plugin's play() takes an rng keyword and draws all
+    its randomness from it, so a round can be replayed from its seeds.
+    """
+
+    name = ''
+    title = ''
+    min_bet = 10
+    # Win/loss value as '+150 🪙 (2.5x)' instead of the longer default
+    signed_result = False
+    # Decided from a server seed hash chain, verifiable with /verify
+    provably_fair = False
+
+    @classmethod
+    def validate(cls, *args) -> Optional[str]:
+        """Error message for invalid command arguments, None if they're fine"""
+        return None
+
+    @classmethod
+    def play(cls, *args) -> Outcome:
+        """Play the round with the command's arguments (after the bet)"""
+        raise NotImplementedError
+
+    @classmethod
+    def render(cls, round: Round) -> Tuple[Optional[str], List[Field]]:
+        """Description and fields of the result embed, RESULT marks the win/loss field"""
+        return None, [('Bet', f'{round.bet_amount:,} 🪙', True)]
+
+    @classmethod
+    def result_field(cls, round: Round) -> Tuple[str, str]:
+        """Name and value of the win/loss field"""
+        outcome, net_change = round.outcome, round.net_change
+        if cls.signed_result:
+            value = f'{net_change:+,} 🪙' + (f' ({outcome.multiplier}x)' if outcome.won else '')
+            return ('🎉 WON!' if outcome.won else '❌ Lost'), value
+        if outcome.won:
+            return '🎉 WON!', f'+{net_change:,} 🪙 ({outcome.multiplier}x)'
+        return '❌ Lost', f'{net_change:,} 🪙'
@@ -0,0 +1,111 @@
+"""Weighted draws from precomputed alias tables"""
+
+import random
+from array import array
+from typing import Generic, List, Sequence, TypeVar
+
+T = TypeVar('T')
+
+# Draws take any random.Random-like source; games use this one unless given another
+_source = random.Random()
+
+# Acceptance thresholds are 32-bit fixed point
+SCALE = 1 << 32
+MASK = SCALE - 1
+
+
+def seed(a=None):
+    """Reseed the default source, for reproducible rounds"""
+    _source.seed(a)
+
+
+def set_source(rng: random.Random) -> random.Random:
+    """
+    Make rng the default source of every game's draws
+
+    Returns:
+        random.Random: The previous source, to put back afterwards
+    """
+    global _source
+    previous, _source = _source, rng
+    return previous
+
+
+def get_source() -> random.Random:
+    return _source
+
+
+class AliasTable(Generic[T]):
+    """
+    Walker/Vose alias table over weighted outcomes
+
+    Built once per paytable in O(n). A draw is one 64-bit word: the high
+    half picks a column uniformly, the low half accepts the column's own
+    outcome below its threshold and otherwise takes its alias. That is
+    O(1) whatever the number of outcomes, where random.choices rebuilds
+    the cumulative weights and bisects them on every call. Probabilities
+    are exact to 2^-32.
+    """
+
+    def __init__(self, outcomes: Sequence[T], weights: Sequence[float]):
+        if len(outcomes) != len(weights) or not outcomes:
+            raise ValueError('Alias table needs one weight per outcome')
+        if any(weight < 0 for weight in weights) or not sum(weights) > 0:
+            raise ValueError('Alias table weights must be non-negative with a positive total')
+
+        n = len(outcomes)
+        total = sum(weights)
+        scaled = [weight * n / total for weight in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        threshold = [SCALE] * n
+        alias = list(range(n))
+        while small and large:
+            less, more = small.pop(), large.pop()
+            threshold[less] = round(scaled[less] * SCALE)
+            alias[less] = more
+            # The large outcome gave column `less` what it lacked
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Leftovers are 1 up to float error, they always keep their own outcome
+
+        self.outcomes = list(outcomes)
+        self.weights = list(weights)
+        self.size = n
+        self._threshold = threshold
+        self._alias = alias
+        # (threshold, own outcome, alias outcome) per column, one lookup per draw
+        self._columns = [(threshold[i], self.outcomes[i], self.outcomes[alias[i]]) for i in range(n)]
+
+    @classmethod
+    def from_items(cls, items, key: str = 'weight') -> 'AliasTable':
+        """Table over dicts (or a dict's keys) weighted by their key entry"""
+        if isinstance(items, dict):
+            return cls(list(items), [data[key] for data in items.values()])
+        items = list(items)
+        return cls(items, [item[key] for item in items])
+
+    def draw(self, rng: random.Random = None) -> T:
+        """One outcome"""
+        word = (rng or _source).getrandbits(64)
+        threshold, own, other = self._columns[((word >> 32) * self.size) >> 32]
+        return own if (word & MASK) < threshold else other
+
+    def draws(self, k: int, rng: random.Random = None) -> List[T]:
+        """k independent outcomes, all read from one buffer of random bytes"""
+        words = array('Q', (rng or _source).randbytes(8 * k))
+        columns, size = self._columns, self.size
+        picked = []
+        for word in words:
+            threshold, own, other = columns[((word >> 32) * size) >> 32]
+            picked.append(own if (word & MASK) < threshold else other)
+        return picked
+
+    def probabilities(self) -> List[float]:
+        """Each outcome's actual chance, from the built table (for checks)"""
+        chances = [0.0] * self.size
+        for column in range(self.size):
+            accept = self._threshold[column] / SCALE
+            chances[column] += accept / self.size
+            chances[self._alias[column]] += (1.0 - accept) / self.size
+        return chances
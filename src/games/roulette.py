@@ -2,11 +2,16 @@
 
 import random
 from typing import Tuple
+from .plugin import GamePlugin, Outcome, Round, register
 
 
-class RouletteGame:
+@register
+class RouletteGame(GamePlugin):
     """European Roulette game"""
     
+    name = 'roleta'
+    title = '🎰 European Roulette'
+    
     # Roulette numbers with colors
     RED_NUMBERS = [1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36]
     BLACK_NUMBERS = [2, 4, 6, 8, 10, 11, 13, 15, 17, 20, 22, 24, 26, 28, 29, 31, 33, 35]
@@ -81,3 +86,28 @@ class RouletteGame:
 • `paridade <par/impar>` - Aposta em par ou ímpar (2x)
 • `altura <baixo/alto>` - Baixo (1-18) ou Alto (19-36) (2x)
         """
+    
+    # GamePlugin
+    
+    @classmethod
+    def play(cls, bet_type: str, bet_value: str) -> Outcome:
+        number = cls.spin()
+        won, multiplier = cls.check_bet(number, bet_type, bet_value)
+        return Outcome(won, multiplier, number=number, color=cls.get_color(number))
+    
+    @classmethod
+    def render(cls, round: Round):
+        outcome = round.outcome
+        color_emoji = {'vermelho': '🔴', 'preto': '⚫', 'verde': '🟢'}
+        bet_type, bet_value = round.args
+        return None, [
+            ('Result', f'{color_emoji.get(outcome.color, "⚪")} **{outcome.number}** ({outcome.color})', False),
+            ('Your Bet', f'{bet_type}: {bet_value}', True),
+            ('Amount', f'{round.bet_amount:,} 🪙', True),
+        ]
+    
+    @classmethod
+    def result_field(cls, round: Round):
+        if round.outcome.won:
+            return '🎉 WON!', f'+{round.net_change:,} 🪙 (multiplicador: {round.outcome.multiplier}x)'
+        return super().result_field(round)
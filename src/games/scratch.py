@@ -2,11 +2,18 @@
 
 import random
 from typing import Tuple, List
+from .plugin import GamePlugin, Outcome, Round, register
+from .rng import AliasTable
 
 
-class ScratchCardGame:
+@register
+class ScratchCardGame(GamePlugin):
     """Instant win scratch card game"""
     
+    name = 'scratch'
+    title = '🎫 Raspadinha'
+    signed_result = True
+    
     # Prize pool with probabilities (muito mais difícil - house edge alto)
     PRIZES = [
         {'multiplier': 0, 'label': 'Lost', 'emoji': '❌', 'weight': 70},  # 70% lose
@@ -21,18 +28,12 @@ class ScratchCardGame:
     ]
     
     CARD_SIZE = 9  # 3x3 grid
+    CELL = AliasTable.from_items(PRIZES)
     
     @staticmethod
-    def generate_card() -> List[dict]:
+    def generate_card(rng: random.Random = None) -> List[dict]:
         """Generate a scratch card with random prizes"""
-        prizes = []
-        weights = [p['weight'] for p in ScratchCardGame.PRIZES]
-        
-        for _ in range(ScratchCardGame.CARD_SIZE):
-            prize = random.choices(ScratchCardGame.PRIZES, weights=weights, k=1)[0]
-            prizes.append(prize)
-        
-        return prizes
+        return ScratchCardGame.CELL.draws(ScratchCardGame.CARD_SIZE, rng)
     
     @staticmethod
     def calculate_best_prize(card: List[dict]) -> Tuple[bool, float, dict]:
@@ -89,15 +90,19 @@ class ScratchCardGame:
                 prizes_text += f"{prize['emoji']} {prize['label']} - {prize['multiplier']}x\n"
         return prizes_text
     
-    @staticmethod
-    def get_prize_distribution() -> str:
-        """Get prize distribution info"""
-        total_weight = sum(p['weight'] for p in ScratchCardGame.PRIZES)
-        
-        text = "**Odds:**\n"
-        for prize in ScratchCardGame.PRIZES:
-            if prize['multiplier'] >= 1.0:
-                chance = (prize['weight'] / total_weight) * 100
-                text += f"{prize['emoji']} {prize['label']}: {chance:.1f}%\n"
-        
-        return text
+    # GamePlugin
+    
+    @classmethod
+    def play(cls) -> Outcome:
+        card = cls.generate_card()
+        won, multiplier, best_prize = cls.calculate_best_prize(card)
+        return Outcome(won, multiplier, card=card, best_prize=best_prize)
+    
+    @classmethod
+    def render(cls, round: Round):
+        card, best_prize = round.outcome.card, round.outcome.best_prize
+        return None, [
+            ('Cartão', cls.format_card_revealed(card, card.index(best_prize)), False),
+            ('Prêmio', f'{best_prize["emoji"]} {best_prize["label"]}', True),
+            ('Bet', f'{round.bet_amount:,} 🪙', True),
+        ]
@@ -2,11 +2,17 @@
 
 import random
 from typing import Tuple, List
+from .plugin import GamePlugin, Outcome, Round, register
+from .rng import AliasTable
 
 
-class SlotsGame:
+@register
+class SlotsGame(GamePlugin):
     """Slot machine game with 3 reels"""
     
+    name = 'slots'
+    title = '🎰 Slot Machine'
+    
     # Slot symbols with their weights (higher = more common)
     SYMBOLS = {
         '🍒': {'weight': 35, 'value': 2},    # Cherry - common, low value
@@ -18,20 +24,12 @@ class SlotsGame:
         '💎': {'weight': 5, 'value': 20},    # Diamond - rare, high value
         '🎰': {'weight': 3, 'value': 50},    # Jackpot - very rare
     }
+    REEL = AliasTable.from_items(SYMBOLS)
     
     @staticmethod
-    def spin() -> List[str]:
+    def spin(rng: random.Random = None) -> List[str]:
         """Spin the slot machine (3 reels)"""
-        symbols = []
-        weights = []
-        
-        for symbol, data in SlotsGame.SYMBOLS.items():
-            symbols.append(symbol)
-            weights.append(data['weight'])
-        
-        # Pick 3 symbols
-        result = random.choices(symbols, weights=weights, k=3)
-        return result
+        return SlotsGame.REEL.draws(3, rng)
     
     @staticmethod
     def calculate_win(reels: List[str]) -> Tuple[bool, float, str]:
@@ -65,3 +63,23 @@ class SlotsGame:
     def format_reels(reels: List[str]) -> str:
         """Format reels for display"""
         return f"[ {reels[0]} | {reels[1]} | {reels[2]} ]"
+    
+    # GamePlugin
+    
+    @classmethod
+    def play(cls) -> Outcome:
+        reels = cls.spin()
+        won, multiplier, description = cls.calculate_win(reels)
+        return Outcome(won, multiplier, reels=reels, description=description)
+    
+    @classmethod
+    def render(cls, round: Round):
+        return None, [
+            ('Result', f'**{cls.format_reels(round.outcome.reels)}**', False),
+            ('Bet', f'{round.bet_amount:,} 🪙', True),
+        ]
+    
+    @classmethod
+    def result_field(cls, round: Round):
+        _, value = super().result_field(round)
+        return ('✨ ' if round.outcome.won else '❌ ') + round.outcome.description, value
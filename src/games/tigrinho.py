@@ -3,14 +3,20 @@
 import random
 import asyncio
 from typing import Tuple, List
+from .plugin import GamePlugin, Outcome, Round, register
+from .rng import AliasTable
 
 
-class TigrinhoGame:
+@register
+class TigrinhoGame(GamePlugin):
     """
     Fortune Tiger (Tigrinho) slot machine game
     A 3x3 grid slot game with tiger-themed symbols
     """
     
+    name = 'tigrinho'
+    title = '🐅 Tigrinho'
+    
     # Symbols with their weights and values
     # Higher weight = more common, higher value = bigger payout
     SYMBOLS = {
@@ -23,27 +29,16 @@ class TigrinhoGame:
         '🐅': {'weight': 5, 'value': 50, 'name': 'Tigre'},      # Tiger - rare, big win
         '💎': {'weight': 2, 'value': 100, 'name': 'Diamante'},  # Diamond - very rare jackpot
     }
+    REEL = AliasTable.from_items(SYMBOLS)
     
     @staticmethod
-    def spin() -> List[List[str]]:
+    def spin(rng: random.Random = None) -> List[List[str]]:
         """
         Spin the Tigrinho slot machine (3x3 grid)
         Returns a 3x3 matrix of symbols
         """
-        symbols = []
-        weights = []
-        
-        for symbol, data in TigrinhoGame.SYMBOLS.items():
-            symbols.append(symbol)
-            weights.append(data['weight'])
-        
-        # Create 3x3 grid
-        grid = []
-        for _ in range(3):
-            row = random.choices(symbols, weights=weights, k=3)
-            grid.append(row)
-        
-        return grid
+        cells = TigrinhoGame.REEL.draws(9, rng)
+        return [cells[0:3], cells[3:6], cells[6:9]]
     
     @staticmethod
     def check_lines(grid: List[List[str]]) -> List[Tuple[str, int, str]]:
@@ -128,3 +123,26 @@ class TigrinhoGame:
     def get_symbol_name(symbol: str) -> str:
         """Get the name of a symbol"""
         return TigrinhoGame.SYMBOLS.get(symbol, {}).get('name', 'Desconhecido')
+    
+    # GamePlugin
+    
+    @classmethod
+    def play(cls) -> Outcome:
+        grid = cls.spin()
+        won, total_multiplier, win_descriptions = cls.calculate_win(grid)
+        return Outcome(won, total_multiplier, grid=grid, win_descriptions=win_descriptions)
+    
+    @classmethod
+    def render(cls, round: Round):
+        return None, [
+            ('Result', f'```\n{cls.format_grid(round.outcome.grid)}\n```', False),
+            ('Bet', f'{round.bet_amount:,} 🪙', True),
+        ]
+    
+    @classmethod
+    def result_field(cls, round: Round):
+        outcome = round.outcome
+        if outcome.won:
+            win_text = '\n'.join(outcome.win_descriptions)
+            return '🎉 WON!', f'{win_text}\n\n**Total: +{round.net_change:,} 🪙 ({outcome.multiplier:.0f}x)**'
+        return '❌ Sem combinações', f'{round.net_change:,} 🪙'
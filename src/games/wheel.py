@@ -2,11 +2,17 @@
 
 import random
 from typing import Tuple
+from .plugin import GamePlugin, Outcome, Round, register
+from .rng import AliasTable
 
 
-class WheelGame:
+@register
+class WheelGame(GamePlugin):
     """Wheel of Fortune spinning game"""
     
+    name = 'wheel'
+    title = '🎡 Roda da Fortuna'
+    
     # Wheel segments with multipliers and weights
     SEGMENTS = [
         {'multiplier': 0, 'label': 'Lost', 'emoji': '❌', 'weight': 25},
@@ -18,13 +24,12 @@ class WheelGame:
         {'multiplier': 5.0, 'label': 'x5', 'emoji': '🌟', 'weight': 2},
         {'multiplier': 10.0, 'label': 'x10', 'emoji': '💎', 'weight': 1},
     ]
+    WHEEL = AliasTable.from_items(SEGMENTS)
     
     @staticmethod
-    def spin() -> dict:
+    def spin(rng: random.Random = None) -> dict:
         """Spin the wheel and return a segment"""
-        segments = WheelGame.SEGMENTS
-        weights = [s['weight'] for s in segments]
-        return random.choices(segments, weights=weights, k=1)[0]
+        return WheelGame.WHEEL.draw(rng)
     
     @staticmethod
     def calculate_win(segment: dict) -> Tuple[bool, float, str]:
@@ -49,3 +54,23 @@ class WheelGame:
     def format_result(segment: dict) -> str:
         """Format result for display"""
         return f"{segment['emoji']} **{segment['label']}** ({segment['multiplier']}x)"
+    
+    # GamePlugin
+    
+    @classmethod
+    def play(cls) -> Outcome:
+        segment = cls.spin()
+        won, multiplier, _ = cls.calculate_win(segment)
+        return Outcome(won, multiplier, segment=segment)
+    
+    @classmethod
+    def render(cls, round: Round):
+        return None, [
+            ('Result', cls.format_result(round.outcome.segment), False),
+            ('Bet', f'{round.bet_amount:,} 🪙', True),
+        ]
+    
+    @classmethod
+    def result_field(cls, round: Round):
+        _, value = super().result_field(round)
+        return ('🎉 Prêmio!' if round.outcome.won else '❌ Sem prêmio'), value
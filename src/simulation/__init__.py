@@ -0,0 +1,11 @@
+"""
+Monte Carlo simulation of the casino games' payouts
+
+Needs numpy, which the bot itself does not. Run with:
+    python -m src.simulation [games...] [--rounds N] [--check]
+"""
+
+from .samplers import SAMPLERS, Sampler
+from .simulator import Report, cross_check, play_scalar, simulate
+
+__all__ = ['SAMPLERS', 'Sampler', 'Report', 'cross_check', 'play_scalar', 'simulate']
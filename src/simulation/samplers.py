@@ -0,0 +1,193 @@
+"""Vectorized outcome samplers, one per game"""
+
+from typing import Callable, Dict, List, Tuple
+import numpy as np
+from src.games.slots import SlotsGame
+from src.games.tigrinho import TigrinhoGame
+from src.games.plinko import PlinkoGame
+from src.games.keno import KenoGame
+from src.games.scratch import ScratchCardGame
+from src.games.wheel import WheelGame
+from src.games.limbo import LimboGame
+from src.games.crash import CrashGame
+from src.games.double import DoubleGame
+
+# (won, multiplier) arrays of a batch, settled like process_bet: a round pays multiplier x bet if won
+Batch = Tuple[np.ndarray, np.ndarray]
+
+# Registered samplers by game name (the plugin name)
+SAMPLERS: Dict[str, 'Sampler'] = {}
+
+
+class Sampler:
+    """
+    Draws a game's rounds in batches
+
+    The paytables and weights are read from the game classes, so tuning
+    them needs no change here. The rules applied to them are
+    re-implemented, and cross_check() compares them with the scalar play().
+    """
+
+    def __init__(self, game, sample: Callable[..., Batch], max_multiplier: Callable[..., float],
+                 configs: List[tuple], label: Callable[..., str] = None):
+        """
+        Args:
+            game: GamePlugin class the sampler models
+            sample: sample(rng, n, *args) -> (won, multiplier)
+            max_multiplier: Largest multiplier one round can pay, given the args
+            configs: Argument tuples (as the command passes them to play()) worth reporting
+            label: Readable name of an argument tuple
+        """
+        self.game = game
+        self.name = game.name
+        self.sample = sample
+        self.max_multiplier = max_multiplier
+        self.configs = configs
+        self._label = label
+
+    def label(self, args: tuple) -> str:
+        if self._label is not None:
+            return self._label(*args)
+        return ' '.join(str(arg) for arg in args)
+
+
+def sampler(game, configs: List[tuple] = ((),), max_multiplier: Callable[..., float] = None,
+            label: Callable[..., str] = None):
+    """Decorator registering a sample(rng, n, *args) function for a game"""
+    def decorator(sample):
+        SAMPLERS[game.name] = Sampler(game, sample, max_multiplier, list(configs), label)
+        return sample
+    return decorator
+
+
+def _weights(items) -> np.ndarray:
+    weights = np.array([item['weight'] for item in items], dtype=float)
+    return weights / weights.sum()
+
+
+def _draw(rng: np.random.Generator, items, size) -> np.ndarray:
+    """Indexes of items picked like random.choices(items, weights), size draws"""
+    weights = [item['weight'] for item in items]
+    if all(float(weight).is_integer() for weight in weights):
+        # Whole weights: one uniform integer into a table holding each index weight times
+        table = np.repeat(np.arange(len(weights), dtype=np.uint8), np.array(weights, dtype=int))
+        return table[rng.integers(0, len(table), size=size)]
+    return rng.choice(len(weights), size=size, p=_weights(items))
+
+
+def _round2(values: np.ndarray) -> np.ndarray:
+    # round(x, 2) on Python floats; np.round differs only on exact binary ties
+    return np.round(values, 2)
+
+
+@sampler(SlotsGame, max_multiplier=lambda: max(s['value'] for s in SlotsGame.SYMBOLS.values()))
+def slots(rng: np.random.Generator, n: int) -> Batch:
+    symbols = list(SlotsGame.SYMBOLS.values())
+    values = np.array([s['value'] for s in symbols], dtype=float)
+    reels = _draw(rng, symbols, (n, 3))
+    a, b, c = reels[:, 0], reels[:, 1], reels[:, 2]
+
+    three = (a == b) & (b == c)
+    # Any pair pays half the paired symbol, b is in both pairs that don't involve a
+    pair_symbol = np.where((a == b) | (a == c), a, b)
+    pair = ~three & ((a == b) | (b == c) | (a == c))
+    multiplier = np.where(three, values[a], np.where(pair, values[pair_symbol] * 0.5, 0.0))
+    return three | pair, multiplier
+
+
+# Rows, columns and both diagonals of the 3x3 grid, as flat cell indexes
+TIGRINHO_LINES = np.array([
+    [0, 1, 2], [3, 4, 5], [6, 7, 8],
+    [0, 3, 6], [1, 4, 7], [2, 5, 8],
+    [0, 4, 8], [2, 4, 6],
+])
+
+
+@sampler(TigrinhoGame, max_multiplier=lambda: len(TIGRINHO_LINES) * max(s['value'] for s in TigrinhoGame.SYMBOLS.values()))
+def tigrinho(rng: np.random.Generator, n: int) -> Batch:
+    symbols = list(TigrinhoGame.SYMBOLS.values())
+    values = np.array([s['value'] for s in symbols], dtype=float)
+    grid = _draw(rng, symbols, (n, 9))
+
+    lines = grid[:, TIGRINHO_LINES]
+    complete = (lines[:, :, 0] == lines[:, :, 1]) & (lines[:, :, 1] == lines[:, :, 2])
+    multiplier = (values[lines[:, :, 0]] * complete).sum(axis=1)
+    return multiplier > 0, multiplier
+
+
+@sampler(PlinkoGame, configs=[(risk,) for risk in PlinkoGame.RISK_LEVELS],
+         max_multiplier=lambda risk: max(PlinkoGame.MULTIPLIERS[risk]))
+def plinko(rng: np.random.Generator, n: int, risk: str) -> Batch:
+    table = np.array(PlinkoGame.MULTIPLIERS[risk.lower()])
+    rows, slots = PlinkoGame.ROWS, len(table)
+    position = rng.binomial(rows, 0.5, size=n)
+    slot = np.minimum(np.floor(position / rows * slots).astype(int), slots - 1)
+    multiplier = table[slot]
+    # A slot paying 1x or less counts as a loss, process_bet then pays nothing
+    return multiplier > 1.0, multiplier
+
+
+@sampler(KenoGame, configs=[tuple(range(1, count + 1)) for count in KenoGame.MULTIPLIERS],
+         max_multiplier=lambda *numbers: max(KenoGame.MULTIPLIERS[len(numbers)].values()),
+         label=lambda *numbers: f'{len(numbers)} numbers')
+def keno(rng: np.random.Generator, n: int, *numbers: int) -> Batch:
+    picks = len(numbers)
+    paytable = KenoGame.MULTIPLIERS[picks]
+    table = np.array([paytable.get(matches, 0.0) for matches in range(picks + 1)])
+    # Picks hit by a draw without replacement: hypergeometric
+    matches = rng.hypergeometric(picks, KenoGame.NUMBER_RANGE - picks, KenoGame.DRAW_COUNT, size=n)
+    multiplier = table[matches]
+    return multiplier > 0, multiplier
+
+
+@sampler(ScratchCardGame, max_multiplier=lambda: max(p['multiplier'] for p in ScratchCardGame.PRIZES))
+def scratch(rng: np.random.Generator, n: int) -> Batch:
+    prizes = sorted(ScratchCardGame.PRIZES, key=lambda p: p['multiplier'])
+    multipliers = np.array([p['multiplier'] for p in prizes], dtype=float)
+    cdf = np.cumsum(_weights(prizes))
+    # The best of CARD_SIZE independent cells has CDF F^k, so invert it at U^(1/k)
+    u = rng.random(n) ** (1.0 / ScratchCardGame.CARD_SIZE)
+    best = np.minimum(np.searchsorted(cdf, u, side='right'), len(prizes) - 1)
+    multiplier = multipliers[best]
+    return multiplier > 0, multiplier
+
+
+@sampler(WheelGame, max_multiplier=lambda: max(s['multiplier'] for s in WheelGame.SEGMENTS))
+def wheel(rng: np.random.Generator, n: int) -> Batch:
+    segments = WheelGame.SEGMENTS
+    multipliers = np.array([s['multiplier'] for s in segments], dtype=float)
+    multiplier = multipliers[_draw(rng, segments, n)]
+    return multiplier > 0, multiplier
+
+
+@sampler(LimboGame, configs=[(1.5,), (2.0,), (5.0,), (10.0,), (100.0,), (1000.0,)],
+         max_multiplier=lambda target: target, label=lambda target: f'{target}x')
+def limbo(rng: np.random.Generator, n: int, target: float) -> Batch:
+    r = rng.random(n)
+    # The four linear pieces of LimboGame.generate_result
+    result = np.select(
+        [r < 0.5, r < 0.8, r < 0.95],
+        [1.0 + r * 2.0, 2.0 + (r - 0.5) / 0.3 * 8.0, 10.0 + (r - 0.8) / 0.15 * 90.0],
+        100.0 + (r - 0.95) / 0.05 * 900.0
+    )
+    won = _round2(result) >= target
+    return won, np.where(won, target, 0.0)
+
+
+@sampler(CrashGame, configs=[(1.1,), (1.5,), (2.0,), (5.0,), (10.0,), (100.0,)],
+         max_multiplier=lambda target: target, label=lambda target: f'{target}x')
+def crash(rng: np.random.Generator, n: int, target: float) -> Batch:
+    house_edge = 0.01
+    r = np.maximum(rng.random(n), 0.0001)
+    crash_point = _round2(np.minimum((1 - house_edge) / r, 100.0))
+    won = target <= crash_point
+    return won, np.where(won, target, 0.0)
+
+
+@sampler(DoubleGame, configs=[(color,) for color in DoubleGame.COLORS],
+         max_multiplier=lambda color: DoubleGame.COLORS[color]['multiplier'])
+def double(rng: np.random.Generator, n: int, color: str) -> Batch:
+    colors = list(DoubleGame.COLORS)
+    landed = _draw(rng, DoubleGame.COLORS.values(), n)
+    won = landed == colors.index(color)
+    return won, np.where(won, DoubleGame.COLORS[color]['multiplier'], 0.0)
@@ -0,0 +1,165 @@
+"""Monte Carlo RTP reports and drift checks"""
+
+import argparse
+import math
+import sys
+import time
+from dataclasses import dataclass
+import numpy as np
+from .samplers import SAMPLERS, Sampler
+
+
+@dataclass
+class Report:
+    """Return of many rounds of one game configuration, per unit bet"""
+    game: str
+    config: str
+    rounds: int
+    rtp: float
+    variance: float
+    hit_rate: float
+    max_multiplier: float
+    max_seen: float
+    seconds: float
+
+    @property
+    def house_edge(self) -> float:
+        return 1.0 - self.rtp
+
+    @property
+    def stderr(self) -> float:
+        """Standard error of rtp"""
+        return math.sqrt(self.variance / self.rounds) if self.rounds else 0.0
+
+    @property
+    def max_exposure(self) -> float:
+        """Most the house can lose on one round, in bets"""
+        return self.max_multiplier - 1.0
+
+
+class _Totals:
+    """Streaming sums of a game's payouts (multiplier x bet if won, else 0)"""
+
+    def __init__(self):
+        self.rounds = 0
+        self.total = 0.0
+        self.squares = 0.0
+        self.hits = 0
+        self.max_seen = 0.0
+
+    def add(self, won: np.ndarray, multiplier: np.ndarray):
+        payout = np.where(won, multiplier, 0.0)
+        self.rounds += len(payout)
+        self.total += float(payout.sum())
+        self.squares += float(np.dot(payout, payout))
+        self.hits += int(np.count_nonzero(won))
+        if len(payout):
+            self.max_seen = max(self.max_seen, float(payout.max()))
+
+    def report(self, sampler: Sampler, args: tuple, seconds: float) -> Report:
+        rtp = self.total / self.rounds
+        return Report(
+            game=sampler.name,
+            config=sampler.label(args),
+            rounds=self.rounds,
+            rtp=rtp,
+            variance=max(self.squares / self.rounds - rtp * rtp, 0.0),
+            hit_rate=self.hits / self.rounds,
+            max_multiplier=float(sampler.max_multiplier(*args)),
+            max_seen=self.max_seen,
+            seconds=seconds
+        )
+
+
+def simulate(name: str, args: tuple = (), rounds: int = 10_000_000, rng: np.random.Generator = None,
+             chunk_size: int = 1 << 20) -> Report:
+    """
+    Simulate rounds of a game with the vectorized sampler
+
+    Args:
+        name: Game (plugin) name, a key of SAMPLERS
+        args: Arguments as the command passes them to play()
+        rounds: Rounds to draw
+        rng: Generator to draw from, a fresh unseeded one by default
+        chunk_size: Rounds drawn per batch, bounds memory use
+    """
+    sampler = SAMPLERS[name]
+    rng = rng or np.random.default_rng()
+    totals = _Totals()
+    start = time.perf_counter()
+    while totals.rounds < rounds:
+        totals.add(*sampler.sample(rng, min(chunk_size, rounds - totals.rounds), *args))
+    return totals.report(sampler, args, time.perf_counter() - start)
+
+
+def play_scalar(name: str, args: tuple = (), rounds: int = 100_000) -> Report:
+    """The same report from the game's own play(), one round at a time"""
+    sampler = SAMPLERS[name]
+    won = np.empty(rounds, dtype=bool)
+    multiplier = np.empty(rounds)
+    start = time.perf_counter()
+    for i in range(rounds):
+        outcome = sampler.game.play(*args)
+        won[i], multiplier[i] = outcome.won, outcome.multiplier
+    totals = _Totals()
+    totals.add(won, multiplier)
+    return totals.report(sampler, args, time.perf_counter() - start)
+
+
+def cross_check(vector: Report, scalar: Report, z_limit: float = 4.0) -> list:
+    """
+    Compare a sampler's report with the scalar play() one
+
+    A paytable edit is picked up by both sides, so what this catches is
+    the rules drifting apart (a new line, another win condition, ...).
+
+    Returns:
+        list: Problems found, empty if the two agree
+    """
+    problems = []
+    z = (scalar.rtp - vector.rtp) / math.hypot(scalar.stderr, vector.stderr or 1e-12)
+    if abs(z) > z_limit:
+        problems.append(f'RTP {scalar.rtp:.4f} (play) vs {vector.rtp:.4f} (sampler), z={z:+.1f}')
+
+    hit_error = math.sqrt(vector.hit_rate * (1 - vector.hit_rate) / scalar.rounds) or 1e-12
+    z = (scalar.hit_rate - vector.hit_rate) / hit_error
+    if abs(z) > z_limit:
+        problems.append(f'hit rate {scalar.hit_rate:.4f} (play) vs {vector.hit_rate:.4f} (sampler), z={z:+.1f}')
+
+    if scalar.max_seen > vector.max_multiplier + 1e-9:
+        problems.append(f'play() paid {scalar.max_seen}x, above the sampler\'s max of {vector.max_multiplier}x')
+    return problems
+
+
+def main():
+    """Print RTP reports (and optionally drift checks) from the command line"""
+    parser = argparse.ArgumentParser(description='Monte Carlo return-to-player of the casino games')
+    parser.add_argument('games', nargs='*', help=f'Games to simulate (default: all of {", ".join(SAMPLERS)})')
+    parser.add_argument('--rounds', type=int, default=10_000_000, help='Rounds per game configuration')
+    parser.add_argument('--seed', type=int, help='Seed, for reproducible reports')
+    parser.add_argument('--check', action='store_true', help="Cross-check every sampler against the game's play()")
+    parser.add_argument('--check-rounds', type=int, default=100_000, help='Scalar rounds per configuration when checking')
+    args = parser.parse_args()
+
+    unknown = [game for game in args.games if game not in SAMPLERS]
+    if unknown:
+        parser.error(f'unknown game(s): {", ".join(unknown)}')
+
+    rng = np.random.default_rng(args.seed)
+    drifted = 0
+    print(f'{"game":<10}{"config":<12}{"RTP":>9}{"±95%":>8}{"edge":>8}{"stdev":>9}{"hit":>8}'
+          f'{"max exp":>9}{"seen":>8}{"time":>8}')
+    for name in args.games or SAMPLERS:
+        for config in SAMPLERS[name].configs:
+            report = simulate(name, config, args.rounds, rng)
+            print(f'{report.game:<10}{report.config:<12}{report.rtp:>9.2%}{1.96 * report.stderr:>8.2%}'
+                  f'{report.house_edge:>8.2%}{math.sqrt(report.variance):>9.3f}{report.hit_rate:>8.2%}'
+                  f'{report.max_exposure:>8g}x{max(report.max_seen - 1, 0):>7g}x{report.seconds:>7.2f}s')
+            if args.check:
+                for problem in cross_check(report, play_scalar(name, config, args.check_rounds)):
+                    drifted += 1
+                    print(f'   ❌ drift: {problem}')
+
+    if args.check:
+        print('✅ Samplers match the games' if not drifted else f'❌ {drifted} drift problem(s)')
+    sys.exit(1 if drifted else 0)
@@ -0,0 +1,76 @@
+"""1,000 concurrent bettors must all settle, with no lock errors and consistent balances"""
+
+import asyncio
+import os
+import tempfile
+import pytest
+from src.database.async_db_manager import AsyncDatabaseManager
+from src.database.db_manager import DatabaseManager
+from src.economy.economy_manager import EconomyManager
+
+BETTORS = 1000
+BETS = 3
+BET = 10
+START = 10 ** 6
+
+
+@pytest.fixture
+def async_db():
+    with tempfile.TemporaryDirectory() as directory:
+        db = DatabaseManager(os.path.join(directory, 'stress.db'))
+        conn = db.get_connection()
+        conn.executemany('INSERT INTO users (user_id, username, coins) VALUES (?, ?, ?)',
+                         [(user_id, f'bettor{user_id}', START) for user_id in range(1, BETTORS + 1)])
+        conn.commit()
+        async_db = AsyncDatabaseManager(db)
+        yield async_db
+        async_db.close()
+
+
+def won(user_id: int, bet: int) -> bool:
+    return (user_id + bet) % 2 == 0
+
+
+def test_concurrent_bettors(async_db, capsys):
+    economy = async_db.wrap(EconomyManager(async_db.sync))
+
+    async def bettor(user_id: int) -> list:
+        results = []
+        for bet in range(BETS):
+            # Reads interleave with the writes, as the cogs' balance checks do
+            await async_db.get_user(user_id)
+            results.append(await economy.process_bet(user_id, f'bettor{user_id}', BET, 'slots',
+                                                     won(user_id, bet), 2.0))
+        return results
+
+    async def run() -> list:
+        return await asyncio.gather(*(bettor(user_id) for user_id in range(1, BETTORS + 1)))
+
+    # A failed batch (e.g. sqlite3.OperationalError: database is locked) raises out of gather
+    settled = asyncio.run(run())
+    assert all(success for results in settled for success, _, _ in results)
+    # process_bet_atomic reports errors it swallowed on stdout
+    assert 'Error' not in capsys.readouterr().out
+    assert async_db.sync.writer.stats['lock_retries'] == 0
+
+    async_db.sync.audit.flush()
+    conn = async_db.sync.get_connection()
+    coins = dict(conn.execute('SELECT user_id, coins FROM users').fetchall())
+    ledger = dict(conn.execute('SELECT user_id, SUM(amount) FROM transactions GROUP BY user_id').fetchall())
+    transactions = conn.execute('SELECT COUNT(*) FROM transactions').fetchone()[0]
+    games = conn.execute('SELECT COUNT(*) FROM game_history').fetchone()[0]
+
+    wins = 0
+    for user_id, results in enumerate(settled, start=1):
+        net = sum(net_change for _, net_change, _ in results)
+        assert net == sum(BET if won(user_id, bet) else -BET for bet in range(BETS))
+        assert coins[user_id] == START + net
+        assert ledger[user_id] == net
+        # The last row returned is the balance after the bettor's final bet
+        assert results[-1][2]['coins'] == START + net
+        wins += sum(won(user_id, bet) for bet in range(BETS))
+
+    # One spend per bet plus one earn per win, one game_history row per bet
+    assert transactions == BETTORS * BETS + wins
+    assert games == BETTORS * BETS
+    assert sum(coins.values()) == BETTORS * START + BET * (2 * wins - BETTORS * BETS)
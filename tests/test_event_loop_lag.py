@@ -0,0 +1,106 @@
+"""Database calls made through AsyncDatabaseManager must not stall the event loop"""
+
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import pytest
+from src.database.async_db_manager import AsyncDatabaseManager
+from src.database.db_manager import DatabaseManager
+from src.economy.economy_manager import EconomyManager
+
+# Ticks are 5 ms apart, a loop blocked by sqlite would show the whole call
+TICK = 0.005
+MAX_LAG = 0.1
+
+# Concurrent bets in test_concurrent_bets
+BETTORS = 500
+
+
+@pytest.fixture
+def async_db():
+    with tempfile.TemporaryDirectory() as directory:
+        db = DatabaseManager(os.path.join(directory, 'lag.db'))
+        conn = db.get_connection()
+        conn.executemany('INSERT INTO users (user_id, username, coins) VALUES (?, ?, ?)',
+                         [(user_id, f'player{user_id}', 10 ** 6) for user_id in range(1, BETTORS + 1)])
+        conn.commit()
+        async_db = AsyncDatabaseManager(db)
+        yield async_db
+        async_db.close()
+
+
+async def max_lag(work) -> float:
+    """Run work while ticking the loop, returns the worst delay of a tick past its due time"""
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(TICK)
+            lags.append(time.perf_counter() - start - TICK)
+
+    ticks = asyncio.create_task(ticker())
+    # Let the first tick start before work can block
+    await asyncio.sleep(0)
+    try:
+        await work
+    finally:
+        done.set()
+        await ticks
+    assert lags, 'the loop never ticked'
+    return max(lags)
+
+
+def test_blocking_read(async_db):
+    def slow_read():
+        time.sleep(0.3)
+        return async_db.sync.get_user(1)
+
+    lag = asyncio.run(max_lag(async_db.run(slow_read)))
+    assert lag < MAX_LAG
+
+
+def test_concurrent_bets(async_db):
+    economy = async_db.wrap(EconomyManager(async_db.sync))
+
+    async def bets():
+        results = await asyncio.gather(*(
+            economy.process_bet(user_id, f'player{user_id}', 10, 'slots', user_id % 2 == 0, 2.0)
+            for user_id in range(1, BETTORS + 1)
+        ))
+        assert all(success for success, _, _ in results)
+
+    lag = asyncio.run(max_lag(bets()))
+    assert lag < MAX_LAG
+
+
+def test_writes_waiting_on_a_locked_database(async_db):
+    # Another process (the webapp) holds the write lock for a while
+    locked, release = threading.Event(), threading.Event()
+
+    def hold_lock():
+        conn = sqlite3.connect(async_db.sync.db_path, isolation_level=None)
+        conn.execute('BEGIN IMMEDIATE')
+        locked.set()
+        release.wait(5)
+        conn.execute('ROLLBACK')
+        conn.close()
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    locked.wait(5)
+
+    async def write():
+        threading.Timer(0.3, release.set).start()
+        assert await async_db.update_coins(1, 5)
+
+    try:
+        lag = asyncio.run(max_lag(write()))
+    finally:
+        release.set()
+        holder.join()
+    assert lag < MAX_LAG
@@ -0,0 +1,20 @@
+"""Migration steps must stay pinned to their own SQL"""
+
+import ast
+import inspect
+from src.database import migrations
+
+
+def test_steps_never_call_other_steps():
+    steps = {step.__name__ for _, _, step in migrations.MIGRATIONS}
+    tree = ast.parse(inspect.getsource(migrations))
+    for function in tree.body:
+        if not isinstance(function, ast.FunctionDef) or function.name not in steps:
+            continue
+        called = {node.func.id for node in ast.walk(function)
+                  if isinstance(node, ast.Call) and isinstance(node.func, ast.Name)}
+        assert not called & (steps - {function.name}), f'{function.name} calls {called & steps}'
+
+
+def test_versions_are_sequential():
+    assert [version for version, _, _ in migrations.MIGRATIONS] == list(range(1, len(migrations.MIGRATIONS) + 1))
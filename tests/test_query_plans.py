@@ -0,0 +1,66 @@
+"""The hot read queries must be answered from the migration indexes"""
+
+import os
+import re
+import tempfile
+import pytest
+from src.database.db_manager import DatabaseManager
+
+
+@pytest.fixture
+def db():
+    with tempfile.TemporaryDirectory() as directory:
+        db = DatabaseManager(os.path.join(directory, 'plans.db'))
+        db.get_user(1, 'player')
+        yield db
+        db.close()
+
+
+def query_plans(db: DatabaseManager, call) -> list:
+    """EXPLAIN QUERY PLAN details of every SELECT call runs on this thread's connection"""
+    conn = db.get_connection()
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        call()
+    finally:
+        conn.set_trace_callback(None)
+
+    plans = []
+    for sql in statements:
+        if sql.lstrip().upper().startswith('SELECT'):
+            plans.append([row['detail'] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}')])
+    assert plans, 'call ran no SELECT'
+    return plans
+
+
+def assert_uses(plan: list, index: str):
+    assert any(re.search(rf'INDEX {index}\b', detail) for detail in plan), plan
+    # Served in index order, not sorted afterwards
+    assert not any('TEMP B-TREE' in detail for detail in plan), plan
+
+
+@pytest.mark.parametrize('filters, index', [
+    ({}, 'idx_transactions_user_time'),
+    ({'transaction_type': 'daily'}, 'idx_transactions_user_type_time'),
+    ({'game_type': 'slots'}, 'idx_transactions_user_game_time'),
+    ({'before': (1_700_000_000, 10)}, 'idx_transactions_user_time'),
+])
+def test_transaction_history(db, filters, index):
+    plans = query_plans(db, lambda: db.get_transaction_history(1, **filters))
+    assert_uses(plans[0], index)
+
+
+@pytest.mark.parametrize('filters, index', [
+    ({}, 'idx_game_history_user_time'),
+    ({'game_type': 'slots'}, 'idx_game_history_user_game_time'),
+    ({'before': (1_700_000_000, 10)}, 'idx_game_history_user_time'),
+])
+def test_game_history(db, filters, index):
+    plans = query_plans(db, lambda: db.get_game_history(1, **filters))
+    assert_uses(plans[0], index)
+
+
+def test_leaderboard(db):
+    plans = query_plans(db, lambda: db.get_leaderboard(10))
+    assert_uses(plans[0], 'idx_users_coins')
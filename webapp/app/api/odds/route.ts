@@ -0,0 +1,30 @@
+import { NextResponse } from 'next/server';
+import fs from 'fs';
+import path from 'path';
+
+// Written by the bot at startup (src/games/odds.py), next to the database
+const ODDS_PATH = path.join(process.cwd(), '..', 'data', 'odds.json');
+
+export async function GET(request: Request) {
+  try {
+    if (!fs.existsSync(ODDS_PATH)) {
+      return NextResponse.json({ error: 'Odds not computed yet, start the bot once' }, { status: 503 });
+    }
+
+    const { games } = JSON.parse(fs.readFileSync(ODDS_PATH, 'utf-8'));
+    const { searchParams } = new URL(request.url);
+    const game = searchParams.get('game');
+
+    if (game) {
+      if (!games[game]) {
+        return NextResponse.json({ error: 'Unknown game' }, { status: 404 });
+      }
+      return NextResponse.json(games[game]);
+    }
+
+    return NextResponse.json(games);
+  } catch (error) {
+    console.error('Error fetching odds:', error);
+    return NextResponse.json({ error: 'Failed to fetch odds' }, { status: 500 });
+  }
+}
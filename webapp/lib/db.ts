@@ -21,7 +21,9 @@ export interface Transaction {
   user_id: string;
   amount: number;
   transaction_type: string;
-  description: string | null;
+  game_type: string | null;
+  detail: string | null;
+  description: string;
   timestamp: string;
 }
 
@@ -50,6 +52,46 @@ export interface ServerConfig {
   joined_at: string;
 }
 
+// IDs are INTEGER snowflakes, which don't fit in a JS number, and timestamps
+// are unix epoch seconds. Queries read both back as text; string ID params
+// still match because SQLite converts them for the INTEGER columns.
+const USER_COLUMNS = `
+  CAST(user_id AS TEXT) AS user_id, username, coins, total_won, total_lost,
+  games_played, games_won, datetime(created_at, 'unixepoch') AS created_at,
+  datetime(last_daily, 'unixepoch') AS last_daily, streak
+`;
+const TRANSACTION_COLUMNS = `
+  t.id, CAST(t.user_id AS TEXT) AS user_id, t.amount, tt.name AS transaction_type,
+  g.name AS game_type, t.detail, datetime(t.timestamp, 'unixepoch') AS timestamp
+`;
+
+// transactions store a type code, a game code and the variable part of the
+// description, the text is rendered here (mirrors src/database/ledger.py)
+const GAME_TEMPLATES: Record<string, string> = {
+  spend: '{game} - Aposta',
+  earn: '{game} - Vitória',
+};
+const DETAIL_TEMPLATES: Record<string, string> = {
+  transfer_in: 'Transferência de {detail}',
+  transfer_out: 'Transferência para {detail}',
+  achievement: 'Achievement unlocked: {detail}',
+  daily_reward: 'Recompensa diária (streak: {detail})',
+};
+
+export function describeTransaction(type: string, gameType: string | null, detail: string | null): string {
+  if (gameType !== null && detail === null && GAME_TEMPLATES[type]) {
+    return GAME_TEMPLATES[type].replace('{game}', gameType);
+  }
+  if (detail !== null && DETAIL_TEMPLATES[type]) {
+    return DETAIL_TEMPLATES[type].replace('{detail}', detail);
+  }
+  return detail || type;
+}
+const GAME_HISTORY_COLUMNS = `
+  id, CAST(user_id AS TEXT) AS user_id, game_type, bet_amount, result, winnings,
+  datetime(timestamp, 'unixepoch') AS timestamp
+`;
+
 let db: Database.Database | null = null;
 
 export function getDatabase() {
@@ -77,15 +119,15 @@ export function getAllUsers(guildId?: string): User[] {
       // Fallback to global user data for guild members
       return db.prepare(`
         SELECT 
-          u.user_id, 
+          CAST(u.user_id AS TEXT) AS user_id, 
           u.username,
           u.coins,
           u.total_won,
           u.total_lost,
           u.games_played,
           u.games_won,
-          u.created_at,
-          u.last_daily,
+          datetime(u.created_at, 'unixepoch') AS created_at,
+          datetime(u.last_daily, 'unixepoch') AS last_daily,
           u.streak
         FROM users u
         INNER JOIN guild_members gm ON u.user_id = gm.user_id
@@ -97,15 +139,15 @@ export function getAllUsers(guildId?: string): User[] {
     // Return guild-specific user data with guild-specific coins
     return db.prepare(`
       SELECT 
-        u.user_id, 
+        CAST(u.user_id AS TEXT) AS user_id, 
         u.username,
         gc.coins,
         gc.total_won,
         gc.total_lost,
         gc.games_played,
         gc.games_won,
-        u.created_at,
-        gc.last_daily,
+        datetime(u.created_at, 'unixepoch') AS created_at,
+        datetime(gc.last_daily, 'unixepoch') AS last_daily,
         gc.streak
       FROM users u
       INNER JOIN guild_members gm ON u.user_id = gm.user_id
@@ -115,13 +157,13 @@ export function getAllUsers(guildId?: string): User[] {
     `).all(guildId) as User[];
   }
   
-  const users = db.prepare('SELECT * FROM users ORDER BY coins DESC').all() as User[];
+  const users = db.prepare(`SELECT ${USER_COLUMNS} FROM users ORDER BY coins DESC`).all() as User[];
   return users;
 }
 
 export function getUser(userId: string): User | undefined {
   const db = getDatabase();
-  return db.prepare('SELECT * FROM users WHERE user_id = ?').get(userId) as User | undefined;
+  return db.prepare(`SELECT ${USER_COLUMNS} FROM users WHERE user_id = ?`).get(userId) as User | undefined;
 }
 
 export function updateUserCoins(userId: string, newCoins: number): boolean {
@@ -146,9 +188,12 @@ export function addCoinsToUser(userId: string, amount: number, description?: str
       db.prepare('UPDATE users SET coins = ? WHERE user_id = ?').run(newCoins, userId);
       
       // Add transaction record
-      db.prepare(
-        'INSERT INTO transactions (user_id, amount, transaction_type, description) VALUES (?, ?, ?, ?)'
-      ).run(userId, amount, amount > 0 ? 'admin_add' : 'admin_remove', description || 'Admin adjustment');
+      const type = amount > 0 ? 'admin_add' : 'admin_remove';
+      db.prepare('INSERT OR IGNORE INTO transaction_types (name) VALUES (?)').run(type);
+      db.prepare(`
+        INSERT INTO transactions (user_id, amount, type_id, detail)
+        VALUES (?, ?, (SELECT type_id FROM transaction_types WHERE name = ?), ?)
+      `).run(userId, amount, type, description || 'Admin adjustment');
     })();
     return true;
   } catch (error) {
@@ -160,44 +205,73 @@ export function addCoinsToUser(userId: string, amount: number, description?: str
 // Transaction operations
 export function getUserTransactions(userId: string, limit = 50): Transaction[] {
   const db = getDatabase();
-  return db
-    .prepare('SELECT * FROM transactions WHERE user_id = ? ORDER BY timestamp DESC LIMIT ?')
-    .all(userId, limit) as Transaction[];
+  const rows = db
+    .prepare(`
+      SELECT ${TRANSACTION_COLUMNS}
+      FROM transactions t
+      JOIN transaction_types tt USING (type_id)
+      LEFT JOIN game_types g USING (game_id)
+      WHERE t.user_id = ?
+      ORDER BY t.timestamp DESC, t.id DESC
+      LIMIT ?
+    `)
+    .all(userId, limit) as Omit<Transaction, 'description'>[];
+  return rows.map(row => ({
+    ...row,
+    description: describeTransaction(row.transaction_type, row.game_type, row.detail),
+  }));
 }
 
 // Game history operations
 export function getUserGameHistory(userId: string, limit = 50): GameHistory[] {
   const db = getDatabase();
   return db
-    .prepare('SELECT * FROM game_history WHERE user_id = ? ORDER BY timestamp DESC LIMIT ?')
+    .prepare(`SELECT ${GAME_HISTORY_COLUMNS} FROM game_history WHERE user_id = ? ORDER BY timestamp DESC, id DESC LIMIT ?`)
     .all(userId, limit) as GameHistory[];
 }
 
 export function getGameStats(gameType?: string, guildId?: string) {
   const db = getDatabase();
   
-  let query = `
-    SELECT 
-      ${gameType ? '' : 'gh.game_type,'}
-      COUNT(*) as total_games,
-      SUM(CASE WHEN gh.result = 'win' THEN 1 ELSE 0 END) as wins,
-      SUM(gh.bet_amount) as total_bet,
-      SUM(gh.winnings) as total_winnings
-    FROM game_history gh
-  `;
-  
+  // Read the rollups maintained at bet settlement instead of scanning game_history
+  let query: string;
   const params: any[] = [];
   const conditions: string[] = [];
   
   if (guildId) {
-    query += ` INNER JOIN guild_members gm ON gh.user_id = gm.user_id `;
+    // Guild stats are the totals of the guild's members
+    query = `
+      SELECT 
+        ${gameType ? '' : 'ugs.game_type,'}
+        COALESCE(SUM(ugs.bets), 0) as total_games,
+        COALESCE(SUM(ugs.wins), 0) as wins,
+        COALESCE(SUM(ugs.wagered), 0) as total_bet,
+        COALESCE(SUM(ugs.paid_out) - SUM(ugs.wagered), 0) as total_winnings
+      FROM user_game_stats ugs
+      INNER JOIN guild_members gm ON ugs.user_id = gm.user_id
+    `;
     conditions.push('gm.guild_id = ?');
     params.push(guildId);
-  }
-  
-  if (gameType) {
-    conditions.push('gh.game_type = ?');
-    params.push(gameType);
+    
+    if (gameType) {
+      conditions.push('ugs.game_type = ?');
+      params.push(gameType);
+    }
+  } else {
+    query = `
+      SELECT 
+        ${gameType ? '' : 'gsd.game_type,'}
+        COALESCE(SUM(gsd.bets), 0) as total_games,
+        COALESCE(SUM(gsd.wins), 0) as wins,
+        COALESCE(SUM(gsd.wagered), 0) as total_bet,
+        COALESCE(SUM(gsd.paid_out) - SUM(gsd.wagered), 0) as total_winnings
+      FROM game_stats_daily gsd
+    `;
+    
+    if (gameType) {
+      conditions.push('gsd.game_type = ?');
+      params.push(gameType);
+    }
   }
   
   if (conditions.length > 0) {
@@ -205,7 +279,7 @@ export function getGameStats(gameType?: string, guildId?: string) {
   }
   
   if (!gameType) {
-    query += ' GROUP BY gh.game_type';
+    query += ` GROUP BY ${guildId ? 'ugs' : 'gsd'}.game_type`;
     return db.prepare(query).all(...params);
   }
   
@@ -216,7 +290,10 @@ export function getGameStats(gameType?: string, guildId?: string) {
 export function getUserAchievements(userId: string): Achievement[] {
   const db = getDatabase();
   return db
-    .prepare('SELECT * FROM achievements WHERE user_id = ? ORDER BY unlocked_at DESC')
+    .prepare(`
+      SELECT id, CAST(user_id AS TEXT) AS user_id, achievement_name, datetime(unlocked_at, 'unixepoch') AS unlocked_at
+      FROM achievements WHERE user_id = ? ORDER BY unlocked_at DESC
+    `)
     .all(userId) as Achievement[];
 }
 
@@ -230,7 +307,7 @@ export function getGlobalStats(guildId?: string) {
     
     if (guildCoinsCount.count === 0) {
       // Fallback to global stats for guild members
-      const memberIds = db.prepare('SELECT user_id FROM guild_members WHERE guild_id = ?').all(guildId) as { user_id: string }[];
+      const memberIds = db.prepare('SELECT CAST(user_id AS TEXT) AS user_id FROM guild_members WHERE guild_id = ?').all(guildId) as { user_id: string }[];
       const memberIdList = memberIds.map(m => m.user_id);
       
       if (memberIdList.length === 0) {
@@ -274,7 +351,7 @@ export function getGlobalStats(guildId?: string) {
   return {
     totalUsers: db.prepare('SELECT COUNT(*) as count FROM users').get() as { count: number },
     totalCoins: db.prepare('SELECT SUM(coins) as total FROM users').get() as { total: number },
-    totalGames: db.prepare('SELECT COUNT(*) as count FROM game_history').get() as { count: number },
+    totalGames: db.prepare('SELECT COALESCE(SUM(bets), 0) as count FROM game_stats_daily').get() as { count: number },
     avgCoinsPerUser: db.prepare('SELECT AVG(coins) as avg FROM users').get() as { avg: number },
   };
 }
@@ -291,7 +368,10 @@ export function getServers(): ServerConfig[] {
       return [];
     }
 
-    const guilds = db.prepare('SELECT guild_id, name, member_count, icon_url, joined_at FROM guilds ORDER BY member_count DESC').all() as any[];
+    const guilds = db.prepare(`
+      SELECT CAST(guild_id AS TEXT) AS guild_id, name, member_count, icon_url, datetime(joined_at, 'unixepoch') AS joined_at
+      FROM guilds ORDER BY member_count DESC
+    `).all() as any[];
     
     // Map database columns to frontend interface
     return guilds.map(guild => ({